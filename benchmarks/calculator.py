@@ -0,0 +1,96 @@
+"""Fuzz and worst-case timing for Forte's calculator.
+
+Runs hand-picked hostile expressions plus random token soup through
+Calculator.evaluate and checks that every one answers (a value or a
+SkillError) within the time budget. Exits non-zero if any input is slower
+or raises anything else.
+
+    python benchmarks/calculator.py [--cases 20000] [--seed 1] [--budget 0.05]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Calculator, SkillError  # noqa: E402
+
+WORST_CASES = [
+    "9 ** 9 ** 9",
+    "10 ^ 10 ^ 10",
+    "2 ** 2 ** 2 ** 2 ** 2 ** 2",
+    "(-9) ** 9 ** 9",
+    "99999999999 ** 99999999",
+    "1.0000001 ** 9999999999",
+    "factorial(100000)",
+    "factorial(factorial(10))",
+    "99999!",
+    "3!!!!",
+    "exp(exp(exp(10)))",
+    "2 ** 996 * 2 ** 996 * 2 ** 996 * 2 ** 996",
+    "(" * 120 + "1" + ")" * 120,
+    "-" * 250 + "1",
+    "1" + " + 1" * 60,
+    "9" * 250,
+    "max(" + ", ".join(["9 ** 300"] * 30) + ")",
+    "round(1.5, 10 ** 200)",
+    "log(0)",
+    "sqrt(-1)",
+    "1 / 0",
+    "1 % 0",
+    "(-8) ** (1 / 3)",
+    "calculate " + "x" * 240,
+]
+
+PIECES = ["9", "99", "999999", "0", "1.5", "1e308", "pi", "e", "+", "-", "*", "/", "//", "%", "**", "^", "!",
+          "(", ")", ",", "sqrt", "exp", "factorial", "log", "max", "sin", "x", "times", "squared", "divided by"]
+
+
+def timed(calc: Calculator, expression: str) -> tuple:
+    start = time.perf_counter()
+    try:
+        outcome = calc.format(calc.evaluate(expression))
+    except SkillError as e:
+        outcome = f"error: {e}"
+    return time.perf_counter() - start, outcome
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=20000, help="Random expressions to try")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=0.05, help="Seconds any one input may take")
+    args = parser.parse_args()
+    calc = Calculator()
+    rng = random.Random(args.seed)
+    failures = 0
+
+    print("worst cases:")
+    for expression in WORST_CASES:
+        elapsed, outcome = timed(calc, expression)
+        slow = elapsed > args.budget
+        failures += slow
+        print(f"  {'SLOW ' if slow else ''}{elapsed * 1000:8.3f} ms  {expression[:40]!r:44} -> {outcome[:50]}")
+
+    times = []
+    worst = (0.0, "")
+    for _ in range(args.cases):
+        expression = " ".join(rng.choice(PIECES) for _ in range(rng.randint(1, 24)))
+        elapsed, _ = timed(calc, expression)
+        times.append(elapsed)
+        if elapsed > worst[0]:
+            worst = (elapsed, expression)
+        failures += elapsed > args.budget
+    times.sort()
+    print(f"random: {args.cases} cases, median {statistics.median(times) * 1e6:.0f} us, "
+          f"p99 {times[int(len(times) * 0.99)] * 1e6:.0f} us, max {worst[0] * 1000:.3f} ms ({worst[1]!r})")
+    print("FAIL" if failures else "OK", f"({failures} inputs over {args.budget * 1000:.0f} ms)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Load test for Forte's --serve mode.
+
+Starts many concurrent clients, each with its own session, sends commands
+over HTTP (keep-alive, streamed replies) or WebSocket, and reports
+throughput and latency percentiles. Point it at a running server with
+--url, or pass --spawn to start one in this process.
+
+    python main.py --serve 127.0.0.1:8765 --no-tts &
+    python benchmarks/load_test.py --url http://127.0.0.1:8765 --clients 50 --requests 40
+    python benchmarks/load_test.py --spawn --mode ws
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_COMMANDS = ["what time is it", "calculate 12 times 7 plus 3", "tell me a joke", "tell me a fact",
+                    "how are you", "say that again", "/history 4"]
+
+
+class HttpClient:
+    def __init__(self, host: str, port: int, session: str):
+        self.conn = http.client.HTTPConnection(host, port, timeout=30)
+        self.session = session
+
+    def command(self, text: str) -> list:
+        body = json.dumps({"text": text, "session": self.session})
+        self.conn.request("POST", "/command", body, {"Content-Type": "application/json"})
+        resp = self.conn.getresponse()
+        if resp.status != 200:
+            raise RuntimeError(f"HTTP {resp.status}: {resp.read()[:200]!r}")
+        lines = [json.loads(line) for line in resp.read().splitlines() if line]
+        if not lines or not lines[-1].get("done"):
+            raise RuntimeError("reply did not finish")
+        return lines
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class WsClient:
+    def __init__(self, host: str, port: int, session: str):
+        self.sock = socket.create_connection((host, port), timeout=30)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall((f"GET /ws?session={session} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n"
+                           f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        self.rfile = self.sock.makefile("rb")
+        status = self.rfile.readline()
+        if b" 101 " not in status:
+            raise RuntimeError(f"handshake failed: {status!r}")
+        while self.rfile.readline() not in (b"\r\n", b""):
+            pass
+        self.receive()  # {"session": ...}
+
+    def command(self, text: str) -> list:
+        payload = json.dumps({"text": text}).encode()
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        n = len(payload)
+        header = struct.pack("!BB", 0x81, 0x80 | n) if n < 126 else struct.pack("!BBH", 0x81, 0xFE, n)
+        self.sock.sendall(header + mask + masked)
+        lines = []
+        while True:
+            msg = self.receive()
+            if msg.get("urgent"):
+                continue
+            lines.append(msg)
+            if msg.get("done"):
+                return lines
+
+    def receive(self) -> dict:
+        head = self.rfile.read(2)
+        n = head[1] & 0x7F
+        if n == 126:
+            n = struct.unpack("!H", self.rfile.read(2))[0]
+        elif n == 127:
+            n = struct.unpack("!Q", self.rfile.read(8))[0]
+        return json.loads(self.rfile.read(n))
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="Server to test")
+    parser.add_argument("--spawn", action="store_true", help="Start a server in this process on a free port")
+    parser.add_argument("--mode", choices=["http", "ws"], default="http")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients (one session each)")
+    parser.add_argument("--requests", type=int, default=40, help="Commands per client")
+    parser.add_argument("--commands", nargs="+", default=DEFAULT_COMMANDS, help="Commands to cycle through")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        import logging
+        import tempfile
+        from main import ForteServer, SpeechAssistant
+        logging.basicConfig(level=logging.WARNING)
+        assistant = SpeechAssistant(data_dir=tempfile.mkdtemp(prefix="forte-load-"))
+        assistant.enable_tts = False
+        server = ForteServer(assistant, "127.0.0.1", 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.address
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+
+    client_class = HttpClient if args.mode == "http" else WsClient
+    latencies, errors = [], []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(args.clients + 1)
+
+    def run(i: int) -> None:
+        mine, failed = [], []
+        try:
+            client = client_class(host, port, f"load-{i}")
+        except Exception as e:
+            failed.append(repr(e))
+            client = None
+        start_gate.wait()
+        for n in range(args.requests if client else 0):
+            text = args.commands[(i + n) % len(args.commands)]
+            t = time.perf_counter()
+            try:
+                client.command(text)
+                mine.append(time.perf_counter() - t)
+            except Exception as e:
+                failed.append(f"{text!r}: {e!r}")
+        if client:
+            client.close()
+        with lock:
+            latencies.extend(mine)
+            errors.extend(failed)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(args.clients)]
+    for t in threads:
+        t.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.shutdown()
+
+    latencies.sort()
+    print(f"{args.mode}: {args.clients} clients x {args.requests} commands against {host}:{port}")
+    print(f"  completed  {len(latencies)} in {elapsed:.2f} s  ({len(latencies) / elapsed:.0f} commands/s)")
+    print(f"  latency    p50 {percentile(latencies, 0.50) * 1000:.1f} ms  p95 {percentile(latencies, 0.95) * 1000:.1f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms  max {percentile(latencies, 1.0) * 1000:.1f} ms")
+    print(f"  errors     {len(errors)}" + (f"  (first: {errors[0]})" if errors else ""))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Run Forte's benchmark suite and compare results between commits.
+
+Each benchmark is timed in rounds (best and median seconds per call are
+kept). Results are saved to benchmarks/results/<commit>.json, with
+"-dirty" appended when the tree has uncommitted changes. --compare loads an
+earlier results file (or commit) and flags anything that got slower than
+--threshold allows. The exit status is non-zero on a regression or when a
+benchmark goes over its time budget.
+
+    python benchmarks/run.py                     # run everything, save results
+    python benchmarks/run.py -k notes --quick    # a subset, fewer rounds
+    python benchmarks/run.py --compare 30de438   # against an earlier commit
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "results")
+
+
+def commit_id() -> str:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True,
+                             check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=HERE,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def time_calls(fn, number: int = None, rounds: int = 5, target: float = 0.1) -> dict:
+    fn()  # warm-up; also catches a broken benchmark before timing it
+    if number is None:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            if time.perf_counter() - start >= target / 2 or number >= 1 << 20:
+                break
+            number *= 2
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - start) / number)
+    return {"best": min(per_call), "median": statistics.median(per_call), "number": number, "rounds": rounds}
+
+
+def load_results(ref: str) -> dict:
+    path = ref if os.path.exists(ref) else None
+    if path is None:
+        matches = sorted(glob.glob(os.path.join(RESULTS_DIR, f"{ref}*.json")))
+        if not matches:
+            raise SystemExit(f"No saved results for {ref!r} in {RESULTS_DIR}")
+        path = matches[0]
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.0f} ns"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", metavar="PATTERN", help="Only run benchmarks whose name matches this regex")
+    parser.add_argument("--quick", action="store_true", help="3 shorter rounds instead of 5")
+    parser.add_argument("--compare", metavar="COMMIT|FILE", help="Compare against saved results")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Slowdown (best round) counted as a regression when comparing (default 0.15 = 15%%)")
+    parser.add_argument("--no-save", action="store_true", help="Don't write a results file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    sys.path.insert(0, HERE)
+    import suite
+
+    baseline = load_results(args.compare)["results"] if args.compare else {}
+    pattern = re.compile(args.k) if args.k else None
+    rounds, target = (3, 0.05) if args.quick else (5, 0.1)
+    results, problems = {}, []
+    for name, setup, budget, number in suite.BENCHMARKS:
+        if pattern and not pattern.search(name):
+            continue
+        timing = time_calls(setup(), number, rounds, target)
+        results[name] = timing
+        line = f"{name:52} {fmt(timing['median'])}  (best {fmt(timing['best']).strip()}, x{timing['number']})"
+        if budget is not None and timing["median"] > budget:
+            line += f"  OVER BUDGET ({fmt(budget).strip()})"
+            problems.append(name)
+        old = baseline.get(name)
+        if old:
+            ratio = timing["best"] / old["best"]
+            line += f"  {ratio:5.2f}x"
+            if ratio > 1 + args.threshold:
+                line += "  REGRESSION"
+                problems.append(name)
+        print(line, flush=True)
+
+    if not args.no_save and results:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        commit = commit_id()
+        path = os.path.join(RESULTS_DIR, f"{commit}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"commit": commit, "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "machine": platform.platform(),
+                       "results": results}, f, indent=2)
+        print(f"saved {os.path.relpath(path)}")
+    if problems:
+        print(f"{len(problems)} problem(s): {', '.join(problems)}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
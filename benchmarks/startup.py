@@ -0,0 +1,83 @@
+"""Where Forte's startup time goes.
+
+Prints the slowest imports of `import main` from `python -X importtime`
+(cumulative time, so a package includes everything it pulls in), then the
+wall-clock time from launching `python main.py` to its first prompt
+("Hello! ..."), with TTS off and a throwaway data directory. Exits non-zero
+if the median time to the prompt is over --budget.
+
+    python benchmarks/startup.py [--runs 5] [--top 15] [--budget 1.0]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = "Hello!"
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def importtime() -> list:
+    """(cumulative seconds, self seconds, depth, module) for each import done by `import main`."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            rows.append((int(m.group(2)) / 1e6, int(m.group(1)) / 1e6, len(m.group(3)) // 2, m.group(4)))
+    return rows
+
+
+def time_to_prompt(timeout: float = 30.0) -> float:
+    """Seconds from starting `python main.py` until it prints the greeting."""
+    data_dir = tempfile.mkdtemp(prefix="forte-bench-")
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py"), "--no-tts", "--data-dir", data_dir],
+                            cwd=data_dir, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True)
+    try:
+        deadline = start + timeout
+        for line in proc.stdout:
+            if PROMPT in line:
+                return time.perf_counter() - start
+            if time.perf_counter() > deadline:
+                break
+        raise RuntimeError("main.py never showed its prompt")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Launches to time (default 5)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list (default 15)")
+    parser.add_argument("--budget", type=float, default=1.0, help="Most median seconds to the prompt (default 1.0)")
+    args = parser.parse_args()
+
+    rows = importtime()
+    total = sum(r[1] for r in rows)
+    print(f"import main: {total * 1000:.1f} ms across {len(rows)} modules; slowest (cumulative):")
+    for cumulative, own, depth, module in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {cumulative * 1000:8.1f} ms  (self {own * 1000:6.1f} ms)  {'  ' * depth}{module}")
+
+    times = [time_to_prompt() for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(f"python main.py to first prompt: median {median * 1000:.0f} ms, "
+          f"best {min(times) * 1000:.0f} ms over {args.runs} runs")
+    if median > args.budget:
+        print(f"Over budget ({args.budget * 1000:.0f} ms)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
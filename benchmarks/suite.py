@@ -0,0 +1,328 @@
+"""Forte's hot-path benchmarks, run by benchmarks/run.py.
+
+Each benchmark is a setup function registered with @benchmark. Setup builds
+whatever state the benchmark needs and returns the zero-argument callable to
+time. Network and speech are stubbed out: the assistant runs with TTS off,
+replies go to a text sink (as in --batch), HTTP calls get canned responses
+from OfflineHttp, and all state files live in a temporary directory.
+"""
+
+import io
+import itertools
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from calculator import WORST_CASES  # noqa: E402
+from startup import time_to_prompt  # noqa: E402
+from wake_word import COMMAND, WORDS, synthesize, write_wav  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS = []
+
+
+def benchmark(name: str, budget: float = None, number: int = None):
+    """Register a setup function.
+
+    `budget` is the most seconds one call may take; `number` fixes the calls
+    per timing round (otherwise the runner picks enough to fill ~0.1 s).
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup, budget, number))
+        return setup
+    return register
+
+
+# Utterances in roughly the mix people use, including some that match nothing.
+# Nothing here schedules timers or reminders, which would fire mid-run.
+CORPUS = [
+    "hello", "hi", "hey forte", "good morning", "how are you", "what is your name", "what's your name",
+    "what time is it", "time please", "tell me a joke", "tell me a python joke", "joke about cats",
+    "another joke", "tell me a fact", "calculate 12 times 7 plus 3", "calculate 2 to the power of 10",
+    "calculate square root of 144", "calculate 9 ** 9 ** 9", "what's the weather", "weather in new york",
+    "weather in new york tomorrow", "what's the weather like tonight", "news", "bbc news", "headlines",
+    "search wikipedia for python", "search wikipedia for ada lovelace", "define serendipity",
+    "convert 100 usd to eur", "convert 25 eur to gbp", "translate good morning to es",
+    "translate thank you to fr", "list reminders", "cancel reminder 5", "cancel timer", "list notes",
+    "search notes for groceries", "say that again", "what can you do", "help", "thank you", "thanks forte",
+    "/history 5", "/help", "/cache", "open the pod bay doors", "play some music", "what is love",
+    "turn on the lights", "blorp", "traffic from home to work",
+]
+
+
+class OfflineResponse:
+    def __init__(self, payload=None, content: bytes = b"", status_code: int = 200):
+        self._payload = payload
+        self.content = content
+        self.status_code = status_code
+        self.headers = {"ETag": '"bench"'}
+        self.raw = io.BytesIO(content)
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise main.requests.HTTPError(f"{self.status_code}", response=self)
+
+    def close(self) -> None:
+        pass
+
+
+def _rss(count: int = 30) -> bytes:
+    items = "".join(f"<item><title>Headline number {i} - Bench</title><link>http://example.com/{i}</link>"
+                    f"<description>{'story text ' * 30}</description></item>" for i in range(count))
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>{items}</channel></rss>'.encode()
+
+
+class OfflineHttp:
+    """Stands in for HttpClient: canned answers for every URL the skills call."""
+
+    RSS = _rss()
+
+    def get(self, url: str, read_timeout=None, **kwargs):
+        if "nominatim" in url:
+            return OfflineResponse([{"lat": "40.71", "lon": "-74.01"}])
+        if "/points/" in url:
+            return OfflineResponse({"properties": {"forecast": "https://api.weather.gov/gridpoints/OKX/33,35/forecast",
+                                                   "relativeLocation": {"properties": {"city": "New York"}}}})
+        if "/gridpoints/" in url:
+            names = ["Today", "Tonight", "Tomorrow", "Tomorrow Night", "Friday", "Friday Night"]
+            return OfflineResponse({"properties": {"periods": [
+                {"name": name, "shortForecast": "Sunny", "temperature": 70 - i, "temperatureUnit": "F"}
+                for i, name in enumerate(names)]}})
+        if "exchangerate" in url:
+            return OfflineResponse({"success": True, "result": 0.92})
+        if "dictionaryapi" in url:
+            return OfflineResponse([{"meanings": [{"definitions": [{"definition": "a happy accident",
+                                                                      "example": "pure serendipity"}]}]}])
+        if "/page/summary/" in url:
+            title = url.rsplit("/", 1)[1].replace("_", " ")
+            return OfflineResponse({"type": "standard", "title": title,
+                                    "extract": f"{title} is a thing. It is well known. More text follows."})
+        if "api.php" in url:
+            return OfflineResponse(["q", ["Python (programming language)"], [], []])
+        if url in main.NEWS_FEEDS.values():
+            return OfflineResponse(content=self.RSS)
+        return OfflineResponse({}, status_code=404)
+
+    def close(self) -> None:
+        pass
+
+
+def offline_assistant() -> "main.SpeechAssistant":
+    assistant = main.SpeechAssistant(data_dir=tempfile.mkdtemp(prefix="forte-bench-"))
+    assistant.enable_tts = False
+    assistant.http = OfflineHttp()
+    assistant.feeds = main.FeedReader(assistant.http)
+    assistant.translator = main.make_translator_backend("phrasebook")
+    return assistant
+
+
+def command_runner(assistant: "main.SpeechAssistant"):
+    """run(text) -> replies, going through process_command like --batch does."""
+    session = main.Session("bench", assistant.history_limit)
+    replies = []
+    session.sink = replies.append
+
+    def run(text: str) -> list:
+        replies.clear()
+        assistant.run_command(session, text)
+        return replies
+
+    return run
+
+
+# --- routing -----------------------------------------------------------------
+
+def _router_with(extra: int) -> "main.IntentRouter":
+    filler = [main.Intent(f"filler{i}", [f"filler phrase {i} alpha", f"filler{i} beta gamma"], reply="ok",
+                          priority=30) for i in range(extra)]
+    return main.IntentRouter(list(main.INTENTS) + filler)
+
+
+for _extra in (0, 1000, 10000):
+    def _setup(extra=_extra):
+        router = _router_with(extra)
+        utterances = itertools.cycle([text.lower() for text in CORPUS])
+        return lambda: router.route(next(utterances))
+    benchmark(f"route: corpus, {_extra} extra intents")(_setup)
+
+
+@benchmark("process_command: corpus (per utterance)")
+def bench_process_command():
+    run = command_runner(offline_assistant())
+    for text in CORPUS:
+        run(text)  # warm the response cache, as in a running session
+    utterances = itertools.cycle(CORPUS)
+    return lambda: run(next(utterances))
+
+
+# --- calculator --------------------------------------------------------------
+
+TYPICAL_MATH = ["2 plus 2", "12 times 7 plus 3", "100 divided by 7", "2 to the power of 10", "square root of 144",
+                "(3 + 4) * 5 - 6 / 2", "sin(pi / 2) + cos(0)", "5!", "log(1000, 10)", "0.1 + 0.2"]
+
+
+@benchmark("calculate: typical")
+def bench_calculate_typical():
+    assistant = offline_assistant()
+    expressions = itertools.cycle("calculate " + e for e in TYPICAL_MATH)
+    return lambda: assistant.calculate(next(expressions))
+
+
+@benchmark("calculate: adversarial", budget=0.05)
+def bench_calculate_adversarial():
+    assistant = offline_assistant()
+    expressions = itertools.cycle(WORST_CASES)
+    return lambda: assistant.calculate(next(expressions))
+
+
+# --- notes -------------------------------------------------------------------
+
+def _notes_assistant(count: int) -> "main.SpeechAssistant":
+    assistant = offline_assistant()
+    with assistant.notes._lock, assistant.notes._db:
+        assistant.notes._db.executemany("INSERT INTO notes (text, created) VALUES (?, ?)",
+                                        ((f"note {i} about groceries and errands {i % 97}", time.time())
+                                         for i in range(count)))
+    return assistant
+
+
+for _count in (100, 1000, 10000, 100000):
+    def _add_delete(count=_count):
+        assistant = _notes_assistant(count)
+        run = command_runner(assistant)
+
+        def add_then_delete():
+            run("take note buy milk")
+            run(f"delete note {assistant.notes._db.execute('SELECT max(id) FROM notes').fetchone()[0]}")
+        return add_then_delete
+
+    def _list(count=_count):
+        assistant = _notes_assistant(count)
+        session = main.Session("bench", assistant.history_limit, sink=lambda text: None)
+        return lambda: assistant.run_command(session, "list notes")
+
+    def _search(count=_count):
+        run = command_runner(_notes_assistant(count))
+        return lambda: run("search notes for groceries")
+
+    def _search_rare(count=_count):
+        assistant = _notes_assistant(count)
+        assistant.notes.add("dentist appointment on thursday")
+        run = command_runner(assistant)
+        return lambda: run("search notes for dentist")
+
+    benchmark(f"notes: add + delete with {_count} notes")(_add_delete)
+    benchmark(f"notes: list {_count} notes")(_list)
+    benchmark(f"notes: search {_count} notes")(_search)  # every note matches
+    benchmark(f"notes: search {_count} notes (one note matches)")(_search_rare)
+
+
+# --- reminders ---------------------------------------------------------------
+
+for _count in (1000, 10000, 50000):
+    def _add_cancel(count=_count):
+        manager = main.ReminderManager(notify=lambda text: None)
+        for i in range(count):
+            manager.add_reminder(60 + i, f"reminder {i}")
+
+        def add_then_cancel():
+            manager.add_reminder(30, "stretch")
+            manager.cancel("reminder", 1)
+        return add_then_cancel
+
+    def _list_reminders(count=_count):
+        manager = main.ReminderManager(notify=lambda text: None)
+        for i in range(count):
+            manager.add_reminder(60 + i, f"reminder {i}")
+        return manager.list_reminders
+
+    benchmark(f"reminders: add + cancel with {_count} pending")(_add_cancel)
+    benchmark(f"reminders: list {_count} pending")(_list_reminders)
+
+
+@benchmark("reminders: add + cancel, journaled (fsync)")
+def bench_reminders_journaled():
+    journal = main.ReminderJournal(os.path.join(tempfile.mkdtemp(prefix="forte-bench-"), "reminders.journal"))
+    manager = main.ReminderManager(notify=lambda text: None, journal=journal)
+
+    def add_then_cancel():
+        manager.add_reminder(30, "stretch")
+        manager.cancel("reminder", 1)
+    return add_then_cancel
+
+
+# --- jokes and facts ---------------------------------------------------------
+
+@benchmark("jokes: random joke")
+def bench_joke():
+    return main.JokeGenerator().get_random_joke
+
+
+@benchmark("jokes: random joke by category")
+def bench_joke_category():
+    jokes = main.JokeGenerator()
+    return lambda: jokes.get_random_joke(category="python")
+
+
+@benchmark("facts: random fact")
+def bench_fact():
+    return main.FactGenerator().get_random_fact
+
+
+# --- wake word ---------------------------------------------------------------
+
+def _wake_phrases():
+    rng = random.Random(3)
+    root = tempfile.mkdtemp(prefix="forte-bench-")
+    paths = []
+    for i, pitch in enumerate((110, 125, 140)):
+        paths.append(os.path.join(root, f"forte{i}.wav"))
+        write_wav(paths[-1], synthesize(WORDS["forte"], pitch, 1.0, rng), 0.002, rng)
+    for name in ("forte", "hello"):
+        write_wav(os.path.join(root, f"{name}.phrase"), synthesize(WORDS[name] + COMMAND, 130, 1.0, rng), 0.005, rng)
+    detector = main.WakeWordDetector.from_wavs(paths)
+    phrases = {}
+    for name in ("forte", "hello"):
+        with wave.open(os.path.join(root, f"{name}.phrase"), "rb") as w:
+            phrases[name] = w.readframes(w.getnframes())
+    return detector, phrases
+
+
+@benchmark("wake word: phrase with the wake word", budget=0.1)
+def bench_wake_hit():
+    detector, phrases = _wake_phrases()
+    return lambda: detector.detect(phrases["forte"])
+
+
+@benchmark("wake word: phrase without it", budget=0.1)
+def bench_wake_miss():
+    detector, phrases = _wake_phrases()
+    return lambda: detector.detect(phrases["hello"])
+
+
+# --- startup -----------------------------------------------------------------
+
+@benchmark("startup: python -c 'import main'", budget=0.25, number=1)
+def bench_import():
+    return lambda: subprocess.run([sys.executable, "-c", "import main"], cwd=ROOT, check=True)
+
+
+@benchmark("startup: SpeechAssistant()", budget=0.5, number=1)
+def bench_construct():
+    data_dir = tempfile.mkdtemp(prefix="forte-bench-")
+    return lambda: main.SpeechAssistant(data_dir=data_dir)
+
+
+@benchmark("startup: python main.py to first prompt", budget=1.0, number=1)
+def bench_first_prompt():
+    return time_to_prompt
@@ -0,0 +1,172 @@
+"""Accuracy and CPU cost of Forte's local wake word detector.
+
+Enrolls WakeWordDetector from a directory of wake word recordings, then runs
+it over positive recordings (the wake word, possibly followed by a command)
+and negative ones (other speech, TV, noise), the same way listen() checks
+each captured phrase. Reports detections, false accepts and CPU time per
+second of audio; exits non-zero if a positive is missed, a negative is
+accepted or the CPU cost exceeds --cpu-budget.
+
+    python benchmarks/wake_word.py --samples DIR --positives DIR --negatives DIR
+
+Without directories it uses the clips in tests/fixtures/wake (speech from
+espeak-ng). --synthetic writes a crude formant-synthesised set instead (a
+"forte" at different pitches and speeds, look-alike words, tones and noise)
+to a temporary directory. Recordings of your own voice are the best test.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import WakeWordDetector  # noqa: E402
+
+RATE = 16000
+
+# (kind, seconds, F1, F2): a crude phoneme string per word
+WORDS = {
+    "forte": [("f", 0.09, 0, 0), ("v", 0.16, 550, 850), ("v", 0.07, 480, 1250), ("gap", 0.04, 0, 0),
+              ("t", 0.025, 0, 0), ("v", 0.10, 600, 1750), ("v", 0.12, 420, 2200)],
+    "hello": [("h", 0.06, 0, 0), ("v", 0.12, 550, 1850), ("v", 0.08, 360, 1000), ("v", 0.22, 450, 850)],
+    "coffee": [("gap", 0.03, 0, 0), ("t", 0.03, 0, 0), ("v", 0.15, 600, 900), ("f", 0.10, 0, 0),
+               ("v", 0.18, 300, 2300)],
+    "seven": [("s", 0.12, 0, 0), ("v", 0.12, 550, 1800), ("f", 0.05, 0, 0), ("v", 0.10, 500, 1500),
+              ("v", 0.10, 300, 1600)],
+    "photo": [("f", 0.09, 0, 0), ("v", 0.18, 450, 900), ("gap", 0.04, 0, 0), ("t", 0.025, 0, 0),
+              ("v", 0.20, 450, 850)],
+    "wait": [("v", 0.08, 300, 700), ("v", 0.12, 600, 1750), ("v", 0.10, 420, 2200), ("gap", 0.04, 0, 0),
+             ("t", 0.025, 0, 0)],
+}
+COMMAND = [("v", 0.15, 700, 1200), ("s", 0.10, 0, 0), ("v", 0.14, 300, 2300), ("gap", 0.05, 0, 0),
+           ("v", 0.20, 650, 1100), ("v", 0.15, 450, 1900)]
+
+
+def synthesize(phonemes, pitch: float, speed: float, rng: random.Random) -> list:
+    out = []
+    phase = 0.0
+    for kind, seconds, f1, f2 in phonemes:
+        n = int(seconds / speed * RATE)
+        if kind == "gap":
+            out.extend([0.0] * n)
+        elif kind in ("f", "s", "h", "t"):
+            loud = {"f": 0.08, "s": 0.15, "h": 0.05, "t": 0.4}[kind]
+            prev = 0.0
+            for _ in range(n):
+                x = rng.uniform(-1, 1)
+                out.append(loud * (x - prev if kind in ("s", "t") else x))  # differenced noise is hissier
+                prev = x
+        else:
+            harmonics = []
+            for k in range(1, int(4000 / pitch)):
+                f = k * pitch
+                gain = sum(1.0 / (1.0 + ((f - formant) / 90.0) ** 2) for formant in (f1, f2, 2600))
+                harmonics.append((2 * math.pi * f / RATE, gain / k ** 0.5))
+            norm = sum(g for _, g in harmonics)
+            for i in range(n):
+                envelope = min(1.0, i / 160.0, (n - i) / 160.0)
+                out.append(0.5 * envelope * sum(g * math.sin(w * (phase + i)) for w, g in harmonics) / norm)
+            phase += n
+    return out
+
+
+def write_wav(path: str, samples: list, noise: float, rng: random.Random, gain: float = 1.0) -> None:
+    silence = [0.0] * int(0.3 * RATE)
+    pcm = bytearray()
+    for x in silence + samples + silence:
+        v = int(max(-1.0, min(1.0, gain * x + rng.gauss(0, noise))) * 32767)
+        pcm += v.to_bytes(2, "little", signed=True)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(bytes(pcm))
+
+
+def make_fixtures(root: str, seed: int = 7):
+    rng = random.Random(seed)
+    dirs = {name: os.path.join(root, name) for name in ("samples", "positives", "negatives")}
+    for d in dirs.values():
+        os.makedirs(d)
+    for i, pitch in enumerate((110, 125, 140)):
+        write_wav(os.path.join(dirs["samples"], f"forte{i}.wav"),
+                  synthesize(WORDS["forte"], pitch, 1.0 + 0.05 * (i - 1), rng), 0.002, rng)
+    for i in range(12):
+        pitch, speed = rng.uniform(95, 160), rng.uniform(0.85, 1.15)
+        word = synthesize(WORDS["forte"], pitch, speed, rng)
+        if i % 2:
+            word += [0.0] * 1600 + synthesize(COMMAND, pitch, speed, rng)  # "forte, <command>"
+        write_wav(os.path.join(dirs["positives"], f"forte{i}.wav"), word, rng.uniform(0.002, 0.01), rng,
+                  gain=rng.uniform(0.4, 1.5))
+    for name in WORDS:
+        if name == "forte":
+            continue
+        for i in range(3):
+            pitch, speed = rng.uniform(95, 160), rng.uniform(0.85, 1.15)
+            write_wav(os.path.join(dirs["negatives"], f"{name}{i}.wav"),
+                      synthesize(WORDS[name] + COMMAND, pitch, speed, rng), 0.005, rng)
+    for i in range(3):
+        tone = [0.3 * math.sin(2 * math.pi * (220 + 110 * i) * n / RATE) for n in range(RATE)]
+        write_wav(os.path.join(dirs["negatives"], f"tone{i}.wav"), tone, 0.01, rng)
+        write_wav(os.path.join(dirs["negatives"], f"noise{i}.wav"), [0.0] * RATE, 0.05 * (i + 1), rng)
+    return dirs["samples"], dirs["positives"], dirs["negatives"]
+
+
+def load(directory: str):
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(".wav"):
+            with wave.open(os.path.join(directory, name), "rb") as w:
+                pcm = w.readframes(w.getnframes())
+                yield name, WakeWordDetector.pcm16k(pcm, w.getframerate(), w.getsampwidth())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--samples", help="Directory of wake word recordings to enroll")
+    parser.add_argument("--positives", help="Directory of recordings that should wake the assistant")
+    parser.add_argument("--negatives", help="Directory of recordings that should not")
+    parser.add_argument("--synthetic", action="store_true", help="Use generated formant-synthesised fixtures")
+    parser.add_argument("--threshold", type=float, help="Override the detector's threshold")
+    parser.add_argument("--cpu-budget", type=float, default=0.05,
+                        help="Most CPU seconds per second of audio (default 0.05, about 1/4 of that on a Pi 4 core)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        args.samples, args.positives, args.negatives = make_fixtures(tempfile.mkdtemp(prefix="forte-wake-"))
+        print(f"Synthetic fixtures in {os.path.dirname(args.samples)}")
+    else:
+        fixtures = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "wake")
+        args.samples = args.samples or os.path.join(fixtures, "samples")
+        args.positives = args.positives or os.path.join(fixtures, "positives")
+        args.negatives = args.negatives or os.path.join(fixtures, "negatives")
+    detector = WakeWordDetector.from_directory(args.samples, args.threshold)
+    print(f"Enrolled {len(detector.templates)} recordings, threshold {detector.threshold:.3f}")
+
+    failures = 0
+    cpu = audio_seconds = 0.0
+    for label, directory, expected in (("positive", args.positives, True), ("negative", args.negatives, False)):
+        for name, pcm in load(directory):
+            start = time.process_time()
+            end = detector.detect(pcm)
+            cpu += time.process_time() - start
+            audio_seconds += len(pcm) / 2 / WakeWordDetector.RATE
+            ok = (end is not None) == expected
+            failures += not ok
+            where = f"word ends at {end / 2 / WakeWordDetector.RATE:.2f} s" if end is not None else "no wake word"
+            print(f"{'ok  ' if ok else 'FAIL'} {label} {name}: {where}")
+    per_second = cpu / audio_seconds if audio_seconds else 0.0
+    print(f"CPU: {cpu * 1000:.1f} ms for {audio_seconds:.1f} s of audio ({per_second * 100:.2f}% of a core)")
+    if per_second > args.cpu_budget:
+        print(f"CPU cost over budget ({args.cpu_budget * 100:.1f}% of a core)")
+        failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Round trips and latency of Forte's Wikipedia lookups, against a stand-in server.
+
+Serves a few pages the way the Wikipedia REST and action APIs do (including
+302 redirects, 404 misses and a disambiguation page), adds a fixed delay to
+every request to stand in for network latency, and counts the requests each
+lookup makes. Each query runs through SpeechAssistant.search_wikipedia and
+through the request sequence of the old `wikipedia` package (search, then
+page info, then extract), which is replayed here since that package is no
+longer a dependency.
+
+    python benchmarks/wikipedia.py [--rtt 0.05]
+
+Exits non-zero if a lookup makes more requests than expected or gives no
+answer.
+"""
+
+import argparse
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+PAGES = {
+    "Ada Lovelace": "Augusta Ada King, Countess of Lovelace was an English mathematician. She wrote the first "
+                    "published algorithm. She is often called the first computer programmer.",
+    "Python (programming language)": "Python is a high-level programming language. Its design emphasizes "
+                                     "readability. It was created by Guido van Rossum.",
+    "Mercury (planet)": "Mercury is the first planet from the Sun. It is the smallest planet in the Solar System.",
+    "Mercury (element)": "Mercury is a chemical element with the symbol Hg. It is a liquid metal.",
+    "Mercury": "Mercury may refer to several things.",
+}
+DISAMBIGUATION = {"Mercury"}
+REDIRECTS = {"Lovelace": "Ada Lovelace", "Python language": "Python (programming language)"}
+
+# query, the most requests the REST path should need, why
+CASES = [
+    ("Ada Lovelace", 1, "exact title"),
+    ("Lovelace", 2, "redirect (302 + target)"),
+    ("first computer programmer algorithm", 3, "title miss, found by search"),
+    ("Mercury", 3, "disambiguation page"),
+]
+
+
+def search(query: str) -> list:
+    words = query.lower().split()
+    scored = []
+    for title, text in PAGES.items():
+        hay = f"{title} {text}".lower()
+        score = sum(word in hay for word in words) + 10 * (title.lower() == query.lower())
+        if score:
+            scored.append((-score, title))
+    return [title for *_, title in sorted(scored)]
+
+
+class StandIn(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.lock = threading.Lock()
+        self.log = []
+        super().__init__(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def take_log(self) -> list:
+        with self.lock:
+            log, self.log = self.log, []
+        return log
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(self.server.rtt)
+        parts = urlsplit(self.path)
+        with self.server.lock:
+            self.server.log.append(parts.path)
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if parts.path.startswith("/api/rest_v1/page/summary/"):
+            title = unquote(parts.path.rsplit("/", 1)[1]).replace("_", " ")
+            if title in REDIRECTS:
+                target = REDIRECTS[title].replace(" ", "_")
+                return self.reply(302, {"title": title}, {"Location": f"/api/rest_v1/page/summary/{target}"})
+            if title not in PAGES:
+                return self.reply(404, {"type": "not_found"})
+            kind = "disambiguation" if title in DISAMBIGUATION else "standard"
+            return self.reply(200, {"type": kind, "title": title, "extract": PAGES[title]})
+        if parts.path == "/w/api.php":
+            return self.reply(200, self.action_api(params))
+        self.reply(404, {})
+
+    def action_api(self, params: dict):
+        if params.get("action") == "opensearch":
+            titles = search(params.get("search", ""))[: int(params.get("limit", 10))]
+            return [params.get("search", ""), titles, [], []]
+        # the old wikipedia package: list=search, then prop=info|pageprops, then prop=extracts
+        if params.get("list") == "search":
+            return {"query": {"search": [{"title": t} for t in search(params.get("srsearch", ""))]}}
+        title = REDIRECTS.get(params.get("titles", ""), params.get("titles", ""))
+        if title not in PAGES:
+            return {"query": {"pages": {"-1": {"missing": ""}}}}
+        page = {"pageid": 1, "title": title}
+        if "pageprops" in params.get("prop", "") and title in DISAMBIGUATION:
+            page["pageprops"] = {"disambiguation": ""}
+        if "extracts" in params.get("prop", ""):
+            page["extract"] = PAGES[title]
+        return {"query": {"pages": {"1": page}}}
+
+    def reply(self, status: int, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_summary(http, api: str, query: str) -> str:
+    """The requests wikipedia.summary(query, sentences=2) used to make."""
+    hits = http.get(f"{api}/w/api.php", params={"action": "query", "list": "search", "srsearch": query,
+                                                 "srlimit": 1, "srinfo": "suggestion", "format": "json"}).json()
+    results = hits["query"]["search"]
+    if not results:
+        raise LookupError("no results")
+    title = results[0]["title"]
+    info = http.get(f"{api}/w/api.php", params={"action": "query", "prop": "info|pageprops", "titles": title,
+                                                 "ppprop": "disambiguation", "redirects": "", "format": "json"})
+    page = next(iter(info.json()["query"]["pages"].values()))
+    if "missing" in page or "pageprops" in page:
+        raise LookupError("missing or disambiguation")  # the old code said it couldn't find anything
+    extract = http.get(f"{api}/w/api.php", params={"action": "query", "prop": "extracts", "explaintext": "",
+                                                    "exintro": "", "titles": title, "format": "json"})
+    return next(iter(extract.json()["query"]["pages"].values()))["extract"]
+
+
+def run() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rtt", type=float, default=0.05, help="Delay added to every request, in seconds")
+    args = parser.parse_args()
+
+    server = StandIn(args.rtt)
+    assistant = main.SpeechAssistant(data_dir=tempfile.mkdtemp(prefix="forte-bench-"))
+    assistant.enable_tts = False
+    assistant.wikipedia_api = server.url
+    assistant.speak = lambda text, *a: None
+    assistant.http.get(f"{server.url}/w/api.php", params={"action": "opensearch", "search": "warm up"})
+    server.take_log()
+    failures = 0
+    print(f"{'query':38} {'new':>14} {'old':>14}  case")
+    for query, expected, why in CASES:
+        assistant.cache.clear()
+        start = time.perf_counter()
+        answer = assistant.search_wikipedia(query)
+        new_time, new_log = time.perf_counter() - start, server.take_log()
+        start = time.perf_counter()
+        try:
+            legacy_summary(assistant.http, server.url, query)
+            old_answer = True
+        except LookupError:
+            old_answer = False
+        old_time, old_log = time.perf_counter() - start, server.take_log()
+        ok = len(new_log) <= expected and not answer.startswith("Sorry")
+        failures += not ok
+        print(f"{query:38} {len(new_log)} req {new_time * 1000:5.0f} ms "
+              f"{len(old_log)} req {old_time * 1000:5.0f} ms  {why}{'' if old_answer else ' (old: no answer)'}"
+              f"{'' if ok else '  FAIL'}")
+    server.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -4,29 +4,69 @@
 # - PianoMan0
 
 import argparse
-import ast
+import array
+import atexit
+import bisect
+import collections
+import concurrent.futures
+import contextlib
+import heapq
+import itertools
+import math
+import mmap
 import operator as op
 import threading
 import queue
-import speech_recognition as sr
+import importlib
 from typing import List, Optional
-import pyttsx3
 import time
 import random
-import wikipedia
 import logging
 import os
 import sys
 import subprocess
 import shutil
-import xml.etree.ElementTree as ET
-import requests
+import sqlite3
+import struct
+import tempfile
+import unicodedata
+from urllib.parse import quote
 import json
 import re
-try:
-    from googletrans import Translator
-except Exception:
-    Translator = None
+
+
+class _LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    Skill dependencies are slow to import (especially on a Pi or in the
+    frozen build), so they load when a skill first needs them instead of
+    before the first prompt. setup.py lists them for cx_Freeze, which can't
+    see these imports.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+sr = _LazyModule("speech_recognition")
+pyttsx3 = _LazyModule("pyttsx3")
+requests = _LazyModule("requests")
+ET = _LazyModule("xml.etree.ElementTree")
+
+
+def _translator_class():
+    # googletrans is optional
+    try:
+        from googletrans import Translator
+        return Translator
+    except Exception:
+        return None
 
 
 class JokeGenerator:
@@ -42,56 +82,2654 @@ class JokeGenerator:
             ],
         }
 
-    def get_random_joke(self, category: Optional[str] = None) -> str:
-        if category:
-            cat = category.lower()
-            if cat in self.jokes and self.jokes[cat]:
-                return random.choice(self.jokes[cat])
-            # fallback to general
-            return random.choice(self.jokes.get("general", ["I have no jokes right now."]))
-        # pick from all jokes
-        all_j = sum(self.jokes.values(), [])
-        return random.choice(all_j) if all_j else "I have no jokes right now."
+    def get_random_joke(self, category: Optional[str] = None) -> str:
+        if category:
+            cat = category.lower()
+            if cat in self.jokes and self.jokes[cat]:
+                return random.choice(self.jokes[cat])
+            # fallback to general
+            return random.choice(self.jokes.get("general", ["I have no jokes right now."]))
+        # pick from all jokes
+        all_j = sum(self.jokes.values(), [])
+        return random.choice(all_j) if all_j else "I have no jokes right now."
+
+
+class FactGenerator:
+    def __init__(self):
+        self.facts = [
+            "The first computer mouse was made of wood!",
+            "The first computer virus was created in 1983!",
+            "The first computer programmer was Ada Lovelace!",
+        ]
+
+    def get_random_fact(self) -> str:
+        return random.choice(self.facts)
+
+
+# Spoken forms rewritten to operators before tokenizing. "x" only counts as
+# "times" between operands, so "exp" and "max" survive.
+_CALC_WORDS = [
+    (re.compile(r"\bcalculate\b|\bwhat is\b|\bwhat's\b|[?=]"), " "),
+    (re.compile(r"\bto the power of\b|\braised to\b"), "**"),
+    (re.compile(r"\bsquared\b"), "**2"),
+    (re.compile(r"\bcubed\b"), "**3"),
+    (re.compile(r"\bsquare root of\b"), "sqrt"),
+    (re.compile(r"\bmultiplied by\b|\btimes\b|×"), "*"),
+    (re.compile(r"\bdivided by\b|\bover\b|÷"), "/"),
+    (re.compile(r"\bplus\b"), "+"),
+    (re.compile(r"\bminus\b"), "-"),
+    (re.compile(r"\bmod(?:ulo)?\b"), "%"),
+    (re.compile(r"(?<=[\d.)\s])x(?=\s*[\d.(])"), "*"),
+]
+_CALC_TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*(?:e[+-]?\d+)?|\.\d+(?:e[+-]?\d+)?)|([a-z_][a-z0-9_]*)|(\*\*|//|[-+*/%^(),!]))")
+
+
+class Calculator:
+    """Arithmetic for "calculate ..." with hard limits on time and size.
+
+    Expressions are parsed with a shunting-yard pass into postfix and then
+    evaluated with an explicit stack, so nesting can't blow the recursion
+    limit. Integer results are capped at `max_digits` digits, and powers and
+    factorials are checked *before* they run, so "9 ** 9 ** 9" is refused
+    instantly instead of pinning a core. Evaluation also stops at `deadline`
+    seconds. All failures are raised as SkillError with a spoken message.
+    """
+
+    # binary operators: symbol -> (precedence, right associative, function)
+    BINARY = {
+        "+": (1, False, op.add),
+        "-": (1, False, op.sub),
+        "*": (2, False, op.mul),
+        "/": (2, False, op.truediv),
+        "//": (2, False, op.floordiv),
+        "%": (2, False, op.mod),
+        "**": (4, True, None),  # see _power
+    }
+    # prefix operators (unary minus, and functions written without brackets) bind between * and **
+    PREFIX_PRECEDENCE = 3
+    # name -> (function, min args, max args)
+    FUNCTIONS = {
+        "sqrt": (math.sqrt, 1, 1),
+        "sin": (math.sin, 1, 1),
+        "cos": (math.cos, 1, 1),
+        "tan": (math.tan, 1, 1),
+        "asin": (math.asin, 1, 1),
+        "acos": (math.acos, 1, 1),
+        "atan": (math.atan, 1, 1),
+        "degrees": (math.degrees, 1, 1),
+        "radians": (math.radians, 1, 1),
+        "exp": (math.exp, 1, 1),
+        "ln": (math.log, 1, 1),
+        "log": (math.log, 1, 2),
+        "log10": (math.log10, 1, 1),
+        "log2": (math.log2, 1, 1),
+        "abs": (abs, 1, 1),
+        "round": (round, 1, 2),
+        "floor": (math.floor, 1, 1),
+        "ceil": (math.ceil, 1, 1),
+        "factorial": (None, 1, 1),  # see _factorial
+        "min": (min, 1, 32),
+        "max": (max, 1, 32),
+        "neg": (op.neg, 1, 1),
+        "pos": (op.pos, 1, 1),
+    }
+    CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+    def __init__(self, max_digits: int = 300, deadline: float = 0.25, max_length: int = 256):
+        self.max_length = max_length
+        self.deadline = deadline
+        self.max_bits = int(max_digits * math.log2(10)) + 1
+
+    def evaluate(self, expression: str):
+        """The value of a spoken or typed expression (int or float)."""
+        text = expression.lower()
+        for pattern, replacement in _CALC_WORDS:
+            text = pattern.sub(replacement, text)
+        text = text.strip()
+        if not text:
+            raise SkillError("What would you like me to calculate?")
+        if len(text) > self.max_length:
+            raise SkillError("That expression is too long for me.")
+        return self._run(self._postfix(self._tokens(text)))
+
+    @staticmethod
+    def format(value) -> str:
+        if isinstance(value, float):
+            if value.is_integer() and abs(value) < 1e15:
+                return str(int(value))
+            return f"{value:.12g}"
+        return str(value)
+
+    def _tokens(self, text: str) -> list:
+        tokens, pos = [], 0
+        text = text.rstrip()
+        while pos < len(text):
+            m = _CALC_TOKEN_RE.match(text, pos)
+            if m is None:
+                raise SkillError("Sorry, I couldn't understand that calculation.")
+            number, name, symbol = m.groups()
+            if number is not None:
+                value = float(number) if any(c in number for c in ".e") else int(number)
+                try:
+                    # literals get the same limits as results ("1e400" is inf)
+                    tokens.append(("num", self._check(value)))
+                except OverflowError:
+                    raise SkillError("That number is too big for me to work out.")
+            elif name is not None:
+                if name in self.CONSTANTS:
+                    tokens.append(("num", self.CONSTANTS[name]))
+                elif name in self.FUNCTIONS:
+                    tokens.append(("fn", name))
+                else:
+                    raise SkillError(f"I don't know what {name} means in a calculation.")
+            else:
+                tokens.append(("sym", "**" if symbol == "^" else symbol))
+            pos = m.end()
+        return tokens
+
+    def _postfix(self, tokens: list) -> list:
+        syntax = SkillError("Sorry, I couldn't understand that calculation.")
+        out = []
+        stack = []  # ("bin", sym) / ("pre", fn name) / ("(", fn name or None)
+        argc = []  # argument counts of the open function calls
+        expect_operand = True
+        for i, (kind, value) in enumerate(tokens):
+            if kind == "num":
+                if not expect_operand:
+                    raise syntax
+                out.append(("num", value))
+                expect_operand = False
+            elif kind == "fn":
+                if not expect_operand:
+                    raise syntax
+                if i + 1 < len(tokens) and tokens[i + 1] == ("sym", "("):
+                    stack.append(("fn", value))
+                else:
+                    stack.append(("pre", value))  # "sqrt 16"
+            elif value == "(":
+                if not expect_operand:
+                    raise syntax
+                call = stack.pop()[1] if stack and stack[-1][0] == "fn" else None
+                stack.append(("(", call))
+                if call:
+                    argc.append(1)
+            elif value in (")", ","):
+                if expect_operand:
+                    raise syntax
+                while stack and stack[-1][0] != "(":
+                    out.append(stack.pop())
+                if not stack:
+                    raise syntax
+                if value == ",":
+                    if stack[-1][1] is None:
+                        raise syntax
+                    argc[-1] += 1
+                    expect_operand = True
+                    continue
+                call = stack.pop()[1]
+                if call:
+                    out.append(("call", call, argc.pop()))
+            elif value == "!":
+                if expect_operand:
+                    raise syntax
+                out.append(("call", "factorial", 1))
+            elif expect_operand:
+                if value not in "+-":
+                    raise syntax
+                stack.append(("pre", "neg" if value == "-" else "pos"))
+            else:
+                prec, right, _ = self.BINARY[value]
+                while stack and stack[-1][0] in ("bin", "pre"):
+                    top = self.PREFIX_PRECEDENCE if stack[-1][0] == "pre" else self.BINARY[stack[-1][1]][0]
+                    if top > prec or (top == prec and not right):
+                        out.append(stack.pop())
+                    else:
+                        break
+                stack.append(("bin", value))
+                expect_operand = True
+        if expect_operand:
+            raise syntax
+        while stack:
+            item = stack.pop()
+            if item[0] not in ("bin", "pre"):
+                raise syntax
+            out.append(item)
+        return out
+
+    def _run(self, program: list):
+        deadline = time.monotonic() + self.deadline
+        stack = []
+        try:
+            for step, item in enumerate(program):
+                if step % 64 == 63 and time.monotonic() > deadline:
+                    raise SkillError("That calculation is taking too long, so I stopped.")
+                kind = item[0]
+                if kind == "num":
+                    stack.append(item[1])
+                    continue
+                if kind == "bin":
+                    b = stack.pop()
+                    a = stack.pop()
+                    value = self._power(a, b) if item[1] == "**" else self.BINARY[item[1]][2](a, b)
+                else:
+                    name = item[1]
+                    n = item[2] if kind == "call" else 1
+                    fn, lo, hi = self.FUNCTIONS[name]
+                    if not lo <= n <= hi:
+                        raise SkillError(f"{name} takes {lo if lo == hi else f'{lo} to {hi}'} numbers.")
+                    args = stack[-n:]
+                    del stack[-n:]
+                    value = self._factorial(args[0]) if name == "factorial" else fn(*args)
+                stack.append(self._check(value))
+        except ZeroDivisionError:
+            raise SkillError("I can't divide by zero.")
+        except OverflowError:
+            raise SkillError("That number is too big for me to work out.")
+        except (ValueError, TypeError):
+            raise SkillError("That doesn't have a real answer.")
+        return stack[0]
+
+    def _power(self, a, b):
+        if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+            # the result has about b * bits(a) bits; refuse before computing it
+            if b > self.max_bits or b * (abs(a).bit_length() - 1) > self.max_bits:
+                raise OverflowError
+        return a ** b
+
+    def _factorial(self, n):
+        if isinstance(n, float) and n.is_integer():
+            n = int(n)
+        if not isinstance(n, int) or n < 0:
+            raise ValueError
+        if n > 1 and math.lgamma(n + 1) / math.log(2) > self.max_bits:
+            raise OverflowError
+        return math.factorial(n)
+
+    def _check(self, value):
+        if isinstance(value, complex):
+            raise ValueError
+        if isinstance(value, int) and value.bit_length() > self.max_bits:
+            raise OverflowError
+        if isinstance(value, float) and math.isinf(value):
+            raise OverflowError
+        if isinstance(value, float) and math.isnan(value):
+            raise ValueError
+        return value
+
+
+class ScheduledItem:
+    def __init__(self, item_id: int, due: float, message: str, kind: str = "reminder", interval: Optional[float] = None):
+        self.id = item_id
+        self.due = due
+        self.message = message
+        self.kind = kind  # "reminder" or "timer"
+        # seconds between repeats for recurring items, None for one-shot
+        self.interval = interval
+        # bumped on every reschedule so older heap entries can be recognized as stale
+        self.version = 0
+
+
+class Scheduler:
+    """Runs every reminder and timer from one thread and a min-heap of deadlines.
+
+    The heap holds (due, id, version) entries. Cancelling or rescheduling an
+    item just updates the item table, and the outdated heap entries are
+    skipped when they reach the top, so both are O(log n) and the thread
+    count stays at one however many items are pending. Fired one-shot items
+    are removed; recurring ones are pushed back with their next deadline.
+
+    Each kind also has two sorted indexes, of (due, id) and of ids, so
+    listing, counting and picking "the 3rd reminder" or "the newest timer"
+    never sort or scan the whole table.
+    """
+
+    def __init__(self, on_fire):
+        self.on_fire = on_fire
+        self.logger = logging.getLogger("Forte")
+        self._heap: List[tuple] = []
+        self._items = {}  # id -> ScheduledItem
+        self._by_due = collections.defaultdict(list)  # kind -> sorted [(due, id)]
+        self._by_id = collections.defaultdict(list)  # kind -> sorted [id]
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="forte-scheduler", daemon=True)
+        self._thread.start()
+
+    def schedule(self, due: float, message: str, kind: str = "reminder", interval: Optional[float] = None) -> ScheduledItem:
+        with self._cond:
+            item = ScheduledItem(next(self._ids), due, message, kind, interval)
+            self._items[item.id] = item
+            self._index(item)
+            self._push(item)
+            return item
+
+    def cancel(self, item_id: int) -> Optional[ScheduledItem]:
+        with self._cond:
+            item = self._items.pop(item_id, None)
+            if item is not None:
+                self._unindex(item)
+            return item
+
+    def reschedule(self, item: ScheduledItem, due: float) -> ScheduledItem:
+        """Move an item to a new deadline, re-adding it if it already fired (snooze)."""
+        with self._cond:
+            if self._items.get(item.id) is item:
+                self._unindex(item)
+            item.due = due
+            item.version += 1
+            self._items[item.id] = item
+            self._index(item)
+            self._push(item)
+            return item
+
+    def pending(self, kind: Optional[str] = None) -> List[ScheduledItem]:
+        """Pending items (of one kind, or all), soonest first."""
+        with self._cond:
+            if kind is not None:
+                return [self._items[item_id] for _, item_id in self._by_due.get(kind, ())]
+            return [self._items[item_id] for _, item_id in heapq.merge(*self._by_due.values())]
+
+    def pick(self, kind: str, number: Optional[int] = None) -> Optional[ScheduledItem]:
+        """The number-th pending item of `kind` by due time (1-based), or the newest one."""
+        with self._cond:
+            if number is None:
+                ids = self._by_id.get(kind)
+                return self._items[ids[-1]] if ids else None
+            keys = self._by_due.get(kind, ())
+            if 1 <= number <= len(keys):
+                return self._items[keys[number - 1][1]]
+            return None
+
+    def count(self, kind: Optional[str] = None) -> int:
+        with self._cond:
+            return len(self._items) if kind is None else len(self._by_id.get(kind, ()))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def held(self):
+        """Context manager that keeps anything from firing until it exits."""
+        return self._cond
+
+    def _index(self, item: ScheduledItem) -> None:
+        # caller holds self._cond
+        bisect.insort(self._by_due[item.kind], (item.due, item.id))
+        bisect.insort(self._by_id[item.kind], item.id)
+
+    def _unindex(self, item: ScheduledItem) -> None:
+        # caller holds self._cond; the item must still be indexed under its current due time
+        for keys, key in ((self._by_due[item.kind], (item.due, item.id)), (self._by_id[item.kind], item.id)):
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+
+    def _push(self, item: ScheduledItem) -> None:
+        # caller holds self._cond
+        heapq.heappush(self._heap, (item.due, item.id, item.version))
+        if len(self._heap) > 2 * len(self._items) + 64:
+            # too many stale entries from cancels/snoozes; rebuild
+            self._heap = [(it.due, it.id, it.version) for it in self._items.values()]
+            heapq.heapify(self._heap)
+        if self._heap[0][1] == item.id:
+            # new earliest deadline; wake the scheduler thread
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            due_items = []
+            with self._cond:
+                while not due_items:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    due, item_id, version = self._heap[0]
+                    item = self._items.get(item_id)
+                    if item is None or item.version != version:
+                        heapq.heappop(self._heap)
+                        continue
+                    now = time.time()
+                    if due > now:
+                        self._cond.wait(due - now)
+                        continue
+                    # pop everything that is due in one go
+                    while self._heap and self._heap[0][0] <= now:
+                        due, item_id, version = heapq.heappop(self._heap)
+                        item = self._items.get(item_id)
+                        if item is None or item.version != version:
+                            continue
+                        due_items.append(item)
+                        self._unindex(item)
+                        if item.interval:
+                            while item.due <= now:
+                                item.due += item.interval
+                            item.version += 1
+                            self._index(item)
+                            heapq.heappush(self._heap, (item.due, item.id, item.version))
+                        else:
+                            del self._items[item_id]
+            for item in due_items:
+                try:
+                    self.on_fire(item)
+                except Exception:
+                    self.logger.exception("Scheduled item %s failed", item.id)
+
+
+class ReminderJournal:
+    """Append-only, crash-safe log of reminder and timer changes.
+
+    Each change is one JSON line ("add", "fire" or "cancel"), flushed and
+    fsynced, so a write costs O(1) no matter how many reminders exist and a
+    crash loses at most the line being written. replay() folds the log into
+    the set of live items; compact() rewrites it as just those items.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger("Forte")
+        self._lock = threading.Lock()
+        self._fh = None
+        # lines in the file, used to decide when to compact
+        self.records = 0
+
+    def replay(self) -> List[dict]:
+        live = {}
+        self.records = 0
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # torn last line from a crash
+                        continue
+                    self.records += 1
+                    action = rec.get("op")
+                    if action == "add":
+                        live[rec["id"]] = rec
+                    elif action == "cancel":
+                        live.pop(rec["id"], None)
+                    elif action == "fire":
+                        if rec.get("next") is not None and rec["id"] in live:
+                            live[rec["id"]]["due"] = rec["next"]
+                        else:
+                            live.pop(rec["id"], None)
+        return list(live.values())
+
+    def _write(self, rec: dict) -> None:
+        with self._lock:
+            try:
+                if self._fh is None:
+                    self._fh = open(self.path, "a", encoding="utf-8")
+                self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+                self.records += 1
+            except Exception:
+                self.logger.exception("Failed to write reminder journal")
+
+    def add(self, item: ScheduledItem) -> None:
+        self._write({"op": "add", "id": item.id, "due": item.due, "message": item.message,
+                     "kind": item.kind, "interval": item.interval})
+
+    def fire(self, item: ScheduledItem) -> None:
+        self._write({"op": "fire", "id": item.id, "next": item.due if item.interval else None})
+
+    def cancel(self, item: ScheduledItem) -> None:
+        self._write({"op": "cancel", "id": item.id})
+
+    def compact(self, items: List[ScheduledItem]) -> None:
+        with self._lock:
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    for it in items:
+                        f.write(json.dumps({"op": "add", "id": it.id, "due": it.due, "message": it.message,
+                                            "kind": it.kind, "interval": it.interval}, ensure_ascii=False) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                if self._fh is not None:
+                    self._fh.close()
+                    self._fh = None
+                os.replace(tmp, self.path)
+                self.records = len(items)
+            except Exception:
+                self.logger.exception("Failed to compact reminder journal")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class ReminderManager:
+    def __init__(self, notify=None, journal: Optional[ReminderJournal] = None):
+        # called with the reminder/timer text when it fires; falls back to print
+        self.notify = notify
+        # every change is appended here so reminders survive restarts
+        self.journal = journal
+        self.scheduler = Scheduler(self._fire)
+        # most recently fired item, for "snooze"
+        self.last_fired: Optional[ScheduledItem] = None
+
+    def restore(self) -> int:
+        """Replay the journal. Items that came due while we were down fire right away."""
+        if self.journal is None:
+            return 0
+        records = self.journal.replay()
+        # ids are per-process, so the journal is rewritten under the new ones;
+        # nothing may fire (and log under a new id) before that rewrite
+        with self.scheduler.held():
+            for rec in records:
+                try:
+                    self.scheduler.schedule(float(rec["due"]), rec.get("message", "Reminder"),
+                                            rec.get("kind", "reminder"), interval=rec.get("interval"))
+                except Exception:
+                    continue
+            self.journal.compact(self.pending())
+        return len(records)
+
+    def _schedule(self, due: float, message: str, kind: str, interval: Optional[float] = None) -> ScheduledItem:
+        item = self.scheduler.schedule(due, message, kind, interval=interval)
+        self._log("add", item)
+        return item
+
+    def _log(self, action: str, item: ScheduledItem) -> None:
+        if self.journal is None:
+            return
+        getattr(self.journal, action)(item)
+        if self.journal.records > 2 * len(self.scheduler) + 100:
+            self.journal.compact(self.pending())
+
+    def add_reminder(self, duration: float, message: str, every: Optional[float] = None) -> ScheduledItem:
+        """Remind in `duration` minutes, then every `every` minutes if given."""
+        return self.add_reminder_at(time.time() + duration * 60, message, every)
+
+    def add_reminder_at(self, fire_at: float, message: str, every: Optional[float] = None) -> ScheduledItem:
+        return self._schedule(fire_at, message, "reminder", interval=every * 60 if every else None)
+
+    def add_timer(self, seconds: float, message: str) -> ScheduledItem:
+        return self._schedule(time.time() + seconds, message, "timer")
+
+    def pending(self, kind: Optional[str] = None) -> List[ScheduledItem]:
+        return self.scheduler.pending(kind)
+
+    def count(self, kind: Optional[str] = None) -> int:
+        return self.scheduler.count(kind)
+
+    def list_reminders(self) -> List[str]:
+        now = time.time()
+        items = []
+        for n, it in enumerate(self.pending("reminder"), 1):
+            when = f"in {int((it.due-now)//60)}m" if it.due > now else "due"
+            every = f" (every {int(it.interval//60)}m)" if it.interval else ""
+            items.append(f"{n}. {when}: {it.message}{every}")
+        return items
+
+    def cancel(self, kind: str = "reminder", number: Optional[int] = None) -> Optional[ScheduledItem]:
+        """Cancel the number-th pending item as listed (1-based), or the newest one."""
+        target = self.scheduler.pick(kind, number)
+        if target is None:
+            return None
+        item = self.scheduler.cancel(target.id)
+        if item is not None:
+            self._log("cancel", item)
+        return item
+
+    def snooze(self, minutes: float = 5) -> Optional[ScheduledItem]:
+        item = self.last_fired
+        if item is None:
+            return None
+        self.last_fired = None
+        item = self.scheduler.reschedule(item, time.time() + minutes * 60)
+        self._log("add", item)
+        return item
+
+    def _fire(self, item: ScheduledItem) -> None:
+        self.last_fired = item
+        text = f"Timer: {item.message}" if item.kind == "timer" else f"Reminder: {item.message}"
+        if self.notify is not None:
+            self.notify(text)
+        else:
+            print(text)
+        # only marked fired once delivered: exiting in between repeats it next run rather than losing it
+        self._log("fire", item)
+
+
+class NotesStore:
+    """Notes kept in SQLite, with an FTS5 index for "search notes for ...".
+
+    Inserts and deletes touch one row (plus its index entry) instead of
+    rewriting every note, ids come from the database so they never collide,
+    and WAL mode keeps concurrent writers from corrupting the file. Falls
+    back to LIKE matching if this SQLite was built without FTS5. The old
+    notes.json is imported the first time the database is created.
+    """
+
+    def __init__(self, path: str, legacy_json: Optional[str] = None):
+        self.path = path
+        self.logger = logging.getLogger("Forte")
+        self._lock = threading.Lock()
+        fresh = not os.path.exists(path)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT NOT NULL, created REAL NOT NULL)")
+        try:
+            self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(text, content='notes', content_rowid='id')")
+            self._db.executescript("""
+                CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+                    INSERT INTO notes_fts(rowid, text) VALUES (new.id, new.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+                    INSERT INTO notes_fts(notes_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                END;
+            """)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.logger.warning("SQLite has no FTS5; note search will be slower")
+            self.fts = False
+        self._db.commit()
+        if fresh and legacy_json:
+            self._migrate(legacy_json)
+
+    def _migrate(self, legacy_json: str) -> None:
+        try:
+            with open(legacy_json, "r", encoding="utf-8") as f:
+                old = json.load(f)
+        except Exception:
+            return
+        with self._lock, self._db:
+            for n in old:
+                try:
+                    # keep the old ids so "delete note <id>" still works; duplicates get a new one
+                    self._db.execute("INSERT OR IGNORE INTO notes (id, text, created) VALUES (?, ?, ?)",
+                                     (int(n["id"]), str(n["text"]), float(n["id"])))
+                    if self._db.execute("SELECT changes()").fetchone()[0] == 0:
+                        self._db.execute("INSERT INTO notes (text, created) VALUES (?, ?)", (str(n["text"]), float(n["id"])))
+                except Exception:
+                    continue
+        self.logger.info("Imported %d notes from %s", len(old), legacy_json)
+
+    def add(self, text: str) -> int:
+        with self._lock, self._db:
+            cur = self._db.execute("INSERT INTO notes (text, created) VALUES (?, ?)", (text, time.time()))
+            return cur.lastrowid
+
+    def delete(self, note_id: int) -> bool:
+        note_id = int(note_id)
+        if not -2 ** 63 <= note_id < 2 ** 63:
+            # no SQLite INTEGER is that large, so no note has that id
+            return False
+        with self._lock, self._db:
+            cur = self._db.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+            return cur.rowcount > 0
+
+    def list(self, limit: Optional[int] = None) -> List[tuple]:
+        with self._lock:
+            return self._db.execute("SELECT id, text FROM notes ORDER BY id LIMIT ?", (limit or -1,)).fetchall()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def search(self, term: str, limit: int = 10) -> List[tuple]:
+        words = re.findall(r"\w+", term)
+        if not words:
+            return []
+        with self._lock:
+            if self.fts:
+                # every word must match, as a prefix ("milk" finds "milkshake")
+                query = " ".join(f'"{w}"*' for w in words)
+                return self._db.execute(
+                    "SELECT notes.id, notes.text FROM notes_fts JOIN notes ON notes.id = notes_fts.rowid "
+                    "WHERE notes_fts MATCH ? ORDER BY rank LIMIT ?", (query, limit)).fetchall()
+            where = " AND ".join("text LIKE ?" for _ in words)
+            return self._db.execute(f"SELECT id, text FROM notes WHERE {where} ORDER BY id LIMIT ?",
+                                    [f"%{w}%" for w in words] + [limit]).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ConversationLog:
+    """Buffered JSONL conversation log, written by a background thread.
+
+    Records ({"ts", "role", "text"}, plus "session" for --serve clients) are
+    queued by write() and appended to one open file handle in batches: once
+    `flush_every` records are waiting, every `flush_interval` seconds, on
+    flush() and on close()/exit.
+    """
+
+    # bytes read at a time when tail() scans back from the end of the file
+    TAIL_BLOCK = 64 * 1024
+
+    def __init__(self, path: str, flush_every: int = 20, flush_interval: float = 2.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger("Forte")
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="forte-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, role: str, text: str, session: Optional[str] = None) -> None:
+        record = {"ts": time.time(), "role": role, "text": text}
+        if session is not None:
+            record["session"] = session
+        self._queue.put(record)
+
+    def flush(self, timeout: float = 2.0) -> None:
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def tail(self, n: int, session: Optional[str] = None) -> List[dict]:
+        """The last n records of a session (None = the console) on disk, after flushing what is buffered.
+
+        The file is read backwards a block at a time, stopping once n records
+        are found, so this doesn't slow down as the log grows.
+        """
+        self.flush()
+        out: List[dict] = []
+        if n <= 0:
+            return out
+        try:
+            with open(self.path, "rb") as f:
+                pos = f.seek(0, os.SEEK_END)
+                partial = b""
+                while pos > 0 and len(out) < n:
+                    size = min(self.TAIL_BLOCK, pos)
+                    pos -= size
+                    f.seek(pos)
+                    lines = (f.read(size) + partial).split(b"\n")
+                    # the first piece may be the end of a line that starts in an earlier block
+                    partial = lines.pop(0) if pos > 0 else b""
+                    for line in reversed(lines):
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if record.get("session") == session:
+                            out.append(record)
+                            if len(out) == n:
+                                break
+        except FileNotFoundError:
+            pass
+        out.reverse()
+        return out
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=2)
+
+    def _run(self) -> None:
+        fh = None
+        buf: List[str] = []
+        last = time.time()
+
+        def write_out():
+            nonlocal fh, last
+            last = time.time()
+            if not buf:
+                return
+            try:
+                if fh is None:
+                    fh = open(self.path, "a", encoding="utf-8")
+                fh.writelines(buf)
+                fh.flush()
+            except Exception:
+                self.logger.debug("Failed to write conversation log")
+            buf.clear()
+
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = False
+            if item is None:
+                write_out()
+                if fh is not None:
+                    fh.close()
+                return
+            if isinstance(item, threading.Event):
+                write_out()
+                item.set()
+                continue
+            if item:
+                buf.append(json.dumps(item, ensure_ascii=False) + "\n")
+            if len(buf) >= self.flush_every or time.time() - last >= self.flush_interval:
+                write_out()
+
+
+class LatencyStats:
+    """Latency histograms for each stage of a turn, optionally split by label (intent).
+
+    Samples go into fixed log-spaced buckets (each 20% wider than the last,
+    from 50 us up to about two minutes), so recording is cheap and memory
+    stays fixed however long Forte runs. Percentiles are interpolated from
+    the buckets, which keeps them within about 10%.
+    """
+
+    BASE = 50e-6
+    GROWTH = 1.2
+    BUCKETS = 82
+
+    def __init__(self):
+        self._series = {}  # (stage, label) -> [bucket counts, count, total seconds, max seconds]
+        self._lock = threading.Lock()
+        self._log_growth = math.log(self.GROWTH)
+
+    def record(self, stage: str, seconds: float, label: str = "") -> None:
+        if seconds <= self.BASE:
+            i = 0
+        else:
+            i = min(self.BUCKETS - 1, int(math.log(seconds / self.BASE) / self._log_growth) + 1)
+        with self._lock:
+            series = self._series.get((stage, label))
+            if series is None:
+                series = self._series[(stage, label)] = [[0] * self.BUCKETS, 0, 0.0, 0.0]
+            series[0][i] += 1
+            series[1] += 1
+            series[2] += seconds
+            if seconds > series[3]:
+                series[3] = seconds
+
+    @contextlib.contextmanager
+    def span(self, stage: str, label: str = ""):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, label)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _percentile(self, buckets: List[int], count: int, peak: float, q: float) -> float:
+        rank = q * count
+        seen = 0
+        for i, n in enumerate(buckets):
+            if n and seen + n >= rank:
+                lo = self.BASE * self.GROWTH ** (i - 1) if i else 0.0
+                hi = self.BASE * self.GROWTH ** i
+                return min(peak, lo + (hi - lo) * (rank - seen) / n)
+            seen += n
+        return peak
+
+    def snapshot(self) -> List[dict]:
+        """One dict per (stage, label): count, sum, max and p50/p95/p99, in seconds."""
+        with self._lock:
+            items = [(key, list(s[0]), s[1], s[2], s[3]) for key, s in self._series.items()]
+        out = []
+        for (stage, label), buckets, count, total, peak in sorted(items):
+            row = {"stage": stage, "label": label, "count": count, "sum": total, "max": peak}
+            for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+                row[name] = self._percentile(buckets, count, peak, q)
+            out.append(row)
+        return out
+
+    def lines(self, labelled: bool = False) -> List[str]:
+        """Readable summaries: the stages, or (labelled=True) the per-intent series."""
+        def ms(seconds: float) -> str:
+            return f"{seconds:.2f} s" if seconds >= 1 else f"{seconds * 1000:.2f} ms"
+
+        return [f"{row['stage']}{' ' + row['label'] if row['label'] else ''}: p50 {ms(row['p50'])}, "
+                f"p95 {ms(row['p95'])}, p99 {ms(row['p99'])}, {row['count']} samples"
+                for row in self.snapshot() if bool(row["label"]) == labelled]
+
+    def to_json(self) -> str:
+        return json.dumps({"time": time.time(), "series": self.snapshot()}, indent=1)
+
+    def to_prometheus(self) -> str:
+        """The histograms as Prometheus summaries (text exposition format)."""
+        def labels(row: dict, **extra) -> str:
+            pairs = [("stage", row["stage"])] + ([("intent", row["label"])] if row["label"] else []) + list(extra.items())
+            return ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                            for k, v in pairs)
+
+        out = ["# HELP forte_stage_seconds Time spent in each stage of a Forte turn.",
+               "# TYPE forte_stage_seconds summary"]
+        for row in self.snapshot():
+            for name, q in (("p50", "0.5"), ("p95", "0.95"), ("p99", "0.99")):
+                out.append(f"forte_stage_seconds{{{labels(row, quantile=q)}}} {row[name]:.6g}")
+            out.append(f"forte_stage_seconds_sum{{{labels(row)}}} {row['sum']:.6g}")
+            out.append(f"forte_stage_seconds_count{{{labels(row)}}} {row['count']}")
+        return "\n".join(out) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Write to `path` atomically: JSON for *.json, otherwise Prometheus text (node_exporter textfile style)."""
+        body = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+
+class Session:
+    """Conversation state for one client: the local console or a --serve client.
+
+    Handlers reach it through SpeechAssistant.session, which is the session
+    bound to the current thread by run_command(), or else the console. When
+    `sink` is set, replies are passed to it as text instead of being spoken.
+    """
+
+    def __init__(self, session_id: Optional[str] = None, history_limit: int = 500, sink=None):
+        self.id = session_id
+        self.sink = sink
+        self.last_user_message: Optional[str] = None
+        self.last_response: Optional[str] = None
+        # recent turns as "Role: text" lines; older ones are only in the on-disk log
+        self.history: "collections.deque[str]" = collections.deque(maxlen=history_limit)
+        # turns recorded since the last /clear (may exceed the ring buffer)
+        self.history_total = 0
+        self.lock = threading.Lock()
+        # held while one of its commands runs, so a client's turns stay in order
+        self.turn = threading.Lock()
+        self.last_active = time.time()
+
+
+USER_AGENT = "Forte/1.0 (email@example.com)"
+
+
+class HttpClient:
+    """One keep-alive requests.Session shared by every network skill.
+
+    Connections are pooled per host, at most `pool_size` each (more
+    concurrent requests to one host wait for a free connection), so repeat
+    calls skip DNS/TCP/TLS setup. Idempotent GETs are retried with exponential
+    backoff on connection errors and 429/5xx responses.
+    """
+
+    def __init__(self, pool_size: int = 4, connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 retries: int = 2, backoff: float = 0.3):
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # built on first use so importing requests doesn't slow down startup
+        with self._lock:
+            if self._session is None:
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                session.headers.update({"User-Agent": USER_AGENT})
+                retry = Retry(total=self.retries, connect=self.retries, read=self.retries, backoff_factor=self.backoff,
+                              status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset(["GET", "HEAD"]),
+                              raise_on_status=False)
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=self.pool_size, max_retries=retry,
+                                      pool_block=True)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def get(self, url: str, read_timeout: Optional[float] = None, **kwargs):
+        """GET through the shared session. Extra kwargs go to requests (params, headers...)."""
+        timeout = (self.timeout[0], read_timeout) if read_timeout is not None else self.timeout
+        return self.session.get(url, timeout=timeout, **kwargs)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+class SkillError(Exception):
+    """A user-facing failure from a skill (e.g. unknown city); never cached."""
+
+
+class ResponseCache:
+    """TTL + LRU cache in front of network-backed skills.
+
+    Entries are keyed by (service, key) and expire after the service's TTL.
+    At most `max_entries` are kept; the least recently used go first.
+    Concurrent misses for the same entry are coalesced so only one fetch
+    goes out. If `path` is set, the cache can be saved to and loaded from a
+    JSON file so warm answers survive a restart (values must be JSON-able).
+    """
+
+    # seconds each kind of answer stays fresh
+    DEFAULT_TTLS = {
+        "weather": 10 * 60,
+        "news": 5 * 60,
+        "currency": 60 * 60,
+        "define": 30 * 24 * 3600,
+        "wikipedia": 7 * 24 * 3600,
+        "translate": 30 * 24 * 3600,
+    }
+
+    def __init__(self, max_entries: int = 512, path: Optional[str] = None, ttls: Optional[dict] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.logger = logging.getLogger("Forte")
+        self._entries: "collections.OrderedDict[str, tuple]" = collections.OrderedDict()  # id -> (expires_at, value)
+        self._inflight = {}  # id -> [Event, value, exception]
+        self._lock = threading.Lock()
+        self.hits = collections.Counter()
+        self.misses = collections.Counter()
+
+    @staticmethod
+    def _id(service: str, key) -> str:
+        return json.dumps([service, key], ensure_ascii=False, default=str)
+
+    def get_or_fetch(self, service: str, key, fetch):
+        """Return the cached value for (service, key), calling fetch() on a miss."""
+        cid = self._id(service, key)
+        with self._lock:
+            entry = self._entries.get(cid)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._entries.move_to_end(cid)
+                    self.hits[service] += 1
+                    return entry[1]
+                del self._entries[cid]
+            waiting = self._inflight.get(cid)
+            if waiting is None:
+                self.misses[service] += 1
+                self._inflight[cid] = slot = [threading.Event(), None, None]
+            else:
+                self.hits[service] += 1
+        if waiting is not None:
+            # someone else is already fetching this; share their result
+            waiting[0].wait()
+            if waiting[2] is not None:
+                raise waiting[2]
+            return waiting[1]
+        try:
+            value = fetch()
+            slot[1] = value
+            self.put(service, key, value)
+            return value
+        except Exception as e:
+            slot[2] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(cid, None)
+            slot[0].set()
+
+    def get(self, service: str, key):
+        """The fresh cached value for (service, key), or None."""
+        cid = self._id(service, key)
+        with self._lock:
+            entry = self._entries.get(cid)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(cid)
+                self.hits[service] += 1
+                return entry[1]
+            self.misses[service] += 1
+            return None
+
+    def put(self, service: str, key, value) -> None:
+        cid = self._id(service, key)
+        with self._lock:
+            self._entries[cid] = (time.time() + self.ttls.get(service, 300), value)
+            self._entries.move_to_end(cid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits.clear()
+            self.misses.clear()
+
+    def stats(self) -> List[str]:
+        with self._lock:
+            services = sorted(set(self.hits) | set(self.misses))
+            lines = [f"{s}: {self.hits[s]} hits, {self.misses[s]} misses" for s in services]
+            lines.append(f"{len(self._entries)} of {self.max_entries} entries cached")
+        return lines
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            now = time.time()
+            with self._lock:
+                for cid, expires_at, value in data:
+                    if expires_at > now:
+                        self._entries[cid] = (expires_at, value)
+        except Exception:
+            self.logger.exception("Failed to load response cache")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        try:
+            now = time.time()
+            with self._lock:
+                data = [[cid, exp, value] for cid, (exp, value) in self._entries.items() if exp > now]
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception:
+            self.logger.exception("Failed to save response cache")
+
+
+NEWS_FEEDS = {
+    "google": "https://news.google.com/rss?hl=en-US&gl=US&ceid=US:en",
+    "bbc": "http://feeds.bbci.co.uk/news/rss.xml",
+}
+
+# " - Reuters" style publisher suffixes Google News adds to titles
+_HEADLINE_SUFFIX_RE = re.compile(r"\s+[-\u2013\u2014|]\s+[^-\u2013\u2014|]{1,40}$")
+_HEADLINE_PUNCT_RE = re.compile(r"[\W_]+")
+
+
+def headline_key(title: str) -> str:
+    """Normalized headline used to spot the same story in different feeds."""
+    return _HEADLINE_PUNCT_RE.sub(" ", _HEADLINE_SUFFIX_RE.sub("", title).lower()).strip()
+
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+class FeedReader:
+    """Reads the first few items of RSS (or Atom) feeds without downloading all of them.
+
+    The response body is parsed incrementally with iterparse, and parsing
+    stops once `limit` items have been seen. The rest of a small feed is
+    read and dropped so its keep-alive connection can be reused; a big one
+    is cut off, giving up the connection instead of downloading it all.
+    Each feed's ETag/Last-Modified are remembered, and an unchanged feed
+    comes back as a 304 with no body.
+    """
+
+    # most of a feed left unread that is still drained to keep the connection
+    DRAIN_BYTES = 256 * 1024
+
+    def __init__(self, http: "HttpClient"):
+        self.http = http
+        self._validators = {}  # url -> (etag, last_modified, headlines)
+        self._lock = threading.Lock()
+        self.not_modified = 0
+
+    def headlines(self, url: str, limit: int = 5) -> list:
+        """Top (title, link) pairs from the feed at `url`."""
+        with self._lock:
+            etag, modified, previous = self._validators.get(url, (None, None, None))
+        headers = {}
+        if previous is not None:
+            if etag:
+                headers["If-None-Match"] = etag
+            if modified:
+                headers["If-Modified-Since"] = modified
+        r = self.http.get(url, headers=headers, stream=True)
+        try:
+            if r.status_code == 304 and previous is not None:
+                self.not_modified += 1
+                return previous[:limit]
+            r.raise_for_status()
+            r.raw.decode_content = True
+            items = self.parse(r.raw, limit)
+        finally:
+            self._drain(r)
+            r.close()
+        with self._lock:
+            self._validators[url] = (r.headers.get("ETag"), r.headers.get("Last-Modified"), items)
+        return items
+
+    def _drain(self, r) -> None:
+        # Closing a partly read body closes its connection too. Reading what
+        # is left of a small feed is cheaper than a new TCP/TLS handshake next
+        # time, so up to DRAIN_BYTES are read to put the connection back in
+        # the pool; a bigger remainder isn't worth it.
+        left = self.DRAIN_BYTES
+        try:
+            while left > 0:
+                chunk = r.raw.read(min(left, 64 * 1024), decode_content=False)
+                if not chunk:
+                    return
+                left -= len(chunk)
+        except Exception:
+            pass
+
+    @staticmethod
+    def parse(stream, limit: int) -> list:
+        items = []
+        root = None
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag == "item":
+                title, link = elem.findtext("title"), elem.findtext("link")
+            elif elem.tag == _ATOM + "entry":
+                title = elem.findtext(_ATOM + "title")
+                link = next((e.get("href") for e in elem.iterfind(_ATOM + "link")
+                             if e.get("rel", "alternate") == "alternate"), None)
+            else:
+                continue
+            if title:
+                items.append((title.strip(), link))
+            # drop parsed items so memory stays flat however long the feed is
+            elem.clear()
+            root.clear()
+            if len(items) >= limit:
+                break
+        return items
+
+
+class TranslatorBackend:
+    """Translates a batch of phrases into one language.
+
+    translate() returns one (source language, translated text) pair per
+    phrase, in order. Backends raise on failure; results are cached by the
+    caller, keyed by (text, dest).
+    """
+
+    name = "base"
+
+    def translate(self, phrases: List[str], dest: str) -> List[tuple]:
+        raise NotImplementedError
+
+
+class GoogleTranslateBackend(TranslatorBackend):
+    """googletrans, with one long-lived Translator (and its HTTP client/token state)."""
+
+    name = "google"
+
+    def __init__(self):
+        self._translator = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return _translator_class() is not None
+
+    def translate(self, phrases: List[str], dest: str) -> List[tuple]:
+        # googletrans clients aren't thread-safe; one request at a time
+        with self._lock:
+            if self._translator is None:
+                Translator = _translator_class()
+                if Translator is None:
+                    raise RuntimeError("googletrans is not installed")
+                self._translator = Translator()
+            res = self._translator.translate(phrases, dest=dest)
+        return [(r.src, r.text) for r in res]
+
+
+class PhrasebookTranslateBackend(TranslatorBackend):
+    """Offline stand-in: a small phrasebook, anything else comes back unchanged."""
+
+    name = "phrasebook"
+
+    PHRASES = {
+        "hello": {"es": "hola", "fr": "bonjour", "de": "hallo"},
+        "goodbye": {"es": "adiós", "fr": "au revoir", "de": "auf Wiedersehen"},
+        "good morning": {"es": "buenos días", "fr": "bonjour", "de": "guten Morgen"},
+        "good night": {"es": "buenas noches", "fr": "bonne nuit", "de": "gute Nacht"},
+        "thank you": {"es": "gracias", "fr": "merci", "de": "danke"},
+        "please": {"es": "por favor", "fr": "s'il vous plaît", "de": "bitte"},
+        "yes": {"es": "sí", "fr": "oui", "de": "ja"},
+        "no": {"es": "no", "fr": "non", "de": "nein"},
+    }
+
+    def __init__(self, phrases: Optional[dict] = None):
+        self.phrases = dict(self.PHRASES)
+        if phrases:
+            self.phrases.update(phrases)
+
+    def translate(self, phrases: List[str], dest: str) -> List[tuple]:
+        return [("en", self.phrases.get(p.lower().strip(), {}).get(dest.lower(), p)) for p in phrases]
+
+
+def make_translator_backend(name: str) -> TranslatorBackend:
+    if name == "google":
+        return GoogleTranslateBackend()
+    if name == "phrasebook":
+        return PhrasebookTranslateBackend()
+    raise RuntimeError(f"Unknown translator backend: {name}")
+
+
+def normalize_title(title: str) -> str:
+    """Casefold, strip accents and punctuation: "Café (Paris)" -> "cafe paris"."""
+    text = unicodedata.normalize("NFKD", title.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+
+
+class WikiIndex:
+    """Memory-mapped, read-only index of Wikipedia titles -> lead summaries.
+
+    File layout: an 8-byte magic, a little-endian uint32 record count, a
+    table of uint64 record offsets sorted by normalized title, then the
+    records, each "key\\ttitle\\tsummary\\n" in UTF-8. Lookups binary-search
+    the offset table straight out of the mapping, so only the pages touched
+    are ever read into memory.
+    """
+
+    MAGIC = b"FORTEWK1"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != self.MAGIC:
+            raise ValueError(f"{path} is not a Forte Wikipedia index")
+        (self.count,) = struct.unpack_from("<I", self._mm, 8)
+        self._table = 12
+
+    @classmethod
+    def build(cls, source: str, path: str, sentences: int = 2, max_chars: int = 400) -> int:
+        """Build an index from a dump extract and return the number of articles.
+
+        `source` is either JSON lines with "title" and "text" fields (as
+        produced by WikiExtractor --json) or "title<TAB>text" lines.
+        """
+        entries = {}
+        with open(source, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("{"):
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    title, text = rec.get("title", ""), rec.get("text", "")
+                else:
+                    title, _, text = line.partition("\t")
+                key = normalize_title(title)
+                # lead section only: first paragraph, first few sentences
+                lead = " ".join(text.strip().split("\n", 1)[0].split())
+                summary = " ".join(_SENTENCE_RE.split(lead)[:sentences])[:max_chars]
+                if key and summary and key not in entries:
+                    entries[key] = (" ".join(title.split()), summary)
+        keys = sorted(entries)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as out:
+            out.write(cls.MAGIC)
+            out.write(struct.pack("<I", len(keys)))
+            offset = 12 + 8 * len(keys)
+            offsets = []
+            records = []
+            for key in keys:
+                title, summary = entries[key]
+                rec = f"{key}\t{title}\t{summary}\n".encode("utf-8")
+                offsets.append(offset)
+                records.append(rec)
+                offset += len(rec)
+            out.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            out.writelines(records)
+        os.replace(tmp, path)
+        return len(keys)
+
+    def _offset(self, i: int) -> int:
+        return struct.unpack_from("<Q", self._mm, self._table + 8 * i)[0]
+
+    def _key(self, i: int) -> str:
+        start = self._offset(i)
+        return self._mm[start:self._mm.find(b"\t", start)].decode("utf-8")
+
+    def _record(self, i: int) -> tuple:
+        start = self._offset(i)
+        end = self._mm.find(b"\n", start)
+        _, title, summary = self._mm[start:end].decode("utf-8").split("\t", 2)
+        return title, summary
+
+    def _lower_bound(self, key: str) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, title: str) -> Optional[tuple]:
+        """(title, summary) for an exact (normalized) title match."""
+        key = normalize_title(title)
+        i = self._lower_bound(key)
+        if i < self.count and self._key(i) == key:
+            return self._record(i)
+        return None
+
+    def prefix(self, title: str, limit: int = 5) -> List[tuple]:
+        """Up to `limit` (title, summary) pairs whose normalized title starts with `title`."""
+        key = normalize_title(title)
+        out = []
+        i = self._lower_bound(key)
+        while i < self.count and len(out) < limit and self._key(i).startswith(key):
+            out.append(self._record(i))
+            i += 1
+        return out
+
+    def lookup(self, query: str) -> Optional[tuple]:
+        """Exact match, else the shortest title starting with the query."""
+        if not normalize_title(query):
+            # every title starts with ""
+            return None
+        hit = self.get(query)
+        if hit:
+            return hit
+        candidates = self.prefix(query, limit=20)
+        return min(candidates, key=lambda r: len(r[0])) if candidates else None
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+
+class LocationIndex:
+    """Persistent map from places to their api.weather.gov forecast endpoints.
+
+    City names (normalized) map to coordinates and coordinates map to the
+    forecast URL from /points, so a repeat weather query only needs the
+    forecast request itself. Both mappings almost never change; a stale
+    forecast URL is dropped with forget_point() and resolved again.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.logger = logging.getLogger("Forte")
+        self._lock = threading.Lock()
+        self.cities = {}  # normalized city -> [lat, lon]
+        self.points = {}  # "lat,lon" -> [forecast_url, location_name]
+        self.load()
+
+    @staticmethod
+    def normalize_city(city: str) -> str:
+        return " ".join(re.sub(r"[^\w\s-]", " ", city.lower()).split())
+
+    @staticmethod
+    def point_key(lat: float, lon: float) -> str:
+        # weather.gov only accepts 4 decimal places anyway
+        return f"{round(float(lat), 4)},{round(float(lon), 4)}"
+
+    def city(self, city: str) -> Optional[tuple]:
+        with self._lock:
+            hit = self.cities.get(self.normalize_city(city))
+        return tuple(hit) if hit else None
+
+    def point(self, lat: float, lon: float) -> Optional[tuple]:
+        with self._lock:
+            hit = self.points.get(self.point_key(lat, lon))
+        return tuple(hit) if hit else None
+
+    def add_city(self, city: str, lat: float, lon: float) -> None:
+        with self._lock:
+            self.cities[self.normalize_city(city)] = [lat, lon]
+        self.save()
+
+    def add_point(self, lat: float, lon: float, forecast_url: str, location_name: Optional[str]) -> None:
+        with self._lock:
+            self.points[self.point_key(lat, lon)] = [forecast_url, location_name]
+        self.save()
+
+    def forget_point(self, lat: float, lon: float) -> None:
+        with self._lock:
+            self.points.pop(self.point_key(lat, lon), None)
+        self.save()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.cities = data.get("cities", {})
+            self.points = data.get("points", {})
+        except Exception:
+            self.logger.exception("Failed to load location index")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                data = {"cities": dict(self.cities), "points": dict(self.points)}
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception:
+            self.logger.exception("Failed to save location index")
+
+
+# Tokens are runs of letters/digits (keeping inner apostrophes and dashes, so
+# "what's" and "set-voice" stay whole) or single punctuation characters.
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*|[^\sa-z0-9]")
+_END = "\0"
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class Intent:
+    """One row of the intent table.
+
+    `phrases` are matched on whole tokens, so "hi" no longer fires inside
+    "this" and "time" no longer fires inside "set timer". `mode` is "any"
+    (phrase anywhere), "start" (utterance starts with the phrase) or "exact"
+    (utterance is the phrase). `trigger` is an optional regex for intents that
+    can't be described by a keyword, e.g. "10 usd to eur". Lower `priority`
+    wins; ties go to the intent listed first. An intent either names a handler
+    method on SpeechAssistant or just gives a fixed `reply`.
+    """
+
+    def __init__(self, name: str, phrases: List[str], handler: Optional[str] = None, reply: Optional[str] = None,
+                 mode: str = "any", priority: int = 50, trigger: Optional[str] = None):
+        self.name = name
+        self.phrases = phrases
+        self.handler = handler
+        self.reply = reply
+        self.mode = mode
+        self.priority = priority
+        self.trigger = trigger
+
+
+class IntentRouter:
+    """Compiles an intent table once into a token trie plus one combined trigger regex.
+
+    Routing walks the trie from every token position, so its cost depends on
+    the utterance length and the longest phrase, not on how many intents exist.
+    """
+
+    def __init__(self, intents: List[Intent]):
+        self.intents = list(intents)
+        self._root: dict = {}
+        self._rank = [(it.priority, i) for i, it in enumerate(self.intents)]
+        triggers = []
+        for i, intent in enumerate(self.intents):
+            for phrase in intent.phrases:
+                node = self._root
+                for tok in tokenize(phrase):
+                    node = node.setdefault(tok, {})
+                node.setdefault(_END, []).append((i, intent.mode))
+            if intent.trigger:
+                triggers.append(f"(?P<i{i}>{intent.trigger})")
+        self._trigger = re.compile("|".join(triggers)) if triggers else None
+
+    def route(self, text_lower: str) -> Optional[Intent]:
+        tokens = tokenize(text_lower)
+        n = len(tokens)
+        best = None
+        for i in range(n):
+            node = self._root
+            for j in range(i, n):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                for idx, mode in node.get(_END, ()):
+                    if mode != "any" and i != 0:
+                        continue
+                    if mode == "exact" and j != n - 1:
+                        continue
+                    if best is None or self._rank[idx] < self._rank[best]:
+                        best = idx
+        if self._trigger is not None:
+            m = self._trigger.search(text_lower)
+            if m:
+                idx = int(m.lastgroup[1:])
+                if best is None or self._rank[idx] < self._rank[best]:
+                    best = idx
+        return self.intents[best] if best is not None else None
+
+
+# Slot patterns used by the intent handlers, compiled once at import.
+_HISTORY_RE = re.compile(r"/history\s*(\d+)?")
+_SUMMARY_RE = re.compile(r"/summary\s*(\d+)?")
+_SLASH_REMIND_RE = re.compile(r"/remind\s+(\d+)\s+(.+)")
+_SLASH_NAME_RE = re.compile(r"/([a-z-]+)")
+_JOKE_ABOUT_RE = re.compile(r"joke(?: about)?\s+([A-Za-z]+)")
+_JOKE_KIND_RE = re.compile(r"tell me an?\s+([A-Za-z]+)\s+joke")
+_REMIND_RE = re.compile(r"remind me in (\d+) minute[s]? to (.+)")
+_REMIND_EVERY_RE = re.compile(r"remind me every (\d+) minute[s]? to (.+)")
+_CANCEL_RE = re.compile(r"cancel (?:the )?(reminder|timer)(?:\s+(?:number\s+)?(\d+))?")
+_SNOOZE_RE = re.compile(r"(\d+)\s*minute")
+_WEATHER_RE = re.compile(r"(?:weather(?: in| for)? )(.+)")
+_WEATHER_WHEN_RE = re.compile(
+    r"\b(?:for |on )?(now|today|tonight|tomorrow(?: night)?|(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)(?: night)?)\b")
+_TIMER_RE = re.compile(r"(\d+)\s*(second|seconds|minute|minutes)")
+_TIMER_MSG_RE = re.compile(r"(?:to|for)\s+(.+)$", re.I)
+_CURRENCY = r"(\d+(?:\.\d+)?)\s*([A-Za-z]{3})\s+to\s+([A-Za-z]{3})"
+_CURRENCY_RE = re.compile(_CURRENCY)
+# "translate good morning; thank you to es, fr and de"
+_LANGS = r"([a-zA-Z-]+(?:\s*(?:,\s*(?:and\s+)?|\s+and\s+)[a-zA-Z-]+)*)"
+_TRANSLATE_RE = re.compile(r"translate\s+(.+)\s+to\s+" + _LANGS + r"$", re.I)
+_TRANSLATE_TO_RE = re.compile(r"translate to\s+" + _LANGS + r"\s+(.+)$", re.I)
+_LANG_SPLIT_RE = re.compile(r"\s*,\s*(?:and\s+)?|\s+and\s+", re.I)
+_TRAFFIC_RE = re.compile(r"traffic from (.+) to (.+)")
+_NOTE_RE = re.compile(r"(?:take note|save note|note:)\s*(.+)", re.I)
+_DELETE_NOTE_RE = re.compile(r"delete note\s+(\d+)")
+_SEARCH_NOTES_RE = re.compile(r"search (?:my )?notes(?: for| about)?\s+(.+)")
+_DEFINE_RE = re.compile(r"define\s+([A-Za-z-]+)")
+
+_ASTEROIDS = "Asteroids are small rocky bodies that orbit the Sun. There are millions of them in space."
+
+# The intent table. Priorities: 0 exact utterances, 5 commands anchored at the
+# start, 10 commands with slots, 20 conversational phrases, 30 bare topic
+# keywords, 40 greetings (so "hi, what's the weather" gets the weather).
+INTENTS = [
+    Intent("help", ["help"], handler="_intent_help", mode="exact", priority=0),
+    Intent("repeat", ["repeat", "say that again", "what did you say"], handler="_intent_repeat", mode="exact", priority=0),
+    Intent("joke_exact", ["joke"], handler="_intent_joke", mode="exact", priority=0),
+    Intent("take_note", ["take note", "save note", "note:"], handler="_intent_take_note", mode="start", priority=5),
+    Intent("delete_note", ["delete note"], handler="_intent_delete_note", mode="start", priority=5),
+    Intent("define", ["define"], handler="_intent_define", mode="start", priority=5),
+    Intent("translate", ["translate"], handler="_intent_translate", mode="start", priority=5),
+    Intent("convert", ["convert"], handler="_intent_convert", mode="start", priority=5),
+    Intent("set_timer", ["set timer"], handler="_intent_set_timer", mode="start", priority=5),
+    Intent("timer_for", ["timer for"], handler="_intent_set_timer", priority=10),
+    Intent("remind", ["remind me"], handler="_intent_remind", priority=10),
+    Intent("convert_amount", [], handler="_intent_convert", priority=10, trigger=_CURRENCY),
+    Intent("briefing", ["briefing", "good morning"], handler="_intent_briefing", priority=10),
+    Intent("cancel", ["cancel reminder", "cancel the reminder", "cancel timer", "cancel the timer"],
+           handler="_intent_cancel", priority=5),
+    Intent("snooze", ["snooze"], handler="_intent_snooze", priority=10),
+    Intent("list_reminders", ["list reminders"], handler="_intent_list_reminders", priority=10),
+    Intent("search_notes", ["search notes", "search my notes"], handler="_intent_search_notes", priority=10),
+    Intent("list_notes", ["list notes"], handler="_intent_list_notes", priority=10),
+    Intent("search_wikipedia", ["search wikipedia"], handler="_intent_search_wikipedia", priority=10),
+    Intent("calculate", ["calculate"], handler="_intent_calculate", priority=10),
+    Intent("traffic", ["traffic"], handler="_intent_traffic", priority=10),
+    Intent("joke", ["tell me a joke"], handler="_intent_joke", priority=10, trigger=r"tell me an?\s+[a-z]+\s+joke"),
+    Intent("another_joke", ["another joke", "more jokes"], handler="_intent_another_joke", priority=10),
+    Intent("fact", ["tell me a fact"], handler="_intent_fact", priority=10),
+    Intent("goodbye", ["goodbye"], handler="_intent_goodbye", priority=20),
+    Intent("how_are_you", ["how are you"], reply="I'm doing well, thank you for asking!", priority=20),
+    Intent("name", ["what is your name", "who are you"], reply="I am Forte", priority=20),
+    Intent("thanks", ["thanks"], reply="You're welcome!", priority=20),
+    Intent("six_seven", ["six seven", "67"], reply="Six seven!", priority=20),
+    Intent("friend", ["will you be my friend", "want to be friends"], reply="Of course!", priority=20),
+    Intent("created", ["who created you"], reply="Joel Gallagher created me!", priority=20),
+    Intent("made", ["who made you"], reply="Joel Gallagher made me!", priority=20),
+    Intent("abilities", ["what can you do"], reply="I can do a lot of things! Try asking me to tell a joke, a fun fact, calculate something, search wikipedia, and more! If I can't do something yet, nag my creator until he programs me to be able to do it!", priority=20),
+    Intent("asteroid", ["what is an asteroid", "what are asteroids"], reply=_ASTEROIDS, priority=20),
+    Intent("mercury", ["what is mercury"], reply="Mercury is the closest planet to the Sun and the smallest planet in the solar system. It is about as wide as the Atlantic Ocean.", priority=20),
+    Intent("venus", ["what is venus"], reply="Venus is the second planet from the Sun. Is is about the same size as Earth and it is made from similar materials.", priority=20),
+    Intent("mars", ["what is mars"], reply="Mars is the fourth planet from the Sun. It is red and about half the size of the Earth.", priority=20),
+    Intent("jupiter", ["what is jupiter"], reply="Jupiter is the fifth planet from the Sun. It is over a thousand times the size of Earth.", priority=20),
+    Intent("saturn", ["what is saturn"], reply="Saturn is the sixth planet from the Sun. It is surrounded by a system of rings that extend thousands of miles from the planet.", priority=20),
+    Intent("uranus", ["what is uranus"], reply="Uranus is the seventh planet from the Sun. The methane in its atmosphere gives it a blue color.", priority=20),
+    Intent("christmas", ["when is christmas"], reply="Christmas is on December 25.", priority=20),
+    Intent("valentines", ["when is valentines day"], reply="Valentines Day is on February 14.", priority=20),
+    Intent("halloween", ["when is halloween"], reply="Halloween is on October 31.", priority=20),
+    Intent("meow", ["meow"], reply="Are you a cat? What the sigma, I like cats.", priority=30),
+    Intent("weather", ["weather"], handler="_intent_weather", priority=30),
+    Intent("news", ["news", "headlines"], handler="_intent_news", priority=30),
+    Intent("time", ["time"], handler="_intent_time", priority=30),
+    Intent("greeting", ["hello", "hi", "hey", "sup", "greetings"], reply="Hello!", priority=40),
+]
+
+# Slash commands are looked up by name in one dict access.
+SLASH_COMMANDS = {
+    "history": "_slash_history",
+    "clear": "_slash_clear",
+    "help": "_slash_help",
+    "export": "_slash_export",
+    "voices": "_slash_voices",
+    "set-voice": "_slash_set_voice",
+    "set-rate": "_slash_set_rate",
+    "tts": "_slash_tts",
+    "test": "_slash_test",
+    "summary": "_slash_summary",
+    "verbose": "_slash_verbose",
+    "remind": "_slash_remind",
+    "cache": "_slash_cache",
+    "stats": "_slash_stats",
+}
+
+# Slash commands that touch the host's files, audio or logging; refused for --serve clients.
+CONSOLE_ONLY_SLASH = {"export", "voices", "set-voice", "set-rate", "tts", "test", "verbose"}
+
+
+def _frame_rms(frame: bytes, width: int) -> float:
+    # audioop is gone in Python 3.13, so fall back to a plain 16-bit RMS
+    try:
+        import audioop
+        return audioop.rms(frame, width)
+    except ImportError:
+        pass
+    samples = array.array("h", frame[: len(frame) - len(frame) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class RecognizerBackend:
+    """Turns captured audio into text.
+
+    Non-streaming backends only implement recognize(). Streaming backends set
+    `streaming = True` and are fed frames by MicrophoneSession while the user
+    is still talking, so the final text is ready as soon as the phrase ends.
+    Backends raise sr.UnknownValueError when nothing was understood and
+    sr.RequestError when the engine itself failed.
+    """
+
+    name = "base"
+    streaming = False
+
+    def recognize(self, audio) -> str:
+        raise NotImplementedError
+
+    def start_utterance(self, sample_rate: int) -> None:
+        pass
+
+    def accept_frame(self, frame: bytes) -> Optional[str]:
+        """Feed one frame; returns the current partial hypothesis, if any."""
+        return None
+
+    def finish_utterance(self) -> str:
+        raise NotImplementedError
+
+
+class GoogleBackend(RecognizerBackend):
+    name = "google"
+
+    def __init__(self, language: str = "en-US"):
+        self.language = language
+        self._recognizer = None
+
+    def recognize(self, audio) -> str:
+        if self._recognizer is None:
+            self._recognizer = sr.Recognizer()
+        return self._recognizer.recognize_google(audio, language=self.language)
+
+
+class VoskBackend(RecognizerBackend):
+    """Offline streaming recognition with a local Vosk model directory."""
+
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_path: str):
+        try:
+            import vosk
+        except ImportError:
+            raise RuntimeError("The vosk recognizer requires the 'vosk' package. Please install it.")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self._model = vosk.Model(model_path)
+        self._rec = None
+        # text of segments Vosk finalized mid-utterance (it endpoints on
+        # shorter pauses than MicrophoneSession does)
+        self._segments: List[str] = []
+
+    def _text(self, result: str) -> str:
+        text = json.loads(result).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def recognize(self, audio) -> str:
+        rec = self._vosk.KaldiRecognizer(self._model, audio.sample_rate)
+        rec.AcceptWaveform(audio.get_raw_data(convert_width=2))
+        return self._text(rec.FinalResult())
+
+    def start_utterance(self, sample_rate: int) -> None:
+        self._rec = self._vosk.KaldiRecognizer(self._model, sample_rate)
+        self._segments = []
+
+    def accept_frame(self, frame: bytes) -> Optional[str]:
+        if self._rec is None:
+            return None
+        if self._rec.AcceptWaveform(frame):
+            text = json.loads(self._rec.Result()).get("text", "").strip()
+            if text:
+                self._segments.append(text)
+            return " ".join(self._segments) or None
+        partial = json.loads(self._rec.PartialResult()).get("partial", "").strip()
+        return " ".join(self._segments + [partial]).strip() or None
+
+    def finish_utterance(self) -> str:
+        rec, self._rec = self._rec, None
+        segments, self._segments = self._segments, []
+        if rec is None:
+            raise sr.UnknownValueError()
+        last = json.loads(rec.FinalResult()).get("text", "").strip()
+        text = " ".join(segments + [last]).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+def make_recognizer_backend(name: str, model_path: Optional[str] = None) -> RecognizerBackend:
+    if name == "google":
+        return GoogleBackend()
+    if name == "vosk":
+        if not model_path:
+            raise RuntimeError("The vosk recognizer needs --vosk-model <model directory>.")
+        return VoskBackend(model_path)
+    raise RuntimeError(f"Unknown recognizer backend: {name}")
+
+
+class WakeWordDetector:
+    """Spots a wake word at the start of a captured phrase, locally.
+
+    The detector is enrolled with a few WAV recordings of the wake word
+    (say, five takes of "Forte"). Every 10 ms the audio is reduced to a
+    handful of cheap features: loudness, the share of energy in five octave
+    bands and the zero-crossing rate. A phrase matches when its opening
+    second or so lines up with one of the recordings under dynamic time
+    warping.
+
+    The matching threshold comes from how far apart the recordings are from
+    each other, unless one is given. The per-sample work goes through
+    audioop where it exists; checking a phrase takes a few tens of
+    milliseconds, and only phrases the endpointer captured are checked.
+    """
+
+    RATE = 16000
+    FRAME = 320  # 20 ms windows...
+    HOP = 160  # ...every 10 ms
+    ZCR_WEIGHT = 8.0
+
+    def __init__(self, templates: List[List[tuple]], threshold: Optional[float] = None):
+        if not templates:
+            raise ValueError("The wake word detector needs at least one recording.")
+        self.templates = templates
+        self.max_frames = max(len(t) for t in templates)
+        if threshold is None and len(templates) > 1:
+            # how far each recording is from its closest sibling, plus some slack
+            nearest = [min(self.distance(a, b)[0] for j, b in enumerate(templates) if j != i)
+                       for i, a in enumerate(templates)]
+            threshold = 1.25 * sum(nearest) / len(nearest)
+        self.threshold = threshold if threshold is not None else 1.0
+
+    @classmethod
+    def from_wavs(cls, paths: List[str], threshold: Optional[float] = None) -> "WakeWordDetector":
+        import wave
+
+        templates = []
+        for path in paths:
+            with wave.open(path, "rb") as w:
+                pcm = w.readframes(w.getnframes())
+                width, rate, channels = w.getsampwidth(), w.getframerate(), w.getnchannels()
+            if channels != 1:
+                raise ValueError(f"{path}: wake word recordings must be mono")
+            features = cls.features(cls.pcm16k(pcm, rate, width))
+            # trim the silence around the word so only the word itself is matched
+            peak = max((f[0] for f in features), default=0.0)
+            loud = [i for i, f in enumerate(features) if f[0] > peak - 3.0]
+            if loud:
+                features = features[loud[0]:loud[-1] + 1]
+            if len(features) >= 10:
+                templates.append(features)
+        return cls(templates, threshold)
+
+    @classmethod
+    def from_directory(cls, directory: str, threshold: Optional[float] = None) -> "WakeWordDetector":
+        paths = sorted(os.path.join(directory, n) for n in os.listdir(directory) if n.lower().endswith(".wav"))
+        return cls.from_wavs(paths, threshold)
+
+    @classmethod
+    def pcm16k(cls, pcm: bytes, rate: int, width: int) -> bytes:
+        """Convert raw PCM to 16-bit mono at 16 kHz."""
+        try:
+            import audioop
+        except ImportError:
+            audioop = None
+        if audioop is not None:
+            if width != 2:
+                pcm = audioop.lin2lin(pcm, width, 2)
+            if rate != cls.RATE:
+                pcm = audioop.ratecv(pcm, 2, 1, rate, cls.RATE, None)[0]
+            return pcm
+        if width != 2:
+            raise ValueError("16-bit audio is needed without audioop")
+        samples = array.array("h", pcm[: len(pcm) - len(pcm) % 2])
+        if rate != cls.RATE:
+            step = rate / cls.RATE
+            samples = array.array("h", (samples[int(i * step)] for i in range(int(len(samples) / step))))
+        return samples.tobytes()
+
+    @classmethod
+    def features(cls, pcm: bytes) -> List[tuple]:
+        """Per-frame features of 16 kHz 16-bit mono audio."""
+        try:
+            import audioop
+        except ImportError:
+            audioop = None
+        # Cascaded two-point averages are low-pass filters at roughly 4 kHz,
+        # 2 kHz, 1 kHz and 500 Hz; differences between them split the signal
+        # into octave bands.
+        if audioop is not None:
+            def smooth(x: bytes, lag: int) -> bytes:
+                return audioop.add(audioop.mul(x, 2, 0.5), audioop.mul(x[2 * lag:] + b"\0" * (2 * lag), 2, 0.5), 2)
+
+            def minus(a: bytes, b: bytes) -> bytes:
+                return audioop.add(a, audioop.mul(b, 2, -1), 2)
+
+            def rms(x: bytes, start: int) -> float:
+                return audioop.rms(x[2 * start:2 * (start + cls.FRAME)], 2)
+
+            def cross(x: bytes, start: int) -> int:
+                return audioop.cross(x[2 * start:2 * (start + cls.FRAME)], 2)
+
+            signal = pcm[: len(pcm) - len(pcm) % 2]
+            samples = len(signal) // 2
+        else:
+            def smooth(x, lag):
+                return [(a + b) / 2 for a, b in zip(x, list(x[lag:]) + [0] * lag)]
+
+            def minus(a, b):
+                return [p - q for p, q in zip(a, b)]
+
+            def rms(x, start):
+                return math.sqrt(sum(v * v for v in x[start:start + cls.FRAME]) / cls.FRAME)
+
+            def cross(x, start):
+                window = x[start:start + cls.FRAME]
+                return sum(1 for a, b in zip(window, window[1:]) if (a < 0) != (b < 0))
+
+            signal = array.array("h", pcm[: len(pcm) - len(pcm) % 2])
+            samples = len(signal)
+        lows = [signal]
+        for lag in (1, 2, 4, 8):
+            lows.append(smooth(lows[-1], lag))
+        bands = [minus(a, b) for a, b in zip(lows, lows[1:])] + [lows[-1]]
+        out = []
+        for start in range(0, samples - cls.FRAME + 1, cls.HOP):
+            level = math.log(rms(signal, start) + 1.0)
+            out.append((level,) + tuple(math.log(rms(band, start) + 1.0) - level for band in bands)
+                       + (cls.ZCR_WEIGHT * cross(signal, start) / cls.FRAME,))
+        return out
+
+    @staticmethod
+    def distance(template: List[tuple], frames: List[tuple], limit: float = math.inf):
+        """Subsequence DTW: (cost per template frame, index just past the match in `frames`).
+
+        The template may match anywhere in `frames`; loudness is compared
+        relative to each side's peak so the distance ignores gain. Gives up
+        with (inf, 0) as soon as the cost must exceed `limit`.
+        """
+        if not frames:
+            return math.inf, 0
+        t_peak = max(f[0] for f in template)
+        f_peak = max(f[0] for f in frames)
+        t = [(a[0] - t_peak,) + a[1:] for a in template]
+        x = [(b[0] - f_peak,) + b[1:] for b in frames]
+        sub = op.sub
+        budget = limit * len(template)
+        prev = [0.0] * len(x)  # the match may start at any frame
+        for a in t:
+            costs = [sum(map(abs, map(sub, a, b))) for b in x]
+            left = prev[0] + costs[0]
+            row = [left]
+            for j in range(1, len(x)):
+                diag, up = prev[j - 1], prev[j]
+                best = diag if diag < up else up
+                if left < best:
+                    best = left
+                left = best + costs[j]
+                row.append(left)
+            if min(row) > budget:
+                return math.inf, 0
+            prev = row
+        end = min(range(len(prev)), key=prev.__getitem__)
+        return prev[end] / len(template), end + 1
+
+    def detect(self, pcm: bytes) -> Optional[int]:
+        """Check 16 kHz 16-bit audio; the byte offset where the wake word ends, or None."""
+        # the word has to open the phrase: look at the first ~1.5 template lengths
+        frames = self.features(pcm[: (int(self.max_frames * 1.5) + self.RATE // 2 // self.HOP) * self.HOP * 2])
+        best, end = self.threshold, None
+        for template in self.templates:
+            score, stop = self.distance(template, frames, best)
+            if score <= best:
+                best, end = score, stop
+        if end is None:
+            return None
+        return min(len(pcm), (end * self.HOP + self.FRAME) * 2)
+
+
+class MicrophoneSession:
+    """A long-lived microphone stream that is segmented into phrases.
+
+    The device is opened once. A reader thread keeps pulling fixed-size frames
+    into a ring buffer, runs a simple energy-based endpointer on them and hands
+    each finished phrase to next_phrase(). If a streaming backend is attached
+    it is fed the frames as they arrive, so the phrase comes with its text
+    already decoded. The energy threshold
+    is calibrated once at startup and refreshed from the ring buffer every
+    `calibrate_every` seconds while nobody is talking.
+    """
+
+    def __init__(self, muted: Optional[threading.Event] = None, backend: Optional[RecognizerBackend] = None,
+                 buffer_seconds: float = 10.0, calibrate_every: float = 300.0, pause_threshold: float = 0.8,
+                 phrase_time_limit: float = 12.0, pre_roll: float = 0.3):
+        self.logger = logging.getLogger("Forte")
+        # only used when it is a streaming backend
+        self.backend = backend if backend is not None and backend.streaming else None
+        # called with each partial hypothesis from a streaming backend
+        self.on_partial = None
+        # frames read while this is set (we are speaking) are ignored
+        self.muted = muted or threading.Event()
+        self.buffer_seconds = buffer_seconds
+        self.calibrate_every = calibrate_every
+        self.pause_threshold = pause_threshold
+        self.phrase_time_limit = phrase_time_limit
+        self.pre_roll = pre_roll
+        self.energy_threshold = 300.0
+        self.dynamic_energy_ratio = 1.5
+        self.dynamic_energy_damping = 0.15
+        self._microphone = None
+        self._source = None
+        self._ring: Optional[collections.deque] = None
+        self._phrases: "queue.Queue" = queue.Queue()
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._last_calibration = 0.0
+        self._streaming = False
+
+    def start(self) -> None:
+        """Open the device and calibrate. Raises OSError if no microphone is available."""
+        t0 = time.perf_counter()
+        self._microphone = sr.Microphone()
+        self._source = self._microphone.__enter__()
+        recognizer = sr.Recognizer()
+        recognizer.adjust_for_ambient_noise(self._source, duration=1)
+        self.energy_threshold = recognizer.energy_threshold
+        self._last_calibration = time.time()
+        frames = max(1, int(self.buffer_seconds * self._source.SAMPLE_RATE / self._source.CHUNK))
+        self._ring = collections.deque(maxlen=frames)
+        self._running.set()
+        self._thread = threading.Thread(target=self._reader, name="forte-mic", daemon=True)
+        self._thread.start()
+        self.logger.debug("Microphone opened and calibrated in %.0f ms (threshold %.0f)",
+                          (time.perf_counter() - t0) * 1000, self.energy_threshold)
+
+    def close(self) -> None:
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        if self._microphone is not None:
+            try:
+                self._microphone.__exit__(None, None, None)
+            except Exception:
+                self.logger.debug("Failed to close microphone")
+        self._microphone = None
+        self._source = None
+
+    def next_phrase(self, timeout: Optional[float] = None):
+        """Return the next captured phrase, or None on timeout.
+
+        Phrases are (sr.AudioData, text) pairs. `text` is the streaming
+        backend's final result, "" if it understood nothing, or None when
+        there is no streaming backend (or it failed) and the audio still
+        needs recognizing.
+        """
+        try:
+            item = self._phrases.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if item is None and self._error is not None:
+            raise self._error
+        return item
+
+    def calibrate(self, seconds: float = 1.0) -> None:
+        """Re-derive the energy threshold from the most recent buffered audio."""
+        src = self._source
+        if src is None or not self._ring:
+            return
+        n = max(1, int(seconds * src.SAMPLE_RATE / src.CHUNK))
+        recent = list(self._ring)[-n:]
+        energy = sum(_frame_rms(f, src.SAMPLE_WIDTH) for f in recent) / len(recent)
+        self.energy_threshold = max(50.0, energy * self.dynamic_energy_ratio)
+        self._last_calibration = time.time()
+
+    def _reader(self) -> None:
+        src = self._source
+        seconds_per_frame = src.CHUNK / src.SAMPLE_RATE
+        damping = self.dynamic_energy_damping ** seconds_per_frame
+        pre_roll_frames = max(1, int(self.pre_roll / seconds_per_frame))
+        phrase: List[bytes] = []
+        silence = 0.0
+        try:
+            while self._running.is_set():
+                frame = src.stream.read(src.CHUNK)
+                if self.muted.is_set():
+                    # drop our own TTS output and anything half-captured around it
+                    phrase = []
+                    continue
+                self._ring.append(frame)
+                energy = _frame_rms(frame, src.SAMPLE_WIDTH)
+                if not phrase:
+                    if energy > self.energy_threshold:
+                        phrase = list(self._ring)[-pre_roll_frames:]
+                        silence = 0.0
+                        self._stream_start(phrase, src.SAMPLE_RATE)
+                        continue
+                    # track the noise floor the same way sr.Recognizer does
+                    target = energy * self.dynamic_energy_ratio
+                    self.energy_threshold = self.energy_threshold * damping + target * (1 - damping)
+                    if time.time() - self._last_calibration > self.calibrate_every:
+                        self.calibrate()
+                    continue
+                phrase.append(frame)
+                self._stream_frame(frame)
+                silence = 0.0 if energy > self.energy_threshold else silence + seconds_per_frame
+                if silence >= self.pause_threshold or len(phrase) * seconds_per_frame >= self.phrase_time_limit:
+                    audio = sr.AudioData(b"".join(phrase), src.SAMPLE_RATE, src.SAMPLE_WIDTH)
+                    self._phrases.put((audio, self._stream_finish()))
+                    phrase = []
+        except Exception as e:
+            self.logger.exception("Microphone capture failed")
+            self._error = e if isinstance(e, OSError) else OSError(str(e))
+            self._phrases.put(None)
+
+    # Streaming backend plumbing. A backend failure disables streaming for the
+    # rest of the phrase; listen() then recognizes the audio the normal way.
+
+    def _stream_start(self, frames: List[bytes], sample_rate: int) -> None:
+        self._streaming = self.backend is not None
+        if not self._streaming:
+            return
+        try:
+            self.backend.start_utterance(sample_rate)
+        except Exception:
+            self.logger.exception("Streaming recognizer failed to start")
+            self._streaming = False
+            return
+        for f in frames:
+            self._stream_frame(f)
+
+    def _stream_frame(self, frame: bytes) -> None:
+        if not self._streaming:
+            return
+        try:
+            partial = self.backend.accept_frame(frame)
+        except Exception:
+            self.logger.exception("Streaming recognizer failed")
+            self._streaming = False
+            return
+        if partial and self.on_partial is not None:
+            self.on_partial(partial)
+
+    def _stream_finish(self) -> Optional[str]:
+        if not self._streaming:
+            return None
+        self._streaming = False
+        try:
+            return self.backend.finish_utterance()
+        except sr.UnknownValueError:
+            return ""
+        except Exception:
+            self.logger.exception("Streaming recognizer failed")
+            return None
+
+
+class PhraseAudioCache:
+    """Rendered speech for replies that come up again and again, as WAV files.
+
+    A file is keyed by a hash of (voice, rate, text), so changing the voice
+    or rate never plays stale audio. The directory is capped at `max_bytes`,
+    evicting the least recently played files first (recency survives restarts
+    through file mtimes).
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger("Forte")
+        self._lock = threading.Lock()
+        self._files: "collections.OrderedDict[str, int]" = collections.OrderedDict()  # key -> size, oldest first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(".part.wav"):
+                # half-written render from a crash
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+            elif name.endswith(".wav"):
+                try:
+                    st = os.stat(os.path.join(directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(entries):
+            self._files[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def key(text: str, voice: str) -> str:
+        import hashlib
+        return hashlib.sha1(f"{voice}\0{text}".encode("utf-8")).hexdigest()
 
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".wav")
 
-class FactGenerator:
-    def __init__(self):
-        self.facts = [
-            "The first computer mouse was made of wood!",
-            "The first computer virus was created in 1983!",
-            "The first computer programmer was Ada Lovelace!",
-        ]
+    def get(self, text: str, voice: str) -> Optional[str]:
+        """Path of the rendered audio for `text` in `voice`, or None."""
+        key = self.key(text, voice)
+        with self._lock:
+            if key not in self._files:
+                self.misses += 1
+                return None
+            self._files.move_to_end(key)
+            self.hits += 1
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._bytes -= self._files.pop(key, 0)
+            return None
+        return path
 
-    def get_random_fact(self) -> str:
-        return random.choice(self.facts)
+    def __contains__(self, item: tuple) -> bool:
+        """(text, voice) in cache, without counting a hit."""
+        with self._lock:
+            return self.key(*item) in self._files
+
+    def add(self, text: str, voice: str, render) -> bool:
+        """Render `text` with render(path) into the cache. False if nothing usable was written."""
+        key = self.key(text, voice)
+        tmp = os.path.join(self.directory, key + ".part.wav")
+        try:
+            render(tmp)
+            size = os.path.getsize(tmp)
+            if size <= 44:  # a bare WAV header
+                raise OSError("empty render")
+            os.replace(tmp, self.path(key))
+        except Exception:
+            self.logger.debug("Could not pre-render %r", text, exc_info=True)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+        with self._lock:
+            self._bytes += size - self._files.pop(key, 0)
+            self._files[key] = size
+            self._evict()
+        return True
+
+    def _evict(self) -> None:
+        # caller holds the lock; the newest file always stays
+        while self._bytes > self.max_bytes and len(self._files) > 1:
+            old, old_size = self._files.popitem(last=False)
+            self._bytes -= old_size
+            try:
+                os.remove(self.path(old))
+            except OSError:
+                pass
 
 
-class ReminderManager:
+class AudioPlayer:
+    """Plays WAV files and can be interrupted from another thread.
+
+    Uses winsound on Windows, otherwise the first of aplay, paplay or afplay
+    found on PATH. `available` is False when there is no way to play audio.
+    """
+
+    COMMANDS = (["aplay", "-q"], ["paplay"], ["afplay"])
+
     def __init__(self):
-        self.reminders = []  # list of tuples (timestamp, message)
-        self.lock = threading.Lock()
+        self._proc = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.command = None
+        self.winsound = sys.platform.startswith("win")
+        if not self.winsound:
+            for command in self.COMMANDS:
+                if shutil.which(command[0]):
+                    self.command = command
+                    break
 
-    def add_reminder(self, duration: int, message: str):
-        with self.lock:
-            fire_at = time.time() + duration * 60
-            self.reminders.append((fire_at, message))
-        threading.Thread(target=self.remind, args=(duration, message), daemon=True).start()
+    @property
+    def available(self) -> bool:
+        return self.winsound or self.command is not None
 
-    def list_reminders(self) -> List[str]:
-        now = time.time()
-        with self.lock:
-            items = [f"in {int((fire_at-now)//60)}m: {msg}" if fire_at>now else f"due: {msg}" for fire_at, msg in self.reminders]
-        return items
+    def play(self, path: str) -> None:
+        """Play `path` to the end, or until stop() is called."""
+        self._stop.clear()
+        if self.winsound:
+            import wave
+            import winsound
+            with wave.open(path, "rb") as w:
+                duration = w.getnframes() / float(w.getframerate())
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+            if self._stop.wait(duration):
+                winsound.PlaySound(None, 0)
+            return
+        with self._lock:
+            self._proc = subprocess.Popen(self.command + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            self._proc.wait()
+        finally:
+            with self._lock:
+                self._proc = None
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            if self._proc is not None:
+                self._proc.terminate()
+
+
+# Fixed replies from the handlers, pre-rendered along with every reply= in INTENTS.
+COMMON_REPLIES = (
+    "Hello! Say 'help' for commands.", "Sorry, I didn't catch that.", "Sorry, I didn't understand that command.",
+    "Note saved.", "Note deleted.", "You have no notes.", "You have no reminders.", "Here are the top headlines:",
+    "Goodbye! Have a great day!", "There's nothing to snooze.", "I don't have anything to repeat.",
+    "Conversation history cleared.", "Yes?",
+)
+
+_CLAUSE_RE = re.compile(r"(?<=[,;:])\s+")
+# titles and the like whose full stop doesn't end a sentence
+_ABBREVIATION_RE = re.compile(r"\b(?:Mr|Mrs|Ms|Dr|Prof|St|Jr|Sr|vs|e\.g|i\.e)\.$")
+
+
+def speech_chunks(text: str, max_chars: int = 200, min_chars: int = 24) -> List[str]:
+    """Split a long reply into sentence-sized pieces for pipelined speech.
 
-    def remind(self, duration: int, message: str):
-        time.sleep(duration * 60)
-        print(f"Reminder: {message}")
+    Replies of up to `max_chars` stay whole. Longer sentences are split
+    again at commas and semicolons, or between words if a clause is still
+    too long; fragments shorter than `min_chars` ("No.") are joined to the
+    next piece so they don't get a pause of their own, and "Dr. Smith"
+    isn't split at all. Blank text gives no chunks.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+    sentences = []
+    for sentence in _SENTENCE_RE.split(text):
+        if sentences and _ABBREVIATION_RE.search(sentences[-1]):
+            sentences[-1] += " " + sentence
+        else:
+            sentences.append(sentence)
+    pieces = []
+    for sentence in sentences:
+        if len(sentence) > max_chars:
+            part = ""
+            for clause in _CLAUSE_RE.split(sentence):
+                for span in (clause.split() if len(clause) > max_chars else [clause]):
+                    if part and len(part) + len(span) >= max_chars:
+                        pieces.append(part)
+                        part = span
+                    else:
+                        part = f"{part} {span}" if part else span
+            pieces.append(part)
+        else:
+            pieces.append(sentence)
+    chunks = []
+    carry = ""
+    for piece in pieces:
+        carry = f"{carry} {piece}" if carry else piece
+        if len(carry) >= min_chars:
+            chunks.append(carry)
+            carry = ""
+    if carry:
+        if chunks:
+            chunks[-1] += " " + carry
+        else:
+            chunks.append(carry)
+    return chunks
+
+
+# Speech queue priorities: lower is spoken first. Urgent items (timers and
+# reminders) jump the queue and survive barge-in.
+SPEECH_PRIORITY_URGENT = 0
+SPEECH_PRIORITY_NORMAL = 10
 
 
 class SpeechAssistant:
-    def __init__(self):
+    def __init__(self, data_dir: Optional[str] = None):
         # logger first so any initialization failures can be recorded
         self.logger = logging.getLogger("Forte")
+        # notes, reminders, the conversation log and known locations live here
+        self.data_dir = data_dir or os.path.dirname(os.path.abspath(__file__))
+        # per-stage timings (capture, recognize, route, handler, speech); see /stats
+        self.stats = LatencyStats()
+        # TTS engines are initialized on the speech worker thread (see _init_tts)
+        # so the first prompt doesn't wait for them.
+        self.engine = None
+        self._voices = []
+        self._sapi_voice = None
+        self._tts_available = False
+        self._tts_ready = threading.Event()
+        self.joke_generator = JokeGenerator()
+        self.fact_generator = FactGenerator()
+        self.reminder_manager = ReminderManager(
+            notify=lambda text: self.speak(text, priority=SPEECH_PRIORITY_URGENT),
+            journal=ReminderJournal(os.path.join(self.data_dir, "reminders.journal")))
+        self.enable_tts = True
+        # `self.logger` already set above
+        # speaking flag to avoid re-capturing TTS audio
+        self._speaking = threading.Event()
+        # Speech output runs on one worker thread fed by a priority queue, so
+        # speak() returns immediately and the TTS engine is only ever touched
+        # from a single thread. Items are (priority, seq, queued_at, generation, text).
+        self._speech_queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._speech_lock = threading.Lock()
+        self._speech_seq = 0
+        # bumped by cancel_speech(); queued items from older generations are dropped
+        self._speech_generation = 0
+        # set by cancel_speech() to cut off the current utterance; only the
+        # speech worker acts on it, since the engines aren't thread-safe
+        self._speech_stop = threading.Event()
+        # (text, generation) pairs waiting in the queue, used to coalesce repeats
+        self._speech_pending = set()
+        self._speech_current_priority: Optional[int] = None
+        self._speech_idle = threading.Event()
+        self._speech_idle.set()
+        # pause before the first utterance of a response, and after each one so
+        # the microphone doesn't pick up the tail of the TTS
+        self.response_delay = 1.0
+        self.speech_gap = 0.25
+        # normal-priority speech older than this (seconds) is stale and skipped
+        self.max_speech_age = 30.0
+        # Rendered audio for recurring replies (main() sets it up). Replies
+        # heard twice, or pre-rendered, are queued in the backlog and rendered
+        # by the speech worker while it has nothing to say.
+        self.phrase_audio: Optional[PhraseAudioCache] = None
+        self._player = AudioPlayer()
+        self._render_backlog: "collections.deque[str]" = collections.deque()
+        self._phrase_counts = collections.Counter()
+        self._speech_thread = threading.Thread(target=self._speech_worker, name="forte-speech", daemon=True)
+        self._speech_thread.start()
+        # microphone capture session, opened lazily by listen()
+        self._mic_session: Optional[MicrophoneSession] = None
+        # speech-to-text engine; main() may swap in an offline backend
+        self.recognizer_backend: RecognizerBackend = GoogleBackend()
+        self._fallback_backend: Optional[RecognizerBackend] = None
+        # wake word gating (main() sets it up): while asleep, phrases are only
+        # checked locally for the wake word and never sent for recognition
+        self.wake_word: Optional[str] = None
+        self.wake_detector: Optional[WakeWordDetector] = None
+        self.wake_window = 8.0
+        self._awake_until = 0.0
+        # conversation context: the console's, or that of the --serve client
+        # whose command this thread is running (see run_command)
+        self.history_limit = 500
+        self.console = Session(history_limit=self.history_limit)
+        self._local = threading.local()
+        # bounded expression engine for "calculate ..."
+        self.calculator = Calculator()
+        # shared keep-alive HTTP session for all network skills
+        self.http = HttpClient()
+        # cached answers from network skills; main() may give it a file to persist to
+        self.cache = ResponseCache()
+        # optional offline Wikipedia summaries (see WikiIndex); set by main()
+        self.wiki_index: Optional[WikiIndex] = None
+        # REST endpoint for online summaries (a test server can stand in for it)
+        self.wikipedia_api = "https://en.wikipedia.org"
+        # RSS feeds read for "news" (keys of NEWS_FEEDS), fetched concurrently
+        self.news_sources = ["google"]
+        self.feeds = FeedReader(self.http)
+        # one long-lived translation client; main() may swap in the offline phrasebook
+        self.translator: TranslatorBackend = GoogleTranslateBackend()
+        # worker pool for running network skills concurrently (briefing)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="forte-skill")
+        self.briefing_deadline = 8.0
+        self.briefing_currencies = [("USD", "EUR"), ("USD", "GBP")]
+        # city -> coordinates -> forecast endpoint, kept across restarts
+        self.locations = LocationIndex(os.path.join(self.data_dir, "locations.json"))
+        self.default_lat = 39.6374
+        self.default_lon = -75.6001
+        # Safety flags -- default to unsafe actions disabled
+        self.allow_apps = False
+        self.allow_volume = False
+        # intent table compiled once into a keyword trie (see IntentRouter)
+        self.router = IntentRouter(INTENTS)
+        self.aliases = {
+            "hi": "hello",
+            "hey": "hello",
+            "what's your name": "what is your name",
+            "whats your name": "what is your name",
+        }
+        # Limits to avoid resource exhaustion
+        self.max_timers = 5
+        # Notes storage (notes.json is only read once, to migrate it)
+        self.notes_file = os.path.join(self.data_dir, "notes.json")
+        self.conversation_log = ConversationLog(os.path.join(self.data_dir, "conversation.jsonl"))
+        try:
+            self.notes = NotesStore(os.path.join(self.data_dir, "notes.db"), legacy_json=self.notes_file)
+        except Exception:
+            self.logger.exception("Failed to open notes database; notes will not be saved")
+            self.notes = NotesStore(":memory:")
+        # reminders.json from older versions is imported once by load_reminders()
+        self.reminders_file = os.path.join(self.data_dir, "reminders.json")
+
+    def load_reminders(self) -> None:
+        """Replay the reminder journal, delivering anything missed while we were down.
+
+        Not done in __init__: catch-ups fire straight away, so main() calls this
+        once reminder_manager.notify points where this run mode delivers them.
+        """
+        try:
+            self.reminder_manager.restore()
+            if os.path.exists(self.reminders_file):
+                with open(self.reminders_file, "r", encoding="utf-8") as rf:
+                    data = json.load(rf)
+                now = time.time()
+                for item in data:
+                    try:
+                        fire_at = float(item.get("fire_at", now))
+                        msg = item.get("message", "Reminder")
+                        self.reminder_manager.add_reminder_at(fire_at, msg)
+                    except Exception:
+                        continue
+                os.replace(self.reminders_file, self.reminders_file + ".migrated")
+        except Exception:
+            self.logger.exception("Failed to load reminders")
+
+    @property
+    def session(self) -> Session:
+        return getattr(self._local, "session", None) or self.console
+
+    def run_command(self, session: Session, text: str) -> bool:
+        """process_command() on behalf of a client session; replies go to its sink."""
+        previous = getattr(self._local, "session", None)
+        self._local.session = session
+        session.last_active = time.time()
+        try:
+            return self.process_command(text)
+        finally:
+            self._local.session = previous
+
+    def speak(self, text: str, priority: int = SPEECH_PRIORITY_NORMAL) -> None:
+        session = self.session
+        if session.sink is not None:
+            # a --serve client: stream the text back instead of speaking it
+            session.last_response = text
+            self._record("assistant", text)
+            session.sink(text)
+            return
+        # Record and print synchronously so history and the log stay in order,
+        # then hand the audio to the speech worker.
+        with self._speech_lock:
+            # Always record the last response and history so text mode still works
+            session.last_response = text
+            self._record("assistant", text)
+
+            # Always print assistant output so the user sees responses even if TTS fails
+            try:
+                print(f"Assistant: {text}")
+            except Exception:
+                self.logger.info("Assistant (print) unavailable: %s", text)
+
+            if not self.enable_tts:
+                return
+
+            key = (text, self._speech_generation)
+            if key in self._speech_pending:
+                # the same text is already waiting to be spoken
+                return
+            self._speech_pending.add(key)
+            self._speech_seq += 1
+            self._speech_idle.clear()
+            self._speech_queue.put((priority, self._speech_seq, time.time(), self._speech_generation, text))
+
+    def _record(self, role: str, text: str) -> None:
+        session = self.session
+        with session.lock:
+            session.history.append(f"{role.capitalize()}: {text}")
+            session.history_total += 1
+            self.conversation_log.write(role, text, session.id)
+
+    def recent_history(self, n: int) -> List[str]:
+        """The last n turns since /clear, from memory or, past the ring buffer, from the log."""
+        session = self.session
+        with session.lock:
+            n = min(n, session.history_total)
+            if n <= len(session.history):
+                return list(session.history)[len(session.history) - n:]
+        return [f"{r.get('role', '').capitalize()}: {r.get('text', '')}" for r in self.conversation_log.tail(n, session.id)]
+
+    def cancel_speech(self) -> None:
+        """Barge-in: drop queued normal-priority speech and stop the current utterance.
+
+        The TTS engine is never touched from here: the speech worker sees
+        `_speech_stop` between words (pyttsx3) or while waiting on SAPI and
+        stops the engine itself. Cached audio is played by a subprocess,
+        which can be stopped from any thread.
+        """
+        with self._speech_lock:
+            self._speech_generation += 1
+            current = self._speech_current_priority
+            if current is None or current == SPEECH_PRIORITY_URGENT:
+                return
+            self._speech_stop.set()
+        self._player.stop()
+
+    def _on_word(self, *args) -> None:
+        # pyttsx3 "started-word" callback; runs on the speech worker inside runAndWait()
+        if self._speech_stop.is_set():
+            self.engine.stop()
+
+    def wait_for_speech(self, timeout: Optional[float] = None) -> bool:
+        """Block until the speech queue has drained. Returns False on timeout."""
+        return self._speech_idle.wait(timeout)
+
+    def _init_tts(self) -> None:
         # initialize TTS engine with fallbacks
         try:
             # Try to initialize multiple TTS backends and prefer SAPI on Windows
@@ -109,6 +2747,10 @@ class SpeechAssistant:
                     self._voices = self.engine.getProperty("voices") or []
                 except Exception:
                     self._voices = []
+                try:
+                    self.engine.connect("started-word", self._on_word)
+                except Exception:
+                    self.logger.debug("TTS engine has no word callbacks; barge-in waits for the utterance")
             except Exception:
                 self.engine = None
                 self._voices = []
@@ -133,119 +2775,232 @@ class SpeechAssistant:
             self._voices = []
             self._sapi_voice = None
             self._tts_available = False
-        self.joke_generator = JokeGenerator()
-        self.fact_generator = FactGenerator()
-        self.reminder_manager = ReminderManager()
-        self.enable_tts = True
-        # `self.logger` already set above
-        # speaking flag to avoid re-capturing TTS audio
-        self._speaking = threading.Event()
-        # conversation context
-        self.last_user_message: Optional[str] = None
-        self.last_response: Optional[str] = None
-        self.conversation_history: List[str] = []
-        self.default_lat = 39.6374
-        self.default_lon = -75.6001
-        # Safety flags -- default to unsafe actions disabled
-        self.allow_apps = False
-        self.allow_volume = False
-        self.aliases = {
-            "hi": "hello",
-            "hey": "hello",
-            "what's your name": "what is your name",
-            "whats your name": "what is your name",
-        }
-        # Limits to avoid resource exhaustion
-        self.max_timers = 5
-        self._timer_count = 0
-        self._timer_lock = threading.Lock()
-        # Notes storage
-        self.notes_file = os.path.join(os.path.dirname(__file__), "notes.json")
-        self.conversation_log = os.path.join(os.path.dirname(__file__), "conversation.log")
-        try:
-            if not os.path.exists(self.notes_file):
-                with open(self.notes_file, "w", encoding="utf-8") as f:
-                    f.write("[]")
-        except Exception:
-            self.logger.exception("Failed to initialize notes file")
-        # reminders persistence file
-        self.reminders_file = os.path.join(os.path.dirname(__file__), "reminders.json")
-        try:
-            # load persisted reminders (list of dicts with fire_at and message)
-            if os.path.exists(self.reminders_file):
-                with open(self.reminders_file, "r", encoding="utf-8") as rf:
-                    data = json.load(rf)
-                    now = time.time()
-                    for item in data:
-                        try:
-                            fire_at = float(item.get("fire_at", now))
-                            msg = item.get("message", "Reminder")
-                            if fire_at > now:
-                                self.reminder_manager.reminders.append((fire_at, msg))
-                                # start thread for pending reminder
-                                t = threading.Thread(target=self.reminder_manager.remind, args=((fire_at-now)/60, msg), daemon=True)
-                                t.start()
-                        except Exception:
-                            continue
-        except Exception:
-            self.logger.exception("Failed to load reminders")
+        finally:
+            self._tts_ready.set()
 
-    def speak(self, text: str) -> None:
-        # one second delay before every assistant response
-        try:
-            time.sleep(1)
-        except Exception:
-            pass
-        # Always record the last response and history so text mode still works
-        self.last_response = text
-        self.conversation_history.append(f"Assistant: {text}")
+    def _speech_worker(self) -> None:
+        if sys.platform.startswith("win"):
+            # SAPI is COM; this thread needs its own apartment
+            try:
+                import comtypes
+                comtypes.CoInitialize()
+            except Exception:
+                pass
+        self._init_tts()
+        while True:
+            was_idle = self._speech_idle.is_set()
+            try:
+                item = self._speech_queue.get(timeout=0.2 if self._render_backlog else None)
+            except queue.Empty:
+                self._render_next()
+                continue
+            priority, _, queued_at, generation, text = item
+            with self._speech_lock:
+                self._speech_pending.discard((text, generation))
+                stale = priority != SPEECH_PRIORITY_URGENT and (
+                    generation != self._speech_generation or time.time() - queued_at > self.max_speech_age)
+                if not stale:
+                    self._speech_current_priority = priority
+                    self._speech_stop.clear()
+                    self._speaking.set()
+            if not stale:
+                self.stats.record("speech_queue", max(0.0, time.time() - queued_at))
+                paused = 0.0
+                try:
+                    if was_idle and self.response_delay:
+                        t0 = time.perf_counter()
+                        time.sleep(self.response_delay)
+                        paused += time.perf_counter() - t0
+                    with self.stats.span("tts"):
+                        self._say_chunked(text, priority, generation)
+                except Exception:
+                    self.logger.exception("Speech worker failed")
+                finally:
+                    # give a short buffer to ensure microphone doesn't pick up the TTS :sob:
+                    t0 = time.perf_counter()
+                    time.sleep(self.speech_gap)
+                    self.stats.record("speech_pause", paused + time.perf_counter() - t0)
+            with self._speech_lock:
+                self._speech_current_priority = None
+                if self._speech_queue.empty():
+                    self._speaking.clear()
+                    self._speech_idle.set()
+
+    def prerender(self, texts: Optional[List[str]] = None) -> int:
+        """Queue replies (default: every fixed one) for rendering into the phrase cache."""
+        if texts is None:
+            texts = [intent.reply for intent in INTENTS if intent.reply] + list(COMMON_REPLIES)
+        texts = list(dict.fromkeys(texts))
+        self._render_backlog.extend(texts)
+        return len(texts)
+
+    def _voice_key(self) -> str:
+        # everything that changes how a phrase sounds
         try:
-            with open(self.conversation_log, "a", encoding="utf-8") as cf:
-                cf.write(f"Assistant: {text}\n")
+            if self._sapi_voice is not None:
+                v = self._sapi_voice
+                return f"sapi:{v.Voice.Id}:{v.Rate}:{v.Volume}"
+            if self.engine is not None:
+                get = self.engine.getProperty
+                return f"pyttsx3:{get('voice')}:{get('rate')}:{get('volume')}"
         except Exception:
-            self.logger.debug("Failed to write conversation log")
+            self.logger.debug("Could not read TTS voice settings", exc_info=True)
+        return "default"
 
-        # Always print assistant output so the user sees responses even if TTS fails
+    def _render_next(self) -> None:
+        # speech worker only, while nothing is waiting to be spoken
         try:
-            print(f"Assistant: {text}")
-        except Exception:
-            self.logger.info("Assistant (print) unavailable: %s", text)
+            text = self._render_backlog.popleft()
+        except IndexError:
+            return
+        cache = self.phrase_audio
+        if cache is None or not self._tts_available:
+            return
+        voice = self._voice_key()
+        if (text, voice) not in cache:
+            cache.add(text, voice, lambda path: self._render(text, path))
 
-        if not self.enable_tts:
+    def _render(self, text: str, path: str) -> None:
+        if self._sapi_voice is not None:
+            from comtypes.client import CreateObject
+
+            stream = CreateObject("SAPI.SpFileStream")
+            stream.Open(path, 3)  # SSFMCreateForWrite
+            previous = self._sapi_voice.AudioOutputStream
+            self._sapi_voice.AudioOutputStream = stream
+            try:
+                self._sapi_voice.Speak(text)
+            finally:
+                stream.Close()
+                self._sapi_voice.AudioOutputStream = previous
+        elif self.engine is not None:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+        else:
+            raise RuntimeError("no TTS engine to render with")
+
+    def _say_chunked(self, text: str, priority: int, generation: int) -> None:
+        """Speak a long reply sentence by sentence, stopping between sentences on barge-in.
+
+        When replies can be rendered to files, sentence N+1 is rendered while
+        sentence N plays, so the first audio waits only for the first sentence.
+        """
+        chunks = speech_chunks(text)
+        if not chunks:
+            return
+        if len(chunks) == 1:
+            self._say(text)
             return
 
-        # Try SAPI (Windows) first if available, then pyttsx3, then PowerShell
-        try:
-            self._speaking.set()
-            # primary: direct SAPI via comtypes (Windows)
-            if getattr(self, "_sapi_voice", None) is not None:
-                try:
-                    # comtypes SAPI object has Speak method
-                    self._sapi_voice.Speak(text)
+        def interrupted() -> bool:
+            return priority != SPEECH_PRIORITY_URGENT and generation != self._speech_generation
+
+        if not (self._player.available and self._tts_available
+                and (self._sapi_voice is not None or self.engine is not None)):
+            for chunk in chunks:
+                if interrupted():
+                    return
+                self._say(chunk)
+            return
+
+        started = time.perf_counter()
+        ready: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=1)  # at most one sentence rendered ahead
+
+        def play_all() -> None:
+            first = True
+            while True:
+                path = ready.get()
+                if path is None:
                     return
+                if interrupted():
+                    continue  # drain what the renderer already queued
+                if first:
+                    self.stats.record("tts_first_audio", time.perf_counter() - started)
+                    first = False
+                try:
+                    self._player.play(path)
                 except Exception:
-                    self.logger.exception("SAPI (comtypes) TTS failed; falling back")
+                    self.logger.exception("Speech playback failed")
+
+        workdir = tempfile.mkdtemp(prefix="forte-tts-")
+        player = threading.Thread(target=play_all, daemon=True, name="forte-playback")
+        player.start()
+        unrendered: List[str] = []
+        try:
+            cache = self.phrase_audio
+            voice = self._voice_key()
+            for i, chunk in enumerate(chunks):
+                if interrupted():
+                    break
+                path = cache.get(chunk, voice) if cache is not None else None
+                if path is None:
+                    path = os.path.join(workdir, f"{i}.wav")
+                    try:
+                        self._render(chunk, path)
+                    except Exception:
+                        self.logger.exception("Rendering speech failed; speaking the rest directly")
+                        unrendered = chunks[i:]
+                        break
+                ready.put(path)
+        finally:
+            ready.put(None)
+            player.join()
+            shutil.rmtree(workdir, ignore_errors=True)
+        for chunk in unrendered:
+            if interrupted():
+                return
+            self._say(chunk)
 
-            # secondary: pyttsx3
-            if self._tts_available and getattr(self, "engine", None) is not None:
+    def _say(self, text: str) -> None:
+        # Replies rendered before are just played back, skipping synthesis.
+        cache = self.phrase_audio
+        if cache is not None:
+            path = cache.get(text, self._voice_key())
+            if path is not None:
                 try:
-                    self.engine.say(text)
-                    self.engine.runAndWait()
+                    self._player.play(path)
                     return
                 except Exception:
-                    self.logger.exception("pyttsx3 TTS engine failed; attempting PowerShell fallback")
+                    self.logger.exception("Cached speech playback failed; synthesizing instead")
+            elif len(text) <= 200:
+                # a reply heard a second time is likely to come up again
+                self._phrase_counts[text] += 1
+                if self._phrase_counts[text] == 2:
+                    self._render_backlog.append(text)
+                if len(self._phrase_counts) > 2000:
+                    self._phrase_counts.clear()
 
-            # tertiary: PowerShell System.Speech fallback
+        # Try SAPI (Windows) first if available, then pyttsx3, then PowerShell
+        # primary: direct SAPI via comtypes (Windows)
+        if getattr(self, "_sapi_voice", None) is not None:
             try:
-                self._powershell_tts(text)
+                # speak asynchronously so barge-in can purge it from this thread
+                self._sapi_voice.Speak(text, 1)  # SVSFlagsAsync
+                while not self._sapi_voice.WaitUntilDone(100):
+                    if self._speech_stop.is_set():
+                        self._sapi_voice.Speak("", 2)  # SVSFPurgeBeforeSpeak
+                        break
+                return
             except Exception:
-                self.logger.exception("PowerShell TTS fallback failed")
-        finally:
-            # give a short buffer to ensure microphone doesn't pick up the TTS :sob:
-            time.sleep(0.25)
-            self._speaking.clear()
+                self.logger.exception("SAPI (comtypes) TTS failed; falling back")
+
+        # secondary: pyttsx3
+        if self._tts_available and getattr(self, "engine", None) is not None:
+            try:
+                self.engine.say(text)
+                self.engine.runAndWait()
+                return
+            except Exception:
+                self.logger.exception("pyttsx3 TTS engine failed; attempting PowerShell fallback")
+
+        # tertiary: PowerShell System.Speech fallback
+        try:
+            self._powershell_tts(text)
+        except Exception:
+            self.logger.exception("PowerShell TTS fallback failed")
 
     def list_voices(self) -> List[str]:
+        self._tts_ready.wait(10)
         out = []
         try:
             if getattr(self, "_voices", None):
@@ -277,6 +3032,7 @@ class SpeechAssistant:
         return out
 
     def set_voice(self, index: int) -> str:
+        self._tts_ready.wait(10)
         try:
             # Prefer pyttsx3 voices if available
             if getattr(self, "engine", None) and getattr(self, "_voices", None):
@@ -327,150 +3083,360 @@ class SpeechAssistant:
             self.logger.exception("PowerShell TTS fallback failed")
 
     def listen(self) -> Optional[str]:
-        recognizer = sr.Recognizer()
-        with sr.Microphone() as source:
-            # wait if we're speaking to avoid feedback
-            while self._speaking.is_set():
-                time.sleep(0.05)
+        # The microphone stays open between turns; it is only opened (and
+        # calibrated) on the first call.
+        if self._mic_session is None:
+            session = MicrophoneSession(muted=self._speaking, backend=self.recognizer_backend)
+            session.on_partial = lambda partial: self.logger.debug("Partial: %s", partial)
+            session.start()
+            self._mic_session = session
+        # wait if we're speaking to avoid feedback
+        while self._speaking.is_set():
+            time.sleep(0.05)
+        if self.wake_word and time.time() >= self._awake_until:
+            print(f"Waiting for '{self.wake_word}'...")
+        else:
             print("Listening...")
-            try:
-                # set some reasonable timeouts so we don't hang forever
-                audio = recognizer.listen(source, timeout=6, phrase_time_limit=12)
-                text = recognizer.recognize_google(audio, language='en-US')
-                return text
-            except sr.WaitTimeoutError:
+        # set a reasonable timeout so we don't hang forever
+        phrase = self._mic_session.next_phrase(timeout=6)
+        if phrase is None:
+            return None
+        audio, text = phrase
+        # phrase length, including the trailing pause that ended it
+        self.stats.record("capture", len(audio.frame_data) / float(audio.sample_rate * audio.sample_width))
+        if self.wake_word:
+            phrase = self._wake_gate(audio, text)
+            if phrase is None:
                 return None
-            except sr.UnknownValueError:
-                # be concise; avoid speaking over background noise
-                self.speak("Sorry, I didn't catch that.")
+            audio, text = phrase
+        try:
+            if text is None:
+                t0 = time.perf_counter()
+                text = self._recognize(audio)
+                self.stats.record("recognize", time.perf_counter() - t0)
+                self.logger.debug("Recognized phrase in %.0f ms", (time.perf_counter() - t0) * 1000)
+                if self.wake_word:
+                    # the cut after the wake word may have left some of it in
+                    rest = self._strip_wake_word(text)
+                    if rest == "":
+                        # only the wake word; the window is open, so wait for the command
+                        self.speak("Yes?")
+                        return None
+                    if rest is not None:
+                        text = rest
+            if not text:
+                raise sr.UnknownValueError()
+            return text
+        except sr.UnknownValueError:
+            # be concise; avoid speaking over background noise
+            self.speak("Sorry, I didn't catch that.")
+            return None
+        except sr.RequestError as e:
+            self.speak(f"Sorry, there was an error; {e}")
+            return None
+
+    def _wake_gate(self, audio, text: Optional[str]):
+        """Let a phrase through only near the wake word.
+
+        Returns the (audio, text) still to be recognized, or None to drop the
+        phrase. Within `wake_window` seconds of the last accepted phrase
+        everything goes through. Otherwise the phrase has to start with the
+        wake word, which is then cut off; the wake word on its own just
+        opens the window.
+        """
+        now = time.time()
+        if now < self._awake_until:
+            self._awake_until = now + self.wake_window
+            return audio, text
+        if text is not None:
+            # a local streaming recognizer has already decoded the phrase
+            rest = self._strip_wake_word(text)
+            if rest is None:
+                self.logger.debug("No wake word in %r; ignored", text)
                 return None
-            except sr.RequestError as e:
-                self.speak(f"Sorry, there was an error; {e}")
+            self._awake_until = now + self.wake_window
+            if not rest:
+                self.speak("Yes?")
                 return None
+            return audio, rest
+        if self.wake_detector is None:
+            return audio, text
+        with self.stats.span("wake"):
+            pcm = WakeWordDetector.pcm16k(audio.frame_data, audio.sample_rate, audio.sample_width)
+            end = self.wake_detector.detect(pcm)
+        if end is None:
+            self.logger.debug("No wake word in a %.1f s phrase; ignored", len(pcm) / 2.0 / WakeWordDetector.RATE)
+            return None
+        self._awake_until = now + self.wake_window
+        rest = pcm[end:]
+        # the phrase always ends with the pause that closed it
+        pause = self._mic_session.pause_threshold if self._mic_session is not None else 0.8
+        if len(rest) / 2.0 / WakeWordDetector.RATE < pause + 0.3:
+            self.speak("Yes?")
+            return None
+        return sr.AudioData(rest, WakeWordDetector.RATE, 2), None
+
+    def _strip_wake_word(self, text: str) -> Optional[str]:
+        # what follows the wake word, or None if the text doesn't start with it
+        match = re.match(r"[\s,.!?]*%s\b[\s,.!?]*" % re.escape(self.wake_word), text, re.IGNORECASE)
+        return text[match.end():].strip() if match else None
+
+    def _recognize(self, audio) -> str:
+        # Use the configured backend; if its engine fails, fall back to Google.
+        backend = self.recognizer_backend
+        try:
+            return backend.recognize(audio)
+        except sr.UnknownValueError:
+            raise
+        except Exception:
+            if backend.name == "google":
+                raise
+            self.logger.exception("%s recognizer failed; falling back to Google", backend.name)
+        if self._fallback_backend is None:
+            self._fallback_backend = GoogleBackend()
+        return self._fallback_backend.recognize(audio)
 
     def calculate(self, expression: str) -> str:
         try:
-            math_text = expression.lower().replace("calculate", "").strip()
-            math_text = (
-                math_text.replace("plus", "+")
-                .replace("minus", "-")
-                .replace("times", "*")
-                .replace("x", "*")
-                .replace("divided by", "/")
-            )
-
-            def safe_eval(expr: str):
-                operators = {
-                    ast.Add: op.add,
-                    ast.Sub: op.sub,
-                    ast.Mult: op.mul,
-                    ast.Div: op.truediv,
-                    ast.Pow: op.pow,
-                    ast.USub: op.neg,
-                }
-
-                def _eval(node):
-                    if isinstance(node, ast.Constant):
-                        return node.value
-                    if isinstance(node, ast.Num):
-                        return node.n
-                    if isinstance(node, ast.BinOp):
-                        return operators[type(node.op)](_eval(node.left), _eval(node.right))
-                    if isinstance(node, ast.UnaryOp):
-                        return operators[type(node.op)](_eval(node.operand))
-                    raise ValueError("Unsupported expression")
-
-                node = ast.parse(expr, mode="eval").body
-                return _eval(node)
-
-            result = str(safe_eval(math_text))
-            return result
+            return self.calculator.format(self.calculator.evaluate(expression))
+        except SkillError as e:
+            return str(e)
         except Exception:
             self.logger.exception("Calculation error")
             return "Sorry, I couldn't perform that calculation."
 
     def search_wikipedia(self, query: str) -> str:
+        if self.wiki_index is not None:
+            # offline index first; fall back to the network on a miss
+            try:
+                hit = self.wiki_index.lookup(query)
+            except Exception:
+                self.logger.exception("Offline Wikipedia lookup failed")
+                hit = None
+            if hit:
+                result = hit[1]
+                self.speak(result)
+                return result
         try:
-            result = wikipedia.summary(query, sentences=2)
+            result = self.cache.get_or_fetch("wikipedia", query, lambda: self._wikipedia_summary(query))
             self.speak(result)
             return result
+        except SkillError as e:
+            self.speak(str(e))
+            return str(e)
         except Exception:
             self.logger.exception("Wikipedia search failed")
             return "Sorry, I couldn't find anything on Wikipedia."
 
-    def get_weather(self, city: Optional[str] = None, lat: Optional[float] = None, lon: Optional[float] = None) -> str:
-        """Fetch current weather using api.weather.gov.
+    def _wikipedia_summary(self, query: str, sentences: int = 2) -> str:
+        # one REST call answers the common case; title search only runs on a miss
+        page = self._wikipedia_page(query)
+        if page is None:
+            titles = self._wikipedia_search(query)
+            if not titles:
+                raise SkillError(f"Sorry, I couldn't find anything on Wikipedia for {query}.")
+            page = self._wikipedia_page(titles[0])
+            if page is None:
+                raise SkillError(f"Sorry, I couldn't find anything on Wikipedia for {query}.")
+        if page.get("type") == "disambiguation":
+            # take the top search hit that isn't the disambiguation page, and name the others
+            title = page.get("title", query)
+            choices = [t for t in self._wikipedia_search(query) if t != title and "disambiguation" not in t]
+            if not choices:
+                raise SkillError(f"{title} could mean several things. Try being more specific.")
+            page = self._wikipedia_page(choices[0])
+            if page is None or page.get("type") == "disambiguation":
+                raise SkillError(f"{title} could mean {', '.join(choices[:3])}. Which one?")
+            others = choices[1:3]
+            summary = self._wikipedia_extract(page, sentences)
+            if others:
+                summary += f" (You might also mean {' or '.join(others)}.)"
+            return summary
+        return self._wikipedia_extract(page, sentences)
+
+    def _wikipedia_page(self, title: str) -> Optional[dict]:
+        url = f"{self.wikipedia_api}/api/rest_v1/page/summary/{quote(title.strip().replace(' ', '_'), safe='')}"
+        r = self.http.get(url, params={"redirect": "true"})
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
+
+    def _wikipedia_search(self, query: str, limit: int = 5) -> list:
+        r = self.http.get(f"{self.wikipedia_api}/w/api.php",
+                          params={"action": "opensearch", "search": query, "limit": limit, "namespace": 0,
+                                  "format": "json"})
+        r.raise_for_status()
+        data = r.json()
+        return list(data[1]) if len(data) > 1 else []
+
+    @staticmethod
+    def _wikipedia_extract(page: dict, sentences: int) -> str:
+        extract = (page.get("extract") or "").strip()
+        if not extract:
+            raise SkillError(f"Wikipedia has no summary for {page.get('title', 'that')}.")
+        return " ".join(_SENTENCE_RE.split(extract)[:sentences])
+
+    def get_weather(self, city: Optional[str] = None, lat: Optional[float] = None, lon: Optional[float] = None,
+                    when: Optional[str] = None) -> str:
+        """Fetch the forecast using api.weather.gov.
         If lat/lon provided, use them. If city provided, geocode it. If none provided, use defaults.
+        `when` picks a forecast period ("tonight", "tomorrow", "friday night"...); default is the current one.
         """
         try:
-            if lat is None or lon is None:
-                if city:
-                    geo_url = "https://nominatim.openstreetmap.org/search"
-                    gr = requests.get(
-                        geo_url,
-                        params={"q": city, "format": "json", "limit": 1},
-                        headers={"User-Agent": "Forte/1.0 (email@example.com)"},
-                        timeout=10,
-                    )
-                    gr.raise_for_status()
-                    results = gr.json()
-                    if not results:
-                        return f"I couldn't find the location {city}."
-                    lat = float(results[0]["lat"])
-                    lon = float(results[0]["lon"])
-                else:
-                    lat = self.default_lat
-                    lon = self.default_lon
-
-            headers = {"User-Agent": "Forte/1.0 (email@example.com)", "Accept": "application/ld+json"}
-            points_url = f"https://api.weather.gov/points/{lat},{lon}"
-            pr = requests.get(points_url, headers=headers, timeout=10)
-            pr.raise_for_status()
-            pdata = pr.json()
-            forecast_url = pdata.get("properties", {}).get("forecast")
-            location_name = pdata.get("properties", {}).get("relativeLocation", {}).get("properties", {}).get("city")
-            if not forecast_url:
-                return "Weather service did not return a forecast for that location."
-
-            fr = requests.get(forecast_url, headers=headers, timeout=10)
-            fr.raise_for_status()
-            fdata = fr.json()
-            periods = fdata.get("properties", {}).get("periods", [])
-            if not periods:
-                return "No forecast data available."
-            p = periods[0]
-            name = p.get("name", "Now")
-            short = p.get("shortForecast", "")
-            temp = p.get("temperature")
-            unit = p.get("temperatureUnit", "")
-            loc_display = city if city else (location_name or f"{lat},{lon}")
-            resp = f"{name} in {loc_display}: {short}, {temp} {unit}."
+            resp = self._weather_report(city, lat, lon, when)
             self.speak(resp)
             return resp
+        except SkillError as e:
+            self.speak(str(e))
+            return str(e)
         except Exception:
             self.logger.exception("Weather lookup failed")
             return "Sorry, I couldn't fetch the weather."
 
-    def set_timer(self, seconds: int, message: str = "Timer complete") -> None:
-        with self._timer_lock:
-            if self._timer_count >= self.max_timers:
-                self.speak("Too many timers running; please wait before adding another.")
-                return
-            self._timer_count += 1
+    def _weather_report(self, city: Optional[str] = None, lat: Optional[float] = None, lon: Optional[float] = None,
+                        when: Optional[str] = None) -> str:
+        if lat is None or lon is None:
+            if city:
+                lat, lon = self._geocode(city)
+            else:
+                lat = self.default_lat
+                lon = self.default_lon
+        periods, location_name = self._forecast_periods(lat, lon)
+        p = self._pick_period(periods, when)
+        if p is None:
+            raise SkillError(f"I don't have a forecast for {when}.")
+        name = p.get("name", "Now")
+        short = p.get("shortForecast", "")
+        temp = p.get("temperature")
+        unit = p.get("temperatureUnit", "")
+        loc_display = city if city else (location_name or f"{lat},{lon}")
+        return f"{name} in {loc_display}: {short}, {temp} {unit}."
+
+    def _geocode(self, city: str) -> tuple:
+        hit = self.locations.city(city)
+        if hit:
+            return hit
+        geo_url = "https://nominatim.openstreetmap.org/search"
+        gr = self.http.get(geo_url, params={"q": city, "format": "json", "limit": 1})
+        gr.raise_for_status()
+        results = gr.json()
+        if not results:
+            raise SkillError(f"I couldn't find the location {city}.")
+        lat = float(results[0]["lat"])
+        lon = float(results[0]["lon"])
+        self.locations.add_city(city, lat, lon)
+        return lat, lon
+
+    def _forecast_periods(self, lat: float, lon: float) -> tuple:
+        """Return (periods, location name); one request when the gridpoint is already known."""
+        headers = {"Accept": "application/ld+json"}
+        for attempt in range(2):
+            point = self.locations.point(lat, lon)
+            if point is None:
+                points_url = f"https://api.weather.gov/points/{lat},{lon}"
+                pr = self.http.get(points_url, headers=headers)
+                pr.raise_for_status()
+                pdata = pr.json()
+                forecast_url = pdata.get("properties", {}).get("forecast")
+                location_name = pdata.get("properties", {}).get("relativeLocation", {}).get("properties", {}).get("city")
+                if not forecast_url:
+                    raise SkillError("Weather service did not return a forecast for that location.")
+                self.locations.add_point(lat, lon, forecast_url, location_name)
+            else:
+                forecast_url, location_name = point
+
+            def fetch() -> list:
+                fr = self.http.get(forecast_url, headers=headers)
+                fr.raise_for_status()
+                return fr.json().get("properties", {}).get("periods", [])
 
-        def _timer():
             try:
-                time.sleep(seconds)
-                text = f"Timer: {message}"
-                print(text)
-                self.speak(text)
-            except Exception:
-                self.logger.exception("Timer failed")
-            finally:
-                with self._timer_lock:
-                    self._timer_count = max(0, self._timer_count - 1)
+                periods = self.cache.get_or_fetch("weather", forecast_url, fetch)
+            except requests.HTTPError as e:
+                # a remembered gridpoint can go stale; resolve it again once
+                if attempt == 0 and point is not None and e.response is not None and e.response.status_code == 404:
+                    self.locations.forget_point(lat, lon)
+                    continue
+                raise
+            if not periods:
+                raise SkillError("No forecast data available.")
+            return periods, location_name
+        raise SkillError("Weather service did not return a forecast for that location.")
+
+    @staticmethod
+    def _pick_period(periods: list, when: Optional[str]) -> Optional[dict]:
+        if not when:
+            return periods[0]
+        when = when.lower()
+        if when in ("now", "today"):
+            return periods[0]
+        if when == "tonight":
+            return next((p for p in periods if not p.get("isDaytime", True)), None)
+        if when.startswith("tomorrow"):
+            # the first daytime period after the current one is tomorrow
+            idx = next((i for i, p in enumerate(periods[1:], 1) if p.get("isDaytime")), None)
+            if idx is None:
+                return None
+            if when.endswith("night"):
+                return periods[idx + 1] if idx + 1 < len(periods) else None
+            return periods[idx]
+        # day names, e.g. "friday" or "friday night"
+        return next((p for p in periods if p.get("name", "").lower() == when), None)
+
+    def briefing(self, deadline: Optional[float] = None) -> List[str]:
+        """Weather, news, exchange rates and reminders, fetched in parallel.
+
+        Each section is spoken as soon as it is ready, so the whole briefing
+        takes about as long as the slowest section. Sections not done by the
+        deadline are skipped.
+        """
+        deadline = self.briefing_deadline if deadline is None else deadline
+
+        def weather() -> List[str]:
+            return [self._weather_report()]
+
+        def news() -> List[str]:
+            headlines = self._news_headlines()
+            return ["Top headlines: " + "; ".join(h[0] for h in headlines)] if headlines else []
+
+        def rate(frm: str, to: str):
+            return lambda: [f"1 {frm} = {self._currency_rate(frm, to):.2f} {to}"]
+
+        def reminders() -> List[str]:
+            items = self.reminder_manager.list_reminders()
+            return ["Reminders: " + "; ".join(items)] if items else ["You have no reminders."]
+
+        sections = {"weather": weather, "news": news, "reminders": reminders}
+        for frm, to in self.briefing_currencies:
+            sections[f"{frm} to {to} rate"] = rate(frm, to)
+        futures = {self.executor.submit(fn): name for name, fn in sections.items()}
+        spoken = []
+        try:
+            for fut in concurrent.futures.as_completed(futures, timeout=deadline):
+                name = futures[fut]
+                try:
+                    lines = fut.result()
+                except SkillError as e:
+                    lines = [str(e)]
+                except Exception:
+                    self.logger.exception("Briefing section %s failed", name)
+                    lines = [f"I couldn't get the {name}."]
+                for line in lines:
+                    self.speak(line)
+                    spoken.append(line)
+        except concurrent.futures.TimeoutError:
+            late = [name for fut, name in futures.items() if not fut.done()]
+            self.logger.warning("Briefing deadline hit; skipped %s", ", ".join(late))
+            self.speak(f"Sorry, the {', '.join(late)} took too long.")
+        return spoken
 
-        threading.Thread(target=_timer, daemon=True).start()
+    def set_timer(self, seconds: int, message: str = "Timer complete") -> bool:
+        if self.reminder_manager.count("timer") >= self.max_timers:
+            self.speak("Too many timers running; please wait before adding another.")
+            return False
+        self.reminder_manager.add_timer(seconds, message)
+        return True
 
     # Volume control (Windows - uses pycaw if available)
     def set_volume(self, percent: int) -> str:
@@ -563,60 +3529,110 @@ class SpeechAssistant:
             self.logger.exception("open_app failed")
             return "Sorry, I couldn't open that application."
 
-    def get_latest_news(self, source: str = "google") -> str:
+    def get_latest_news(self, sources: Optional[List[str]] = None) -> str:
         try:
-            # Use Google News RSS as default (no API key required)
-            if source == "google":
-                url = "https://news.google.com/rss?hl=en-US&gl=US&ceid=US:en"
-            else:
-                url = "http://feeds.bbci.co.uk/news/rss.xml"
-            r = requests.get(url, timeout=10)
-            r.raise_for_status()
-            root = ET.fromstring(r.content)
-            items = root.findall('.//item')[:5]
-            headlines = []
-            for it in items:
-                title = it.find('title').text if it.find('title') is not None else None
-                link = it.find('link').text if it.find('link') is not None else None
-                if title:
-                    headlines.append((title, link))
+            headlines = self._news_headlines(sources)
             if not headlines:
                 return "No news items found."
             self.speak("Here are the top headlines:")
             for title, link in headlines:
                 self.speak(title)
             return "; ".join([h[0] for h in headlines])
+        except SkillError as e:
+            self.speak(str(e))
+            return str(e)
         except Exception:
             self.logger.exception("News fetch failed")
             return "Sorry, I couldn't fetch the latest news."
 
-    def convert_currency(self, amount: float, from_curr: str, to_curr: str) -> str:
-        try:
+    def _news_headlines(self, sources: Optional[List[str]] = None, limit: int = 5) -> list:
+        """Top (title, link) pairs across the given feeds, de-duplicated by headline."""
+        sources = sources or self.news_sources
+
+        def fetch(source: str) -> list:
+            url = NEWS_FEEDS.get(source, NEWS_FEEDS["google"])
+            return self.cache.get_or_fetch("news", source, lambda: self.feeds.headlines(url, limit))
+
+        if len(sources) == 1:
+            per_feed = [fetch(sources[0])]
+        else:
+            # own small pool: briefing already runs this on self.executor
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(sources)) as pool:
+                futures = [pool.submit(fetch, source) for source in sources]
+            per_feed = []
+            for source, fut in zip(sources, futures):
+                try:
+                    per_feed.append(fut.result())
+                except Exception:
+                    self.logger.exception("News feed %s failed", source)
+            if not per_feed:
+                raise SkillError("Sorry, I couldn't reach any of the news feeds.")
+        # interleave the feeds rank by rank so each contributes its top stories
+        headlines, seen = [], set()
+        for row in itertools.zip_longest(*per_feed):
+            for item in row:
+                if item is None:
+                    continue
+                key = headline_key(item[0])
+                if key in seen:
+                    continue
+                seen.add(key)
+                headlines.append(tuple(item))
+        return headlines[:limit]
+
+    def _currency_rate(self, from_curr: str, to_curr: str) -> float:
+        """Units of to_curr per one from_curr, cached."""
+        def fetch() -> float:
             url = "https://api.exchangerate.host/convert"
-            params = {"from": from_curr.upper(), "to": to_curr.upper(), "amount": amount}
-            r = requests.get(url, params=params, timeout=10)
+            params = {"from": from_curr.upper(), "to": to_curr.upper(), "amount": 1}
+            r = self.http.get(url, params=params)
             r.raise_for_status()
             data = r.json()
             if not data.get("success", True):
-                return "Currency conversion failed."
-            result = data.get("result")
+                raise SkillError("Currency conversion failed.")
+            return float(data.get("result"))
+
+        return self.cache.get_or_fetch("currency", [from_curr.upper(), to_curr.upper()], fetch)
+
+    def convert_currency(self, amount: float, from_curr: str, to_curr: str) -> str:
+        try:
+            # convert from the cached unit rate so any amount is a hit
+            rate = self._currency_rate(from_curr, to_curr)
+            result = amount * rate
             resp = f"{amount} {from_curr.upper()} = {result:.2f} {to_curr.upper()}"
             self.speak(resp)
             return resp
+        except SkillError as e:
+            self.speak(str(e))
+            return str(e)
         except Exception:
             self.logger.exception("Currency conversion failed")
             return "Sorry, I couldn't convert currencies right now."
 
     def translate_text(self, text: str, dest: str) -> str:
-        if Translator is None:
+        return self.translate_batch([text], [dest])
+
+    def translate_batch(self, phrases: List[str], dests: List[str]) -> str:
+        """Translate every phrase into every language, with one backend call per language for cache misses."""
+        backend = self.translator
+        if isinstance(backend, GoogleTranslateBackend) and not backend.available():
             self.logger.warning("googletrans not installed")
             return "Translation feature requires the 'googletrans' package. Please install it."
         try:
-            translator = Translator()
-            res = translator.translate(text, dest=dest)
-            resp = f"Translation ({res.src} -> {res.dest}): {res.text}"
-            self.speak(resp)
-            return resp
+            lines = []
+            for dest in dests:
+                results = [self.cache.get("translate", [p, dest]) for p in phrases]
+                missing = [p for p, r in zip(phrases, results) if r is None]
+                if missing:
+                    fresh = dict(zip(missing, backend.translate(missing, dest)))
+                    for p in missing:
+                        self.cache.put("translate", [p, dest], list(fresh[p]))
+                    results = [r if r is not None else list(fresh[p]) for p, r in zip(phrases, results)]
+                for src, translated in results:
+                    lines.append(f"Translation ({src} -> {dest}): {translated}")
+            for line in lines:
+                self.speak(line)
+            return "\n".join(lines)
         except Exception:
             self.logger.exception("Translation failed")
             return "Sorry, I couldn't translate that."
@@ -633,7 +3649,7 @@ class SpeechAssistant:
                 "departure_time": "now",
                 "key": api_key,
             }
-            r = requests.get(url, params=params, timeout=10)
+            r = self.http.get(url, params=params)
             r.raise_for_status()
             data = r.json()
             if data.get("status") != "OK":
@@ -653,79 +3669,82 @@ class SpeechAssistant:
             self.logger.exception("Traffic lookup failed")
             return "Sorry, I couldn't fetch traffic information."
 
-    # Notes (persisted to notes.json)
-    def _read_notes(self):
-        try:
-            with open(self.notes_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return []
-
-    def _write_notes(self, notes):
+    # Notes (persisted to notes.db, see NotesStore)
+    def add_note(self, text: str) -> str:
         try:
-            with open(self.notes_file, "w", encoding="utf-8") as f:
-                json.dump(notes, f, ensure_ascii=False, indent=2)
+            self.notes.add(text)
         except Exception:
             self.logger.exception("Failed to write notes")
-
-    def add_note(self, text: str) -> str:
-        notes = self._read_notes()
-        note = {"id": int(time.time()), "text": text}
-        notes.append(note)
-        self._write_notes(notes)
+            return "Sorry, I couldn't save that note."
         self.speak("Note saved.")
         return "Note saved."
 
     def list_notes(self) -> List[str]:
-        notes = self._read_notes()
+        notes = self.notes.list()
         if not notes:
             self.speak("You have no notes.")
             return []
-        for n in notes:
-            self.speak(f"Note {n['id']}: {n['text']}")
-        return [n["text"] for n in notes]
+        for nid, text in notes:
+            self.speak(f"Note {nid}: {text}")
+        return [text for _, text in notes]
 
     def delete_note(self, note_id: str) -> str:
-        notes = self._read_notes()
-        new = [n for n in notes if str(n.get("id")) != str(note_id)]
-        if len(new) == len(notes):
+        if not self.notes.delete(int(note_id)):
             return "Note not found."
-        self._write_notes(new)
         self.speak("Note deleted.")
         return "Note deleted."
 
+    def search_notes(self, term: str) -> List[str]:
+        found = self.notes.search(term)
+        if not found:
+            self.speak(f"I couldn't find any notes about {term}.")
+            return []
+        for nid, text in found:
+            self.speak(f"Note {nid}: {text}")
+        return [text for _, text in found]
+
     def define_word(self, word: str) -> str:
-        try:
+        def fetch() -> str:
             url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-            r = requests.get(url, timeout=20)
+            r = self.http.get(url, read_timeout=20)
             r.raise_for_status()
             data = r.json()
             meanings = data[0].get("meanings", [])
             if not meanings:
-                return "No definition found."
+                raise SkillError("No definition found.")
             defs = meanings[0].get("definitions", [])
             if not defs:
-                return "No definition found."
+                raise SkillError("No definition found.")
             definition = defs[0].get("definition")
             example = defs[0].get("example")
             resp = f"{word}: {definition}"
             if example:
                 resp += f" Example: {example}"
+            return resp
+
+        try:
+            resp = self.cache.get_or_fetch("define", word.lower(), fetch)
             self.speak(resp)
             return resp
+        except SkillError as e:
+            self.speak(str(e))
+            return str(e)
         except Exception:
             self.logger.exception("Definition lookup failed")
             return "Sorry, I couldn't find a definition."
 
-    def set_reminder(self, duration: int, message: str) -> None:
-        self.reminder_manager.add_reminder(duration, message)
+    def set_reminder(self, duration: int, message: str, every: Optional[int] = None) -> None:
+        self.reminder_manager.add_reminder(duration, message, every=every)
 
     def process_command(self, text: str) -> bool:
         if not text:
             return False
-        print(f"User: {text}")
-        self.last_user_message = text
-        self.conversation_history.append(f"User: {text}")
+        session = self.session
+        if session.sink is None:
+            print(f"User: {text}")
+        session.last_user_message = text
+        self._record("user", text)
+        started = time.perf_counter()
         text_lower = text.lower()
         # apply simple alias normalization
         norm = text_lower.strip()
@@ -734,328 +3753,814 @@ class SpeechAssistant:
 
         # slash commands
         if text_lower.startswith("/"):
-            if text_lower.startswith("/history"):
-                m = re.search(r"/history\s*(\d+)?", text_lower)
-                n = int(m.group(1)) if m and m.group(1) else 10
-                hist = self.conversation_history[-n:]
-                if not hist:
-                    self.speak("No conversation history.")
-                else:
-                    for line in hist:
-                        self.speak(line)
-                return False
-            if text_lower.startswith("/clear"):
-                self.conversation_history.clear()
-                self.last_response = None
-                self.speak("Conversation history cleared.")
-                return False
-            if text_lower.startswith("/help"):
-                self.speak("Slash commands available: /history [n], /clear, /help. Use voice commands as usual.")
-                return False
-            if text_lower.startswith("/export"):
-                parts = text.split(None, 1)
-                fname = parts[1].strip() if len(parts) > 1 else "conversation_export.txt"
-                try:
-                    with open(fname, "w", encoding="utf-8") as ef:
-                        ef.write("\n".join(self.conversation_history))
-                    self.speak(f"Conversation exported to {fname}")
-                except Exception:
-                    self.logger.exception("Failed to export conversation")
-                    self.speak("I couldn't export the conversation.")
-                return False
-            if text_lower.startswith("/voices"):
-                vlist = self.list_voices()
-                if not vlist:
-                    self.speak("No voices available.")
-                else:
-                    for v in vlist:
-                        self.speak(v)
-                return False
-            if text_lower.startswith("/set-voice") or text_lower.startswith("set-voice"):
-                parts = text.split(None, 1)
-                if len(parts) < 2:
-                    self.speak("Usage: /set-voice <index>")
-                    return False
-                try:
-                    idx = int(parts[1].strip())
-                    res = self.set_voice(idx)
-                    self.speak(res)
-                except Exception:
-                    self.speak("Invalid voice index")
+            m = _SLASH_NAME_RE.match(text_lower)
+            handler = SLASH_COMMANDS.get(m.group(1)) if m else None
+            if handler and session.sink is not None and m.group(1) in CONSOLE_ONLY_SLASH:
+                self.speak(f"/{m.group(1)} is only available on the console.")
                 return False
-            if text_lower.startswith("/set-rate") or text_lower.startswith("set-rate"):
-                parts = text.split(None, 1)
-                if len(parts) < 2:
-                    self.speak("Usage: /set-rate <number>")
-                    return False
-                try:
-                    rate = int(parts[1].strip())
-                    if self.engine:
-                        self.engine.setProperty('rate', rate)
-                        self.speak(f"Speech rate set to {rate}")
-                    else:
-                        self.speak("TTS engine not available.")
-                except Exception:
-                    self.speak("Invalid rate value")
-                return False
-            if text_lower.startswith("/tts"):
-                # /tts on|off
-                if "on" in text_lower or "true" in text_lower:
-                    self.enable_tts = True
-                    self.speak("Text to speech enabled.")
-                elif "off" in text_lower or "false" in text_lower:
-                    # say confirmation before disabling
-                    self.speak("Text to speech disabled.")
-                    self.enable_tts = False
-                else:
-                    self.speak("Usage: /tts on or /tts off")
-                return False
-            if text_lower.startswith("test"):
-                self.speak("This is a text to speech test. If you hear this, TTS is working.")
-                return False
-            if text_lower.startswith("/summary"):
-                # /summary [n]
-                m = re.search(r"/summary\s*(\d+)?", text_lower)
-                n = int(m.group(1)) if m and m.group(1) else 20
-                items = self.conversation_history[-n:]
-                if not items:
-                    self.speak("No conversation to summarize.")
-                    return False
-                # naive summary: return last N messages concatenated and shortened
-                joined = " ".join(items)
-                summary = joined[:1000]
-                if len(joined) > 1000:
-                    summary += "..."
-                self.speak("Here is a brief summary of recent conversation:")
-                self.speak(summary)
-                return False
-            if text_lower.startswith("/verbose"):
-                if "on" in text_lower or "true" in text_lower:
-                    self.logger.setLevel(logging.DEBUG)
-                    self.speak("Verbose logging enabled.")
-                elif "off" in text_lower or "false" in text_lower:
-                    self.logger.setLevel(logging.INFO)
-                    self.speak("Verbose logging disabled.")
-                else:
-                    self.speak("Use /verbose on or /verbose off.")
-                return False
-            if text_lower.startswith("/remind"):
-                # /remind 5 commit arson
-                m = re.match(r"/remind\s+(\d+)\s+(.+)", text_lower)
-                if m:
-                    minutes = int(m.group(1))
-                    msg = m.group(2).strip()
-                    self.reminder_manager.add_reminder(minutes, msg)
-                    try:
-                        cur = []
-                        now = time.time()
-                        for fire_at, message in self.reminder_manager.reminders:
-                            cur.append({"fire_at": fire_at, "message": message})
-                        with open(self.reminders_file, "w", encoding="utf-8") as rf:
-                            json.dump(cur, rf, ensure_ascii=False, indent=2)
-                    except Exception:
-                        self.logger.exception("Failed to persist reminders")
-                    self.speak(f"Reminder set for {minutes} minutes from now: {msg}")
-                else:
-                    self.speak("Usage: /remind <minutes> <message>")
+            if handler:
+                self.stats.record("route", time.perf_counter() - started)
+                with self.stats.span("handler", "/" + m.group(1)):
+                    getattr(self, handler)(text, text_lower)
                 return False
 
-        if text_lower.strip() == "help":
-            cmds = [
-                "hello/hi", "how are you", "time", "calculate <expr>",
-                "tell me a joke", "tell me a fact", "remind me in <n> minutes to <task>",
-                "list reminders", "search wikipedia for <query>", "weather in <city>",
-                "translate <text> to <lang>", "traffic from <origin> to <destination>",
-                "set timer for <n> seconds/minutes", "convert <amount> <FROM> to <TO>",
-                "take note <text>", "list notes", "delete note <id>", "define <word>",
-                "goodbye"
-            ]
-            self.speak("Available commands: " + ", ".join(cmds))
+        intent = self.router.route(text_lower)
+        self.stats.record("route", time.perf_counter() - started)
+        if intent is None:
+            self.speak("Sorry, I didn't understand that command.")
             return False
+        with self.stats.span("handler", intent.name):
+            if intent.handler:
+                return bool(getattr(self, intent.handler)(text, text_lower))
+            self.speak(intent.reply)
+        return False
 
-        if any(word in text_lower for word in ["hello", "hi", "hey", "sup", "greetings"]):
-            self.speak("Hello!")
-        elif "how are you" in text_lower:
-            self.speak("I'm doing well, thank you for asking!")
-        elif "meow" in text_lower:
-            self.speak("Are you a cat? What the sigma, I like cats.")
-        elif "what is your name" in text_lower or "who are you" in text_lower:
-            self.speak("I am Forte")
-        elif "thanks" in text_lower:
-            self.speak("You're welcome!")
-        elif "six seven" in text_lower:
-            self.speak("Six seven!")
-        elif "67" in text_lower:
-            self.speak("Six seven!")
-        elif "will you be my friend" in text_lower:
-            self.speak("Of course!")
-        elif "want to be friends" in text_lower:
-            self.speak("Of course!")
-        elif "who created you" in text_lower:
-            self.speak("Joel Gallagher created me!")
-        elif "who made you" in text_lower:
-            self.speak("Joel Gallagher made me!")
-        elif "what can you do" in text_lower:
-            self.speak("I can do a lot of things! Try asking me to tell a joke, a fun fact, calculate something, search wikipedia, and more! If I can't do something yet, nag my creator until he programs me to be able to do it!")
-        elif "what is an asteroid" in text_lower:
-            self.speak("Asteroids are small rocky bodies that orbit the Sun. There are millions of them in space.")
-        elif "what are asteroids" in text_lower:
-            self.speak("Asteroids are small rocky bodies that orbit the Sun. There are millions of them in space.")
-        elif "what is mercury" in text_lower:
-            self.speak("Mercury is the closest planet to the Sun and the smallest planet in the solar system. It is about as wide as the Atlantic Ocean.")
-        elif "what is venus" in text_lower:
-            self.speak("Venus is the second planet from the Sun. Is is about the same size as Earth and it is made from similar materials.")
-        elif "what is mars" in text_lower:
-            self.speak("Mars is the fourth planet from the Sun. It is red and about half the size of the Earth.")
-        elif "what is jupiter" in text_lower:
-            self.speak("Jupiter is the fifth planet from the Sun. It is over a thousand times the size of Earth.")
-        elif "what is saturn" in text_lower:
-            self.speak("Saturn is the sixth planet from the Sun. It is surrounded by a system of rings that extend thousands of miles from the planet.")
-        elif "what is uranus" in text_lower:
-            self.speak("Uranus is the seventh planet from the Sun. The methane in its atmosphere gives it a blue color.")
-        elif "when is christmas" in text_lower:
-            self.speak("Christmas is on December 25.")
-        elif "when is valentines day" in text_lower:
-            self.speak("Valentines Day is on February 14.")
-        elif "when is halloween" in text_lower:
-            self.speak("Halloween is on October 31.")
-        elif "goodbye" in text_lower:
-            self.speak("Goodbye! Have a great day!")
-            return True
-        elif "time" in text_lower:
-            current_time = time.strftime("%I:%M %p").lstrip("0")
-            self.speak(f"The time is {current_time}")
-        elif "calculate" in text_lower:
-            result = self.calculate(text)
-            self.speak(result)
-        elif "tell me a joke" in text_lower or "joke" == text_lower.strip():
-            # support "tell me a joke about python" or "tell me a python joke"
-            m = re.search(r"joke(?: about)?\s+([A-Za-z]+)", text_lower)
-            if m:
-                cat = m.group(1)
-                self.speak(self.joke_generator.get_random_joke(category=cat))
-            else:
-                # check patterns like 'tell me a python joke'
-                m2 = re.search(r"tell me a\s+([A-Za-z]+)\s+joke", text_lower)
-                if m2:
-                    cat = m2.group(1)
-                    self.speak(self.joke_generator.get_random_joke(category=cat))
-                else:
-                    self.speak(self.joke_generator.get_random_joke())
-        elif "tell me a fact" in text_lower:
-            self.speak(self.fact_generator.get_random_fact())
-        elif "remind me" in text_lower:
-            try:
-                match = re.search(r"remind me in (\d+) minute[s]? to (.+)", text_lower)
-                if match:
-                    duration = int(match.group(1))
-                    message = match.group(2)
-                    self.set_reminder(duration, message)
-                    self.speak(f"I'll remind you to {message} in {duration} minutes")
-                else:
-                    self.speak("Sorry, I couldn't understand that reminder command.")
-            except Exception:
-                self.speak("Sorry, I couldn't understand that reminder command.")
-        elif "list reminders" in text_lower:
-            items = self.reminder_manager.list_reminders()
-            if not items:
-                self.speak("You have no reminders.")
-            else:
-                for it in items:
-                    self.speak(it)
-        elif "search wikipedia" in text_lower:
-            if "for" in text_lower:
-                query = text_lower.split("for", 1)[1].strip()
-            else:
-                query = text_lower.replace("search wikipedia", "").strip()
-            self.search_wikipedia(query)
-        elif "weather" in text_lower:
-            # If user says just 'weather', use defaults.
-            m = re.search(r"(?:weather(?: in| for)? )(.+)", text_lower)
-            if m:
-                city = m.group(1).strip()
-                self.get_weather(city=city)
-            else:
-                # no city provided, use default coords
-                self.get_weather()
-        elif text_lower.startswith("set timer") or "timer for" in text_lower:
-            m = re.search(r"(\d+)\s*(second|seconds|minute|minutes)", text_lower)
-            if m:
-                val = int(m.group(1))
-                unit = m.group(2)
-                seconds = val * 60 if unit.startswith("minute") else val
-                msg_m = re.search(r"(?:to|for)\s+(.+)$", text, re.I)
-                msg = msg_m.group(1).strip() if msg_m else "Timer finished"
-                self.set_timer(seconds, msg)
-                self.speak(f"Timer set for {val} {unit}.")
-            else:
-                self.speak("Please specify a duration like 'set timer for 10 seconds'.")
-        elif text_lower.strip() in ("repeat", "say that again", "what did you say"):
-            if self.last_response:
-                self.speak(self.last_response)
+    # Slash command handlers
+
+    def _slash_history(self, text: str, text_lower: str) -> None:
+        m = _HISTORY_RE.search(text_lower)
+        n = int(m.group(1)) if m and m.group(1) else 10
+        hist = self.recent_history(n)
+        if not hist:
+            self.speak("No conversation history.")
+        else:
+            for line in hist:
+                self.speak(line)
+
+    def _slash_clear(self, text: str, text_lower: str) -> None:
+        session = self.session
+        with session.lock:
+            session.history.clear()
+            session.history_total = 0
+        session.last_response = None
+        self.speak("Conversation history cleared.")
+
+    def _slash_help(self, text: str, text_lower: str) -> None:
+        self.speak("Slash commands available: /history [n], /clear, /cache [clear], /stats [intents|reset], /help. "
+                   "Use voice commands as usual.")
+
+    def _slash_export(self, text: str, text_lower: str) -> None:
+        parts = text.split(None, 1)
+        fname = parts[1].strip() if len(parts) > 1 else "conversation_export.txt"
+        try:
+            with open(fname, "w", encoding="utf-8") as ef:
+                ef.write("\n".join(self.recent_history(self.session.history_total)))
+            self.speak(f"Conversation exported to {fname}")
+        except Exception:
+            self.logger.exception("Failed to export conversation")
+            self.speak("I couldn't export the conversation.")
+
+    def _slash_voices(self, text: str, text_lower: str) -> None:
+        vlist = self.list_voices()
+        if not vlist:
+            self.speak("No voices available.")
+        else:
+            for v in vlist:
+                self.speak(v)
+
+    def _slash_set_voice(self, text: str, text_lower: str) -> None:
+        parts = text.split(None, 1)
+        if len(parts) < 2:
+            self.speak("Usage: /set-voice <index>")
+            return
+        try:
+            idx = int(parts[1].strip())
+            res = self.set_voice(idx)
+            self.speak(res)
+        except Exception:
+            self.speak("Invalid voice index")
+
+    def _slash_set_rate(self, text: str, text_lower: str) -> None:
+        parts = text.split(None, 1)
+        if len(parts) < 2:
+            self.speak("Usage: /set-rate <number>")
+            return
+        try:
+            rate = int(parts[1].strip())
+            self._tts_ready.wait(10)
+            if self.engine:
+                self.engine.setProperty('rate', rate)
+                self.speak(f"Speech rate set to {rate}")
             else:
-                self.speak("I don't have anything to repeat.")
-        elif "another joke" in text_lower or "more jokes" in text_lower:
+                self.speak("TTS engine not available.")
+        except Exception:
+            self.speak("Invalid rate value")
+
+    def _slash_tts(self, text: str, text_lower: str) -> None:
+        # /tts on|off
+        if "on" in text_lower or "true" in text_lower:
+            self.enable_tts = True
+            self.speak("Text to speech enabled.")
+        elif "off" in text_lower or "false" in text_lower:
+            # say confirmation before disabling
+            self.speak("Text to speech disabled.")
+            self.enable_tts = False
+        else:
+            self.speak("Usage: /tts on or /tts off")
+
+    def _slash_test(self, text: str, text_lower: str) -> None:
+        self.speak("This is a text to speech test. If you hear this, TTS is working.")
+
+    def _slash_summary(self, text: str, text_lower: str) -> None:
+        # /summary [n]
+        m = _SUMMARY_RE.search(text_lower)
+        n = int(m.group(1)) if m and m.group(1) else 20
+        items = self.recent_history(n)
+        if not items:
+            self.speak("No conversation to summarize.")
+            return
+        # naive summary: return last N messages concatenated and shortened
+        joined = " ".join(items)
+        summary = joined[:1000]
+        if len(joined) > 1000:
+            summary += "..."
+        self.speak("Here is a brief summary of recent conversation:")
+        self.speak(summary)
+
+    def _slash_verbose(self, text: str, text_lower: str) -> None:
+        if "on" in text_lower or "true" in text_lower:
+            self.logger.setLevel(logging.DEBUG)
+            self.speak("Verbose logging enabled.")
+        elif "off" in text_lower or "false" in text_lower:
+            self.logger.setLevel(logging.INFO)
+            self.speak("Verbose logging disabled.")
+        else:
+            self.speak("Use /verbose on or /verbose off.")
+
+    def _slash_cache(self, text: str, text_lower: str) -> None:
+        # /cache [clear]
+        if "clear" in text_lower:
+            self.cache.clear()
+            self.speak("Response cache cleared.")
+            return
+        for line in self.cache.stats():
+            self.speak(line)
+        if self.phrase_audio is not None:
+            a = self.phrase_audio
+            self.speak(f"Speech cache: {len(a._files)} phrases, {a._bytes / 1048576:.1f} MB, "
+                       f"{a.hits} hits, {a.misses} misses")
+
+    def _slash_stats(self, text: str, text_lower: str) -> None:
+        # /stats [intents|reset]
+        if "reset" in text_lower:
+            self.stats.reset()
+            self.speak("Latency stats cleared.")
+            return
+        lines = self.stats.lines(labelled="intent" in text_lower)
+        if not lines:
+            self.speak("No timings recorded yet.")
+        for line in lines:
+            self.speak(line)
+
+    def _slash_remind(self, text: str, text_lower: str) -> None:
+        # /remind 5 commit arson
+        m = _SLASH_REMIND_RE.match(text_lower)
+        if m:
+            minutes = int(m.group(1))
+            msg = m.group(2).strip()
+            self.reminder_manager.add_reminder(minutes, msg)
+            self.speak(f"Reminder set for {minutes} minutes from now: {msg}")
+        else:
+            self.speak("Usage: /remind <minutes> <message>")
+
+    # Intent handlers (see INTENTS). Returning True ends the session.
+
+    def _intent_help(self, text: str, text_lower: str) -> None:
+        cmds = [
+            "hello/hi", "how are you", "time", "calculate <expr>",
+            "tell me a joke", "tell me a fact", "remind me in <n> minutes to <task>",
+            "remind me every <n> minutes to <task>", "list reminders", "cancel reminder <n>",
+            "cancel timer", "snooze [n minutes]", "search wikipedia for <query>", "weather in <city>",
+            "translate <text> to <lang>", "traffic from <origin> to <destination>",
+            "set timer for <n> seconds/minutes", "convert <amount> <FROM> to <TO>",
+            "take note <text>", "list notes", "search notes for <term>", "delete note <id>", "define <word>",
+            "news", "briefing", "goodbye"
+        ]
+        self.speak("Available commands: " + ", ".join(cmds))
+
+    def _intent_goodbye(self, text: str, text_lower: str) -> bool:
+        self.speak("Goodbye! Have a great day!")
+        return True
+
+    def _intent_time(self, text: str, text_lower: str) -> None:
+        current_time = time.strftime("%I:%M %p").lstrip("0")
+        self.speak(f"The time is {current_time}")
+
+    def _intent_calculate(self, text: str, text_lower: str) -> None:
+        result = self.calculate(text)
+        self.speak(result)
+
+    def _intent_joke(self, text: str, text_lower: str) -> None:
+        # support "tell me a joke about python" or "tell me a python joke"
+        m = _JOKE_ABOUT_RE.search(text_lower) or _JOKE_KIND_RE.search(text_lower)
+        if m:
+            self.speak(self.joke_generator.get_random_joke(category=m.group(1)))
+        else:
             self.speak(self.joke_generator.get_random_joke())
-        elif text_lower.startswith("convert") or (" to " in text_lower and any(c.isdigit() for c in text_lower)):
-            m = re.search(r"(\d+(?:\.\d+)?)\s*([A-Za-z]{3})\s+to\s+([A-Za-z]{3})", text)
-            if not m:
-                m = re.search(r"convert\s+(\d+(?:\.\d+)?)\s*([A-Za-z]{3})\s+to\s+([A-Za-z]{3})", text, re.I)
-            if m:
-                amount = float(m.group(1))
-                frm = m.group(2)
-                to = m.group(3)
-                self.convert_currency(amount, frm, to)
-            else:
-                self.speak("Please say something like 'convert 10 USD to EUR'.")
-        elif text_lower.startswith("translate"):
-            m = re.search(r"translate\s+(.+)\s+to\s+([a-zA-Z-]+)$", text, re.I)
-            if m:
-                phrase = m.group(1).strip()
-                lang = m.group(2).strip()
-                self.translate_text(phrase, lang)
-            else:
-                m2 = re.search(r"translate to\s+([a-zA-Z-]+)\s+(.+)$", text, re.I)
-                if m2:
-                    lang = m2.group(1).strip()
-                    phrase = m2.group(2).strip()
-                    self.translate_text(phrase, lang)
-                else:
-                    self.speak("Please provide text and a target language code, e.g. 'translate hello to es'.")
-        elif "traffic" in text_lower and "from" in text_lower and "to" in text_lower:
-            m = re.search(r"traffic from (.+) to (.+)", text_lower)
-            if m:
-                origin = m.group(1).strip()
-                destination = m.group(2).strip()
-                self.get_traffic(origin, destination)
-            else:
-                self.speak("Please say 'traffic from <origin> to <destination>'.")
-        elif text_lower.startswith("take note") or text_lower.startswith("save note") or text_lower.startswith("note:"):
-            m = re.search(r"(?:take note|save note|note:)\s*(.+)", text, re.I)
-            if m:
-                note_text = m.group(1).strip()
-                self.add_note(note_text)
-            else:
-                self.speak("Please provide note text, e.g. 'take note buy milk'.")
-        elif "list notes" in text_lower:
-            self.list_notes()
-        elif text_lower.startswith("delete note"):
-            m = re.search(r"delete note\s+(\d+)", text_lower)
-            if m:
-                nid = m.group(1)
-                self.delete_note(nid)
-            else:
-                self.speak("Please give the numeric id of the note to delete.")
-        elif text_lower.startswith("define "):
-            m = re.search(r"define\s+([A-Za-z-]+)", text_lower)
-            if m:
-                word = m.group(1)
-                self.define_word(word)
+
+    def _intent_another_joke(self, text: str, text_lower: str) -> None:
+        self.speak(self.joke_generator.get_random_joke())
+
+    def _intent_fact(self, text: str, text_lower: str) -> None:
+        self.speak(self.fact_generator.get_random_fact())
+
+    def _intent_remind(self, text: str, text_lower: str) -> None:
+        try:
+            every = _REMIND_EVERY_RE.search(text_lower)
+            if every:
+                interval = int(every.group(1))
+                message = every.group(2)
+                self.set_reminder(interval, message, every=interval)
+                self.speak(f"I'll remind you to {message} every {interval} minutes")
+                return
+            match = _REMIND_RE.search(text_lower)
+            if match:
+                duration = int(match.group(1))
+                message = match.group(2)
+                self.set_reminder(duration, message)
+                self.speak(f"I'll remind you to {message} in {duration} minutes")
             else:
-                self.speak("Please say 'define <word>'.")
+                self.speak("Sorry, I couldn't understand that reminder command.")
+        except Exception:
+            self.speak("Sorry, I couldn't understand that reminder command.")
+
+    def _intent_briefing(self, text: str, text_lower: str) -> None:
+        self.briefing()
+
+    def _intent_cancel(self, text: str, text_lower: str) -> None:
+        # "cancel reminder 2" (as numbered by list reminders) or "cancel timer" (newest)
+        m = _CANCEL_RE.search(text_lower)
+        kind = m.group(1) if m else "reminder"
+        number = int(m.group(2)) if m and m.group(2) else None
+        item = self.reminder_manager.cancel(kind, number)
+        if item is None:
+            self.speak(f"I couldn't find that {kind}.")
         else:
-            self.speak("Sorry, I didn't understand that command.")
-        return False
+            self.speak(f"Cancelled the {kind}: {item.message}")
+
+    def _intent_snooze(self, text: str, text_lower: str) -> None:
+        m = _SNOOZE_RE.search(text_lower)
+        minutes = int(m.group(1)) if m else 5
+        item = self.reminder_manager.snooze(minutes)
+        if item is None:
+            self.speak("There's nothing to snooze.")
+        else:
+            self.speak(f"Snoozed for {minutes} minutes: {item.message}")
+
+    def _intent_list_reminders(self, text: str, text_lower: str) -> None:
+        items = self.reminder_manager.list_reminders()
+        if not items:
+            self.speak("You have no reminders.")
+        else:
+            for it in items:
+                self.speak(it)
+
+    def _intent_search_wikipedia(self, text: str, text_lower: str) -> None:
+        if "for" in text_lower:
+            query = text_lower.split("for", 1)[1].strip()
+        else:
+            query = text_lower.replace("search wikipedia", "").strip()
+        self.search_wikipedia(query)
+
+    def _intent_weather(self, text: str, text_lower: str) -> None:
+        # "weather tomorrow in paris": pull out the period, then the city
+        when = None
+        w = _WEATHER_WHEN_RE.search(text_lower)
+        if w:
+            when = w.group(1)
+            text_lower = " ".join((text_lower[:w.start()] + " " + text_lower[w.end():]).split())
+        # If user says just 'weather', use defaults.
+        m = _WEATHER_RE.search(text_lower)
+        if m:
+            city = m.group(1).strip()
+            self.get_weather(city=city, when=when)
+        else:
+            # no city provided, use default coords
+            self.get_weather(when=when)
+
+    def _intent_news(self, text: str, text_lower: str) -> None:
+        named = [source for source in NEWS_FEEDS if source in text_lower]
+        self.get_latest_news(named or None)
+
+    def _intent_set_timer(self, text: str, text_lower: str) -> None:
+        m = _TIMER_RE.search(text_lower)
+        if m:
+            val = int(m.group(1))
+            unit = m.group(2)
+            seconds = val * 60 if unit.startswith("minute") else val
+            msg_m = _TIMER_MSG_RE.search(text)
+            msg = msg_m.group(1).strip() if msg_m else "Timer finished"
+            if self.set_timer(seconds, msg):
+                self.speak(f"Timer set for {val} {unit}.")
+        else:
+            self.speak("Please specify a duration like 'set timer for 10 seconds'.")
+
+    def _intent_repeat(self, text: str, text_lower: str) -> None:
+        if self.session.last_response:
+            self.speak(self.session.last_response)
+        else:
+            self.speak("I don't have anything to repeat.")
+
+    def _intent_convert(self, text: str, text_lower: str) -> None:
+        m = _CURRENCY_RE.search(text)
+        if m:
+            amount = float(m.group(1))
+            frm = m.group(2)
+            to = m.group(3)
+            self.convert_currency(amount, frm, to)
+        else:
+            self.speak("Please say something like 'convert 10 USD to EUR'.")
+
+    def _intent_translate(self, text: str, text_lower: str) -> None:
+        # several phrases are separated by ";", several languages by commas/"and"
+        m = _TRANSLATE_RE.search(text)
+        if m:
+            phrases = [p.strip() for p in m.group(1).split(";") if p.strip()]
+            langs = _LANG_SPLIT_RE.split(m.group(2).strip())
+            self.translate_batch(phrases, langs)
+            return
+        m2 = _TRANSLATE_TO_RE.search(text)
+        if m2:
+            langs = _LANG_SPLIT_RE.split(m2.group(1).strip())
+            phrases = [p.strip() for p in m2.group(2).split(";") if p.strip()]
+            self.translate_batch(phrases, langs)
+        else:
+            self.speak("Please provide text and a target language code, e.g. 'translate hello to es'.")
+
+    def _intent_traffic(self, text: str, text_lower: str) -> None:
+        m = _TRAFFIC_RE.search(text_lower)
+        if m:
+            origin = m.group(1).strip()
+            destination = m.group(2).strip()
+            self.get_traffic(origin, destination)
+        else:
+            self.speak("Please say 'traffic from <origin> to <destination>'.")
+
+    def _intent_take_note(self, text: str, text_lower: str) -> None:
+        m = _NOTE_RE.search(text)
+        if m:
+            note_text = m.group(1).strip()
+            self.add_note(note_text)
+        else:
+            self.speak("Please provide note text, e.g. 'take note buy milk'.")
+
+    def _intent_list_notes(self, text: str, text_lower: str) -> None:
+        self.list_notes()
+
+    def _intent_search_notes(self, text: str, text_lower: str) -> None:
+        m = _SEARCH_NOTES_RE.search(text_lower)
+        if m:
+            self.search_notes(m.group(1).strip())
+        else:
+            self.speak("Please say 'search notes for <term>'.")
+
+    def _intent_delete_note(self, text: str, text_lower: str) -> None:
+        m = _DELETE_NOTE_RE.search(text_lower)
+        if m:
+            nid = m.group(1)
+            self.delete_note(nid)
+        else:
+            self.speak("Please give the numeric id of the note to delete.")
+
+    def _intent_define(self, text: str, text_lower: str) -> None:
+        m = _DEFINE_RE.search(text_lower)
+        if m:
+            word = m.group(1)
+            self.define_word(word)
+        else:
+            self.speak("Please say 'define <word>'.")
+
+
+class SessionRegistry:
+    """Client sessions for --serve, by id.
+
+    Ids are chosen by the client (e.g. one per room) or generated. Sessions
+    idle for `idle_timeout` seconds are dropped, and past `max_sessions` the
+    least recently used go first.
+    """
+
+    _ID_RE = re.compile(r"[A-Za-z0-9_.-]{1,64}$")
+
+    def __init__(self, history_limit: int = 500, max_sessions: int = 1000, idle_timeout: float = 30 * 60):
+        self.history_limit = history_limit
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: "collections.OrderedDict[str, Session]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: Optional[str] = None) -> Session:
+        if session_id is not None and not self._ID_RE.match(session_id):
+            raise ValueError("session ids are 1-64 letters, digits, '.', '_' or '-'")
+        now = time.time()
+        with self._lock:
+            while self._sessions:
+                oldest = next(iter(self._sessions.values()))
+                if len(self._sessions) < self.max_sessions and now - oldest.last_active < self.idle_timeout:
+                    break
+                self._sessions.popitem(last=False)
+            session = self._sessions.get(session_id) if session_id else None
+            if session is None:
+                session = Session(session_id or os.urandom(8).hex(), self.history_limit)
+                self._sessions[session.id] = session
+            self._sessions.move_to_end(session.id)
+            session.last_active = now
+            return session
+
+    def drop(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class WebSocket:
+    """Just enough RFC 6455 for --serve: text messages, ping/pong and close."""
+
+    GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+    MAX_MESSAGE = 64 * 1024
+
+    def __init__(self, sock, rfile):
+        self.sock = sock
+        self.rfile = rfile
+        self.closed = False
+        self._send_lock = threading.Lock()
+
+    @classmethod
+    def accept_key(cls, key: str) -> str:
+        import base64
+        import hashlib
+        return base64.b64encode(hashlib.sha1((key + cls.GUID).encode()).digest()).decode()
+
+    def send_json(self, obj) -> None:
+        self._send(0x1, json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+    def receive(self) -> Optional[str]:
+        """The next text message, or None once the connection is closed."""
+        message = bytearray()
+        while not self.closed:
+            head = self._read(2)
+            if head is None:
+                break
+            opcode, n = head[0] & 0x0F, head[1] & 0x7F
+            if n >= 126:
+                ext = self._read(2 if n == 126 else 8)
+                if ext is None:
+                    break
+                n = int.from_bytes(ext, "big")
+            if n + len(message) > self.MAX_MESSAGE:
+                self.close(1009)
+                break
+            mask = self._read(4) if head[1] & 0x80 else b""
+            payload = self._read(n)
+            if mask is None or payload is None:
+                break
+            if mask:
+                key = (mask * (n // 4 + 1))[:n]
+                payload = (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+            if opcode == 0x8:
+                self.close()
+                break
+            if opcode == 0x9:
+                self._send(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            message += payload
+            if head[0] & 0x80:
+                return message.decode("utf-8", "replace")
+        self.closed = True
+        return None
+
+    def close(self, code: int = 1000) -> None:
+        self._send(0x8, struct.pack("!H", code))
+        self.closed = True
+
+    def _read(self, n: int) -> Optional[bytes]:
+        try:
+            data = self.rfile.read(n) if n else b""
+        except OSError:
+            return None
+        return data if len(data) == n else None
+
+    def _send(self, opcode: int, payload: bytes) -> None:
+        n = len(payload)
+        if n < 126:
+            header = struct.pack("!BB", 0x80 | opcode, n)
+        elif n < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+        with self._send_lock:
+            if self.closed:
+                return
+            try:
+                self.sock.sendall(header + payload)
+            except OSError:
+                self.closed = True
+
+
+class ForteServer:
+    """Serves one SpeechAssistant to many clients at once (--serve).
+
+    POST /command with {"text": ..., "session": optional id} streams the
+    replies back as newline-delimited JSON ({"text": ...} per line, then
+    {"done": true, "session": id, "end": bool}). GET /ws upgrades to a
+    WebSocket: each message is a command, answered the same way, and
+    reminders are pushed to every open socket. GET /health reports status;
+    GET /metrics (Prometheus text) and GET /stats (JSON) expose the latency stats.
+
+    Each connection is handled on its own thread, so a slow skill only holds
+    up its own client. Commands within one session still run one at a time,
+    in order, because they share its history and last response.
+    """
+
+    MAX_BODY = 64 * 1024
+
+    def __init__(self, assistant: "SpeechAssistant", host: str = "127.0.0.1", port: int = 8765,
+                 max_sessions: int = 1000, idle_timeout: float = 30 * 60):
+        # http.server is imported here so normal startup doesn't pay for it
+        from http.server import ThreadingHTTPServer
+
+        self.assistant = assistant
+        self.logger = logging.getLogger("Forte")
+        self.sessions = SessionRegistry(assistant.history_limit, max_sessions, idle_timeout)
+        self._sockets = set()
+        self._sockets_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _forte_request_handler(), bind_and_activate=False)
+        self.httpd.daemon_threads = True
+        # the default backlog of 5 drops connections when many clients connect at once
+        self.httpd.request_queue_size = 128
+        try:
+            self.httpd.server_bind()
+            self.httpd.server_activate()
+        except OSError:
+            self.httpd.server_close()
+            raise
+        self.httpd.forte = self
+        # reminders still fire through the assistant; also push them to WebSocket clients
+        notify = assistant.reminder_manager.notify
+
+        def notify_all(text: str) -> None:
+            if notify is not None:
+                notify(text)
+            self.broadcast({"text": text, "urgent": True})
+
+        assistant.reminder_manager.notify = notify_all
+
+    @property
+    def address(self) -> tuple:
+        return self.httpd.server_address[:2]
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(self, session: Session, text: str, send) -> bool:
+        """Run one command for `session`, passing each reply to send(text). True ends the session."""
+        with session.turn:
+            session.sink = send
+            try:
+                ended = self.assistant.run_command(session, text)
+            except Exception:
+                self.logger.exception("Command failed for session %s", session.id)
+                send("Sorry, something went wrong.")
+                ended = False
+            finally:
+                session.sink = None
+        if ended:
+            self.sessions.drop(session.id)
+        return ended
+
+    def broadcast(self, obj) -> None:
+        with self._sockets_lock:
+            sockets = list(self._sockets)
+        for ws in sockets:
+            ws.send_json(obj)
+
+    def attach(self, ws: WebSocket) -> None:
+        with self._sockets_lock:
+            self._sockets.add(ws)
+
+    def detach(self, ws: WebSocket) -> None:
+        with self._sockets_lock:
+            self._sockets.discard(ws)
+
+
+def _forte_request_handler():
+    """The request handler class for ForteServer (built on demand, like the import)."""
+    from http.server import BaseHTTPRequestHandler
+    from urllib.parse import parse_qs, urlsplit
+
+    class ForteRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "Forte/1.0"
+        # replies are streamed a line at a time; don't let Nagle hold them back
+        disable_nagle_algorithm = True
+
+        def log_message(self, fmt, *args):
+            logging.getLogger("Forte").debug("serve: " + fmt, *args)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == "/health":
+                self._send_json(200, {"ok": True, "sessions": len(self.server.forte.sessions)})
+            elif url.path == "/metrics":
+                self._send(200, self.server.forte.assistant.stats.to_prometheus(), "text/plain; version=0.0.4")
+            elif url.path == "/stats":
+                self._send(200, self.server.forte.assistant.stats.to_json(), "application/json")
+            elif url.path == "/ws" and self.headers.get("Upgrade", "").lower() == "websocket":
+                self._websocket(parse_qs(url.query).get("session", [None])[0])
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if urlsplit(self.path).path != "/command":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > ForteServer.MAX_BODY:
+                    self._send_json(413, {"error": "request too large"})
+                    return
+                body = json.loads(self.rfile.read(length) or b"{}")
+                text = body.get("text")
+                if not isinstance(text, str) or not text.strip():
+                    raise ValueError("'text' must be a non-empty string")
+                session = self.server.forte.sessions.get(body.get("session") or self.headers.get("X-Forte-Session"))
+            except (ValueError, AttributeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("X-Forte-Session", session.id)
+            self.end_headers()
+            broken = []
+
+            def send(line: str) -> None:
+                if broken:
+                    return
+                try:
+                    self._chunk({"text": line})
+                except OSError:
+                    broken.append(True)
+
+            ended = self.server.forte.handle(session, text.strip(), send)
+            if not broken:
+                try:
+                    self._chunk({"done": True, "session": session.id, "end": ended})
+                    self.wfile.write(b"0\r\n\r\n")
+                except OSError:
+                    self.close_connection = True
+
+        def _chunk(self, obj) -> None:
+            data = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        def _send_json(self, status: int, obj) -> None:
+            self._send(status, json.dumps(obj), "application/json")
+
+        def _send(self, status: int, body: str, content_type: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _websocket(self, session_id: Optional[str]) -> None:
+            forte = self.server.forte
+            key = self.headers.get("Sec-WebSocket-Key")
+            try:
+                if not key:
+                    raise ValueError("missing Sec-WebSocket-Key")
+                session = forte.sessions.get(session_id)
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            self.send_response(101, "Switching Protocols")
+            self.send_header("Upgrade", "websocket")
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Sec-WebSocket-Accept", WebSocket.accept_key(key))
+            self.end_headers()
+            self.close_connection = True
+            ws = WebSocket(self.connection, self.rfile)
+            forte.attach(ws)
+            try:
+                ws.send_json({"session": session.id})
+                while True:
+                    message = ws.receive()
+                    if message is None:
+                        break
+                    try:
+                        text = json.loads(message).get("text", "") if message.startswith("{") else message
+                    except (ValueError, AttributeError):
+                        text = ""
+                    if not isinstance(text, str) or not text.strip():
+                        ws.send_json({"error": "expected a command"})
+                        continue
+                    ended = forte.handle(session, text.strip(), lambda line: ws.send_json({"text": line}))
+                    ws.send_json({"done": True, "session": session.id, "end": ended})
+                    if ended:
+                        ws.close()
+                        break
+            finally:
+                forte.detach(ws)
+
+    return ForteRequestHandler
+
+
+def run_batch(assistant: "SpeechAssistant", lines, out, jobs: int = 1) -> int:
+    """Run text commands with no speech and write one JSON result line per command.
+
+    Each input line is a command, or a JSON object {"text", "session"?, "id"?};
+    blank lines and "#" comments are skipped. Replies are collected as text,
+    so none of the speech pacing applies. Commands without a session share
+    the session "batch" and run in order. With jobs > 1, each of them gets
+    its own session instead, and sessions run in parallel on `jobs` threads
+    (one session's commands still run in order). Results are written in
+    input order. Returns the number of commands that failed.
+    """
+    commands = []  # (line number, id, session id, text or None, parse error)
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if not line.startswith("{"):
+            commands.append((n, None, None, line, None))
+            continue
+        try:
+            data = json.loads(line)
+            text = data.get("text")
+            if not isinstance(text, str) or not text.strip():
+                raise ValueError("'text' must be a non-empty string")
+            session = data.get("session")
+            commands.append((n, data.get("id"), None if session is None else str(session), text.strip(), None))
+        except (ValueError, AttributeError) as e:
+            commands.append((n, None, None, None, str(e)))
+
+    sessions = {}
+    assigned = []  # index -> Session
+    groups: "collections.OrderedDict[str, list]" = collections.OrderedDict()
+    for index, (n, cid, sid, text, error) in enumerate(commands):
+        if sid is None:
+            sid = f"batch-{n}" if jobs > 1 else "batch"
+        if sid not in sessions:
+            sessions[sid] = Session(sid, assistant.history_limit)
+        assigned.append(sessions[sid])
+        groups.setdefault(sid, []).append(index)
+
+    lock = threading.Lock()
+    finished = {}
+    next_out = 0
+    failures = 0
+
+    def run(index: int) -> None:
+        nonlocal next_out, failures
+        n, cid, _, text, error = commands[index]
+        session = assigned[index]
+        result = {"line": n, "session": session.id, "text": text}
+        if cid is not None:
+            result["id"] = cid
+        replies = []
+        start = time.perf_counter()
+        if error is None:
+            session.sink = replies.append
+            try:
+                result["end"] = assistant.run_command(session, text)
+            except Exception as e:
+                assistant.logger.exception("Batch command on line %d failed", n)
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                session.sink = None
+        result["replies"] = replies
+        result["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        if error is not None:
+            result["error"] = error
+        with lock:
+            failures += error is not None
+            finished[index] = result
+            while next_out in finished:
+                out.write(json.dumps(finished.pop(next_out), ensure_ascii=False) + "\n")
+                next_out += 1
+            out.flush()
+
+    if jobs > 1:
+        def run_group(indexes: List[int]) -> None:
+            for index in indexes:
+                run(index)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="forte-batch") as pool:
+            for fut in [pool.submit(run_group, indexes) for indexes in groups.values()]:
+                fut.result()
+    else:
+        for index in range(len(commands)):
+            run(index)
+    return failures
 
 
 def main() -> None:
@@ -1064,14 +4569,96 @@ def main() -> None:
     parser.add_argument("--allow-apps", action="store_true", help="Allow the assistant to open applications (opt-in)")
     parser.add_argument("--allow-volume", action="store_true", help="Allow the assistant to change system volume (opt-in)")
     parser.add_argument("--no-tts", action="store_true", help="Disable text-to-speech output")
+    parser.add_argument("--recognizer", choices=["google", "vosk"], default="google",
+                        help="Speech recognition backend (vosk runs offline and streams)")
+    parser.add_argument("--vosk-model", help="Path to a Vosk model directory for --recognizer vosk")
+    parser.add_argument("--wake-word", metavar="WORD",
+                        help="Only act on speech that starts with WORD (default 'forte' with --wake-samples). "
+                             "Needs --wake-samples unless --recognizer vosk is used")
+    parser.add_argument("--wake-samples", metavar="DIR",
+                        help="Directory of mono WAV recordings of the wake word, used to spot it locally")
+    parser.add_argument("--wake-window", type=float, default=8.0,
+                        help="Seconds after the wake word (or the last command) during which speech is recognized")
+    parser.add_argument("--wake-threshold", type=float,
+                        help="Wake word match threshold (default: derived from the recordings; lower is stricter)")
+    parser.add_argument("--translator", choices=["google", "phrasebook"], default="google",
+                        help="Translation backend (phrasebook is a small offline stand-in)")
+    parser.add_argument("--wiki-index", metavar="PATH",
+                        help="Answer 'search wikipedia' from an offline index built with --build-wiki-index")
+    parser.add_argument("--build-wiki-index", nargs=2, metavar=("EXTRACT", "PATH"),
+                        help="Build an offline Wikipedia index from a dump extract (JSON lines or title<TAB>text) and exit")
+    parser.add_argument("--news-feeds", nargs="+", choices=sorted(NEWS_FEEDS), default=["google"],
+                        help="RSS feeds to read headlines from (fetched in parallel, duplicates dropped)")
+    parser.add_argument("--serve", nargs="?", const="127.0.0.1:8765", metavar="[HOST:]PORT",
+                        help="Serve commands to many clients over HTTP/WebSocket instead of listening locally "
+                             "(default 127.0.0.1:8765)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Run commands from FILE ('-' for stdin; plain lines or JSON lines) without speech, "
+                             "printing one JSON result per command, then exit")
+    parser.add_argument("--batch-output", metavar="FILE", default="-", help="Where --batch writes its results (default stdout)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="With --batch, run commands that don't share a session on this many threads")
+    parser.add_argument("--data-dir", metavar="DIR",
+                        help="Keep notes, reminders and the conversation log in DIR instead of next to main.py")
+    parser.add_argument("--stats-file", metavar="PATH",
+                        help="Periodically write latency stats to PATH (JSON if it ends in .json, else Prometheus text)")
+    parser.add_argument("--stats-interval", type=float, default=15.0, help="Seconds between --stats-file writes")
+    parser.add_argument("--no-speech-cache", action="store_true",
+                        help="Always synthesize speech instead of replaying rendered audio for recurring replies")
+    parser.add_argument("--speech-cache-mb", type=float, default=50.0, help="Size limit of the rendered speech cache")
+    parser.add_argument("--prerender", action="store_true",
+                        help="Render the fixed replies into the speech cache in the background at startup")
+    parser.add_argument("--persist-cache", action="store_true", help="Keep cached network answers on disk across restarts")
     args = parser.parse_args()
+    if args.build_wiki_index:
+        source, path = args.build_wiki_index
+        print(f"Indexed {WikiIndex.build(source, path)} articles into {path}")
+        return
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
-    assistant = SpeechAssistant()
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+    assistant = SpeechAssistant(data_dir=args.data_dir)
     # apply explicit safety opt-ins
     assistant.allow_apps = bool(getattr(args, "allow_apps", False))
     assistant.allow_volume = bool(getattr(args, "allow_volume", False))
     if args.no_tts:
         assistant.enable_tts = False
+    elif not args.no_speech_cache and assistant._player.available:
+        try:
+            assistant.phrase_audio = PhraseAudioCache(os.path.join(assistant.data_dir, "speech_cache"),
+                                                      int(args.speech_cache_mb * 1024 * 1024))
+            if args.prerender:
+                assistant.prerender()
+        except OSError as e:
+            logging.warning("Speech cache unavailable (%s); synthesizing every reply.", e)
+    if args.wiki_index:
+        try:
+            assistant.wiki_index = WikiIndex(args.wiki_index)
+        except Exception as e:
+            logging.error("Could not open the Wikipedia index %s (%s); using the online search.", args.wiki_index, e)
+    assistant.news_sources = args.news_feeds
+    if args.translator != "google":
+        assistant.translator = make_translator_backend(args.translator)
+    if args.persist_cache:
+        assistant.cache.path = os.path.join(assistant.data_dir, "response_cache.json")
+        assistant.cache.load()
+    if args.recognizer != "google":
+        try:
+            assistant.recognizer_backend = make_recognizer_backend(args.recognizer, args.vosk_model)
+        except Exception as e:
+            logging.error("Could not load the %s recognizer (%s); using Google instead.", args.recognizer, e)
+    if args.wake_word or args.wake_samples:
+        assistant.wake_word = (args.wake_word or "forte").lower()
+        assistant.wake_window = args.wake_window
+        if args.wake_samples:
+            try:
+                assistant.wake_detector = WakeWordDetector.from_directory(args.wake_samples, args.wake_threshold)
+            except Exception as e:
+                logging.error("Could not load the wake word recordings (%s); wake word is off.", e)
+                assistant.wake_word = None
+        elif not assistant.recognizer_backend.streaming:
+            logging.error("--wake-word needs --wake-samples unless --recognizer vosk is used; wake word is off.")
+            assistant.wake_word = None
 
     def listen_and_process():
         # Use a queue to accept both microphone and keyboard inputs concurrently.
@@ -1127,18 +4714,76 @@ def main() -> None:
                     assistant.speak("Goodbye!")
                     break
                 text = item
+                # new input barges in on anything still being read out
+                assistant.cancel_speech()
                 should_exit = assistant.process_command(text)
                 if should_exit:
                     running.clear()
                     break
         finally:
             running.clear()
+            # let the goodbye finish before the daemon speech worker is torn down
+            assistant.wait_for_speech(timeout=10)
+            if assistant._mic_session is not None:
+                assistant._mic_session.close()
+            assistant.cache.save()
+            assistant.conversation_log.close()
             try:
                 mic_t.join(timeout=0.5)
                 # keyboard thread may be blocked on input(); we won't force-join it
             except Exception:
                 pass
 
+    if args.stats_file:
+        def dump_stats():
+            while True:
+                time.sleep(max(1.0, args.stats_interval))
+                try:
+                    assistant.stats.dump(args.stats_file)
+                except OSError:
+                    logging.exception("Could not write stats to %s", args.stats_file)
+
+        threading.Thread(target=dump_stats, name="forte-stats", daemon=True).start()
+
+    if args.batch:
+        assistant.enable_tts = False
+        # keep stdout for results: reminders that fire mid-batch only go to the log
+        assistant.reminder_manager.notify = lambda text: logging.info("Fired during batch: %s", text)
+        assistant.load_reminders()
+        src = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")
+        out = sys.stdout if args.batch_output == "-" else open(args.batch_output, "w", encoding="utf-8")
+        try:
+            failures = run_batch(assistant, src, out, jobs=max(1, args.jobs))
+        finally:
+            if src is not sys.stdin:
+                src.close()
+            if out is not sys.stdout:
+                out.close()
+            assistant.cache.save()
+            assistant.conversation_log.close()
+        sys.exit(1 if failures else 0)
+
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        try:
+            server = ForteServer(assistant, host or "127.0.0.1", int(port))
+        except (OSError, ValueError) as e:
+            logging.error("Could not serve on %s (%s)", args.serve, e)
+            sys.exit(1)
+        # after ForteServer has hooked notify, so catch-ups reach WebSocket clients too
+        assistant.load_reminders()
+        print("Forte is serving on http://%s:%d (POST /command, GET /ws)" % server.address)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logging.info("Exiting...")
+        finally:
+            server.shutdown()
+            assistant.cache.save()
+            assistant.conversation_log.close()
+        return
+
+    assistant.load_reminders()
     try:
         # Always run in listening mode by default. Use --no-welcome to silence greeting.
         if not getattr(args, "no_welcome", False):
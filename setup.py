@@ -2,7 +2,14 @@ from cx_Freeze import setup, Executable
 
 executables = [Executable('main.py')]
 
+# main.py imports these lazily (on first use), so cx_Freeze can't find them itself
+build_exe_options = {
+    "packages": ["speech_recognition", "pyttsx3", "requests", "urllib3", "googletrans",
+                 "xml.etree.ElementTree"],
+}
+
 setup(name='Forte',
       version='1.0',
       description='A voice assistant built with Python',
-      executables=executables)
\ No newline at end of file
+      options={"build_exe": build_exe_options},
+      executables=executables)
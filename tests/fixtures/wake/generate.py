@@ -0,0 +1,83 @@
+"""Regenerate the wake word fixtures with the espeak-ng speech synthesizer.
+
+    pip install espeakng-loader
+    python tests/fixtures/wake/generate.py
+
+The clips are synthesized speech, not microphone recordings: one voice
+says "Forte" for enrollment (samples/) and, at other speeds and pitches,
+with and without a command after it (positives/); the same voice and two
+others say look-alike words and ordinary commands (negatives/). Add real
+recordings to these directories to test against your own voice.
+"""
+
+import audioop
+import ctypes
+import os
+import wave
+
+import espeakng_loader
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RATE = 16000
+
+# directory, file name, text, voice, words per minute, pitch (0-100)
+CLIPS = [
+    ("samples", "forte_1", "Forte", "en-us", 160, 50),
+    ("samples", "forte_2", "Forte", "en-us", 145, 45),
+    ("samples", "forte_3", "Forte", "en-us", 175, 55),
+    ("positives", "forte_slow", "Forte", "en-us", 130, 50),
+    ("positives", "forte_fast", "Forte", "en-us", 190, 50),
+    ("positives", "forte_low", "Forte", "en-us", 160, 35),
+    ("positives", "forte_high", "Forte", "en-us", 160, 65),
+    ("positives", "forte_time", "Forte, what time is it?", "en-us", 165, 50),
+    ("positives", "forte_joke", "Forte, tell me a joke.", "en-us", 150, 48),
+    ("negatives", "photo", "Photo", "en-us", 160, 50),
+    ("negatives", "forty", "Forty", "en-us", 160, 50),
+    ("negatives", "fourteen", "Fourteen", "en-us", 160, 50),
+    ("negatives", "for_tea", "For tea", "en-us", 160, 50),
+    ("negatives", "fort", "Fort", "en-us", 160, 50),
+    ("negatives", "coffee", "Coffee", "en-us", 160, 50),
+    ("negatives", "what_time", "What time is it?", "en-us", 165, 50),
+    ("negatives", "weather", "The weather today is sunny and warm.", "en-gb", 170, 40),
+    ("negatives", "hello", "Hello there, how are you?", "en-us+f3", 160, 60),
+    ("negatives", "news", "And now the evening news.", "en-gb-x-rp", 170, 45),
+]
+
+
+def synthesize(lib, text: str, voice: str, rate: int, pitch: int) -> bytes:
+    chunks = []
+
+    @ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+    def collect(wav, count, events):
+        if count > 0:
+            chunks.append(ctypes.string_at(wav, count * 2))
+        return 0
+
+    lib.espeak_SetSynthCallback(collect)
+    lib.espeak_SetVoiceByName(voice.encode())
+    lib.espeak_SetParameter(1, rate, 0)  # espeakRATE
+    lib.espeak_SetParameter(3, pitch, 0)  # espeakPITCH
+    data = text.encode()
+    lib.espeak_Synth(data, len(data) + 1, 0, 0, 0, 0, None, None)
+    lib.espeak_Synchronize()
+    return b"".join(chunks)
+
+
+def main() -> None:
+    lib = ctypes.CDLL(espeakng_loader.get_library_path())
+    data_path = os.path.dirname(espeakng_loader.get_data_path())
+    source_rate = lib.espeak_Initialize(2, 0, data_path.encode(), 0)  # AUDIO_OUTPUT_SYNCHRONOUS
+    silence = b"\0\0" * (RATE // 4)
+    for directory, name, text, voice, rate, pitch in CLIPS:
+        pcm = synthesize(lib, text, voice, rate, pitch)
+        pcm = audioop.ratecv(pcm, 2, 1, source_rate, RATE, None)[0]
+        os.makedirs(os.path.join(HERE, directory), exist_ok=True)
+        with wave.open(os.path.join(HERE, directory, name + ".wav"), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(RATE)
+            w.writeframes(silence + pcm + silence)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_overdue_reminder_stays_out_of_batch_output(tmp_path):
+    with open(tmp_path / "reminders.journal", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "add", "id": 1, "due": time.time() - 60, "message": "stretch",
+                            "kind": "reminder", "interval": None}) + "\n")
+    proc = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--batch", "-", "--no-tts",
+                           "--data-dir", str(tmp_path)],
+                          input="hello\nwhat time is it\n", capture_output=True, text=True, timeout=60)
+    lines = proc.stdout.splitlines()
+    results = [json.loads(line) for line in lines]
+    assert [r["text"] for r in results] == ["hello", "what time is it"]
+    # delivered to the log, or (if the batch ended first) still pending for the next run
+    pending = [rec["message"] for rec in main.ReminderJournal(str(tmp_path / "reminders.journal")).replay()]
+    assert "Fired during batch: Reminder: stretch" in proc.stderr or pending == ["stretch"]
@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_service_ttl(clock):
+    cache = main.ResponseCache(ttls={"weather": 60})
+    calls = []
+    fetch = lambda: calls.append(1) or f"sunny {len(calls)}"
+    assert cache.get_or_fetch("weather", "dover", fetch) == "sunny 1"
+    clock[0] += 59
+    assert cache.get_or_fetch("weather", "dover", fetch) == "sunny 1"
+    clock[0] += 2
+    assert cache.get("weather", "dover") is None
+    assert cache.get_or_fetch("weather", "dover", fetch) == "sunny 2"
+
+
+def test_least_recently_used_goes_first(clock):
+    cache = main.ResponseCache(max_entries=2)
+    cache.put("define", "a", 1)
+    cache.put("define", "b", 2)
+    assert cache.get("define", "a") == 1
+    cache.put("define", "c", 3)
+    assert cache.get("define", "b") is None
+    assert cache.get("define", "a") == 1 and cache.get("define", "c") == 3
+    assert cache.stats()[-1] == "2 of 2 entries cached"
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = main.ResponseCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return "rate"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("currency", "USD:EUR", fetch)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    # let the other threads find the fetch in flight before it finishes
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(2)
+    assert results == ["rate"] * 8
+    assert len(calls) == 1
+    assert cache.misses["currency"] == 1 and cache.hits["currency"] == 7
+
+
+def test_failed_fetch_is_not_cached():
+    cache = main.ResponseCache()
+
+    def fail():
+        raise main.SkillError("offline")
+
+    with pytest.raises(main.SkillError):
+        cache.get_or_fetch("news", "google", fail)
+    assert cache.get("news", "google") is None
+    assert cache.get_or_fetch("news", "google", lambda: ["headline"]) == ["headline"]
+
+
+def test_save_and_load_round_trip(tmp_path, clock):
+    path = str(tmp_path / "response_cache.json")
+    cache = main.ResponseCache(path=path, ttls={"news": 60})
+    cache.put("wikipedia", "ada lovelace", "An English mathematician.")
+    cache.put("news", "google", ["a", "b"])
+    cache.save()
+    clock[0] += 120  # the news entry expires before the restart
+    loaded = main.ResponseCache(path=path)
+    loaded.load()
+    assert loaded.get("wikipedia", "ada lovelace") == "An English mathematician."
+    assert loaded.get("news", "google") is None
@@ -0,0 +1,18 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("expression", ["1e400", "1e400 - 1e400", "2 * 1e309", "9" * 301])
+def test_oversized_literals_are_rejected(expression):
+    with pytest.raises(main.SkillError):
+        main.Calculator().evaluate(expression)
+
+
+def test_large_but_finite_literals_still_work():
+    assert main.Calculator().evaluate("1e300 / 1e299") == pytest.approx(10.0)
+
+
+def test_calculate_answers_infinite_literal(tmp_path):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assert assistant.calculate("calculate 1e400") == "That number is too big for me to work out."
@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+
+import main
+
+
+def read(path):
+    if not os.path.exists(path):
+        return ""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_records_are_written_off_thread_and_flushed_on_close(tmp_path):
+    path = str(tmp_path / "conversation.jsonl")
+    writers = []
+    original = main.ConversationLog._run
+
+    def run(self):
+        writers.append(threading.current_thread().name)
+        original(self)
+
+    main.ConversationLog._run = run
+    try:
+        log = main.ConversationLog(path, flush_every=100, flush_interval=60)
+    finally:
+        main.ConversationLog._run = original
+    log.write("user", "hello")
+    log.write("assistant", "Hi!")
+    assert read(path) == ""  # still buffered
+    log.close()
+    assert writers == ["forte-log"]
+    assert [json.loads(line)["text"] for line in read(path).splitlines()] == ["hello", "Hi!"]
+
+
+def test_tail_returns_the_last_records_of_a_session_in_order(tmp_path):
+    log = main.ConversationLog(str(tmp_path / "conversation.jsonl"))
+    log.TAIL_BLOCK = 64  # make records straddle block boundaries
+    for i in range(40):
+        log.write("user", f"console {i}")
+        log.write("user", f"client {i}", session="client")
+    try:
+        assert [r["text"] for r in log.tail(3)] == ["console 37", "console 38", "console 39"]
+        assert [r["text"] for r in log.tail(2, "client")] == ["client 38", "client 39"]
+        assert len(log.tail(100)) == 40
+        assert log.tail(0) == [] and log.tail(5, "nobody") == []
+    finally:
+        log.close()
+
+
+def test_tail_skips_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "conversation.jsonl")
+    log = main.ConversationLog(path)
+    log.write("user", "complete")
+    log.flush()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"ts": 1, "role": "user", "te')
+    try:
+        assert [r["text"] for r in log.tail(5)] == ["complete"]
+    finally:
+        log.close()
+
+
+def test_history_reads_past_the_ring_buffer_from_the_log(tmp_path):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assistant.enable_tts = False
+    replies = []
+    session = main.Session("client", history_limit=2, sink=replies.append)
+    for text in ("hello", "what is your name"):
+        assistant.run_command(session, text)
+    greeting, name = replies
+    replies.clear()
+    # the ring buffer holds two turns; the rest come from the log
+    assistant.run_command(session, "/history 5")
+    assert replies == ["User: hello", f"Assistant: {greeting}", "User: what is your name", f"Assistant: {name}",
+                       "User: /history 5"]
+    replies.clear()
+    assistant.run_command(session, "/clear")
+    replies.clear()
+    assistant.run_command(session, "/history")
+    # turns from before /clear are not read back from the log
+    assert replies == ["Assistant: Conversation history cleared.", "User: /history"]
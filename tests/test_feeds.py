@@ -0,0 +1,126 @@
+"""FeedReader against RSS/Atom fixtures and a stand-in feed server."""
+
+import http.server
+import io
+import os
+import threading
+
+import pytest
+
+import main
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "feeds")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+class FeedServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = '"v1"'
+        self.last_modified = "Sat, 17 Oct 2026 08:00:00 GMT"
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.conditional = []  # (If-None-Match, If-Modified-Since) of each request
+        super().__init__(("127.0.0.1", 0), FeedHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/rss"
+
+    def handle_error(self, request, client_address):
+        pass  # resets from readers that hung up on a big feed
+
+
+class FeedHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        etag, modified = self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.conditional.append((etag, modified))
+        if etag == server.etag:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(server.body)))
+        self.send_header("ETag", server.etag)
+        self.send_header("Last-Modified", server.last_modified)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(body):
+        servers.append(FeedServer(body))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_parse_rss_skips_untitled_items_and_stops_at_the_limit():
+    items = main.FeedReader.parse(io.BytesIO(fixture("rss.xml")), 4)
+    assert items == [
+        ("Council approves new bridge - Example Times", "https://news.example.com/bridge"),
+        ("Storm expected this weekend", "https://news.example.com/storm"),
+        ("Local team wins final", "https://news.example.com/final"),
+        ("Library extends opening hours", "https://news.example.com/library"),
+    ]
+
+
+def test_parse_atom_uses_the_alternate_link():
+    assert main.FeedReader.parse(io.BytesIO(fixture("atom.xml")), 5) == [
+        ("Release 2.0 is out", "https://blog.example.com/release-2"),
+        ("Notes from the meetup", "https://blog.example.com/meetup"),
+    ]
+
+
+def test_unchanged_feed_is_revalidated_and_served_from_the_last_copy(serve):
+    server = serve(fixture("rss.xml"))
+    reader = main.FeedReader(main.HttpClient())
+    first = reader.headlines(server.url, limit=3)
+    assert [title for title, _ in first] == ["Council approves new bridge - Example Times",
+                                             "Storm expected this weekend", "Local team wins final"]
+    assert reader.headlines(server.url, limit=2) == first[:2]
+    assert reader.not_modified == 1
+    assert server.conditional == [(None, None), ('"v1"', "Sat, 17 Oct 2026 08:00:00 GMT")]
+
+
+def test_stopping_early_keeps_the_connection_for_small_feeds(serve):
+    # ~200 KiB, far more than the first two items
+    filler = b"<item><title>Older story</title><link>https://news.example.com/old</link></item>\n" * 2500
+    server = serve(fixture("rss.xml").replace(b"</channel>", filler + b"</channel>"))
+    reader = main.FeedReader(main.HttpClient())
+    for n in range(3):
+        reader.headlines(f"{server.url}?n={n}", limit=2)  # distinct URLs, so no 304s
+    assert len(server.connections) == 1
+
+
+def test_big_remainder_is_cut_off_not_downloaded(serve):
+    filler = b"<item><title>Older story</title><link>https://news.example.com/old</link></item>\n" * 20000
+    server = serve(fixture("rss.xml").replace(b"</channel>", filler + b"</channel>"))
+    reader = main.FeedReader(main.HttpClient())
+    for n in range(2):
+        assert len(reader.headlines(f"{server.url}?n={n}", limit=2)) == 2
+    assert len(server.connections) == 2
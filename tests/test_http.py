@@ -0,0 +1,114 @@
+"""HttpClient against a stand-in HTTP server on localhost."""
+
+import concurrent.futures
+import http.server
+import statistics
+import threading
+import time
+
+import pytest
+
+import main
+
+
+class StandIn(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = set()
+        self.active = self.peak = 0
+        self.failures = 0  # answer this many requests with 503 first
+        self.delay = 0.0
+        super().__init__(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            fail = server.failures > 0
+            server.failures -= fail
+        time.sleep(server.delay)
+        body = b"busy" if fail else b"ok"
+        self.send_response(503 if fail else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StandIn()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_retries_5xx_with_backoff(server):
+    server.failures = 2
+    client = main.HttpClient(retries=2, backoff=0.01)
+    response = client.get(server.url)
+    assert response.status_code == 200 and response.text == "ok"
+    assert server.requests == 3
+
+
+def test_gives_up_after_retries(server):
+    server.failures = 10
+    client = main.HttpClient(retries=1, backoff=0.01)
+    assert client.get(server.url).status_code == 503
+    assert server.requests == 2
+
+
+def test_sequential_requests_reuse_one_connection(server):
+    client = main.HttpClient()
+    for _ in range(20):
+        assert client.get(server.url).status_code == 200
+    assert len(server.connections) == 1
+
+
+def test_pool_size_caps_connections_per_host(server):
+    server.delay = 0.05
+    client = main.HttpClient(pool_size=2)
+    with concurrent.futures.ThreadPoolExecutor(8) as pool:
+        codes = list(pool.map(lambda _: client.get(server.url).status_code, range(8)))
+    assert codes == [200] * 8
+    assert server.peak <= 2
+    assert len(server.connections) <= 2
+
+
+def test_connection_reuse_saves_time(server):
+    # Compare medians of per-request times so a scheduler hiccup on a busy box
+    # doesn't decide the result.
+    def timed(get):
+        times = []
+        for _ in range(50):
+            start = time.perf_counter()
+            get()
+            times.append(time.perf_counter() - start)
+        return statistics.median(times)
+
+    pooled = main.HttpClient()
+    pooled.get(server.url)
+    reused = timed(lambda: pooled.get(server.url))
+    fresh = timed(lambda: main.requests.get(server.url, headers={"Connection": "close"}))
+    print(f"median GET: {reused * 1000:.2f} ms reusing a connection, {fresh * 1000:.2f} ms with a new one each")
+    assert reused < fresh
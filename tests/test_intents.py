@@ -0,0 +1,96 @@
+import pytest
+
+import main
+
+ROUTER = main.IntentRouter(main.INTENTS)
+
+# utterance, intent, (slot regex the handler uses, the groups it should pull out)
+CASES = [
+    ("help", "help", None),
+    ("say that again", "repeat", None),
+    ("joke", "joke_exact", None),
+    ("take note buy milk", "take_note", (main._NOTE_RE, ("buy milk",))),
+    ("note: call mom", "take_note", (main._NOTE_RE, ("call mom",))),
+    ("delete note 3", "delete_note", (main._DELETE_NOTE_RE, ("3",))),
+    ("define serendipity", "define", (main._DEFINE_RE, ("serendipity",))),
+    ("translate good night; yes to es and de", "translate", (main._TRANSLATE_RE, ("good night; yes", "es and de"))),
+    ("convert 10 usd to eur", "convert", (main._CURRENCY_RE, ("10", "usd", "eur"))),
+    ("what's 2.5 gbp to usd", "convert_amount", (main._CURRENCY_RE, ("2.5", "gbp", "usd"))),
+    ("set timer 5 minutes", "set_timer", (main._TIMER_RE, ("5", "minute"))),
+    ("set a timer for 30 seconds", "timer_for", (main._TIMER_RE, ("30", "second"))),
+    ("remind me in 10 minutes to stretch", "remind", (main._REMIND_RE, ("10", "stretch"))),
+    ("remind me every 30 minutes to drink water", "remind", (main._REMIND_EVERY_RE, ("30", "drink water"))),
+    ("good morning", "briefing", None),
+    ("cancel the reminder number 2", "cancel", (main._CANCEL_RE, ("reminder", "2"))),
+    ("cancel timer", "cancel", (main._CANCEL_RE, ("timer", None))),
+    ("snooze 10 minutes", "snooze", (main._SNOOZE_RE, ("10",))),
+    ("list reminders", "list_reminders", None),
+    ("search my notes for milk", "search_notes", (main._SEARCH_NOTES_RE, ("milk",))),
+    ("list notes", "list_notes", None),
+    ("search wikipedia ada lovelace", "search_wikipedia", None),
+    ("calculate 2 + 2", "calculate", None),
+    ("traffic from dover to newark", "traffic", (main._TRAFFIC_RE, ("dover", "newark"))),
+    ("tell me a dad joke", "joke", (main._JOKE_KIND_RE, ("dad",))),
+    ("tell me a joke about cats", "joke", (main._JOKE_ABOUT_RE, ("cats",))),
+    ("another joke", "another_joke", None),
+    ("tell me a fact", "fact", None),
+    ("goodbye", "goodbye", None),
+    ("how are you", "how_are_you", None),
+    ("who are you", "name", None),
+    ("thanks", "thanks", None),
+    ("67", "six_seven", None),
+    ("want to be friends", "friend", None),
+    ("who created you", "created", None),
+    ("who made you", "made", None),
+    ("what can you do", "abilities", None),
+    ("what are asteroids", "asteroid", None),
+    ("what is mercury", "mercury", None),
+    ("what is venus", "venus", None),
+    ("what is mars", "mars", None),
+    ("what is jupiter", "jupiter", None),
+    ("what is saturn", "saturn", None),
+    ("what is uranus", "uranus", None),
+    ("when is christmas", "christmas", None),
+    ("when is valentines day", "valentines", None),
+    ("when is halloween", "halloween", None),
+    ("meow", "meow", None),
+    ("what's the weather in dover", "weather", (main._WEATHER_RE, ("dover",))),
+    ("latest headlines", "news", None),
+    ("what time is it", "time", None),
+    ("hi there", "greeting", None),
+]
+
+# words that contain a keyword, or keywords in the wrong place
+NEAR_MISSES = [
+    "this is great", "sometimes i wonder", "the weatherman", "hithere", "shipment", "helpful", "help me",
+    "i want a joke", "say that again please", "remember me", "a timer", "timeline", "newsletter",
+    "thanksgiving", "notes", "good evening",
+]
+
+
+def test_every_intent_has_a_case():
+    assert {name for _, name, _ in CASES} == {intent.name for intent in main.INTENTS}
+
+
+@pytest.mark.parametrize("utterance, name, slots", CASES)
+def test_routes_to_intent_and_slots(utterance, name, slots):
+    intent = ROUTER.route(utterance)
+    assert intent is not None and intent.name == name
+    if slots is not None:
+        pattern, groups = slots
+        assert pattern.search(utterance).groups() == groups
+
+
+@pytest.mark.parametrize("utterance", NEAR_MISSES)
+def test_near_misses_route_nowhere(utterance):
+    assert ROUTER.route(utterance) is None
+
+
+def test_priority_breaks_overlaps():
+    # "time" is in both; the timer wins on priority
+    assert ROUTER.route("set a timer for 5 minutes to check the time").name == "timer_for"
+    # the currency trigger outranks the plain keyword
+    assert ROUTER.route("weather or not, 5 usd to eur").name == "convert_amount"
+    # ties go to the intent listed first
+    router = main.IntentRouter([main.Intent("a", ["ping"]), main.Intent("b", ["ping"])])
+    assert router.route("ping").name == "a"
@@ -0,0 +1,80 @@
+import json
+import random
+
+import pytest
+
+import main
+
+
+def bucket_of(seconds):
+    stats = main.LatencyStats()
+    stats.record("x", seconds)
+    return stats._series[("x", "")][0].index(1)
+
+
+def test_bucket_boundaries():
+    base, growth = main.LatencyStats.BASE, main.LatencyStats.GROWTH
+    assert bucket_of(0.0) == bucket_of(base) == 0
+    assert bucket_of(base * 1.001) == 1
+    for k in (1, 10, 40):
+        edge = base * growth ** k
+        # bucket k holds (base * growth ** (k - 1), base * growth ** k]
+        assert bucket_of(edge * 0.999) == k
+        assert bucket_of(edge * 1.001) == k + 1
+    assert bucket_of(10 ** 6) == main.LatencyStats.BUCKETS - 1
+
+
+@pytest.mark.parametrize("samples", [
+    [i / 1000 for i in range(1, 1001)],  # uniform 1 ms .. 1 s
+    [random.Random(7).lognormvariate(-4, 1) for _ in range(5000)],  # long tail around 18 ms
+])
+def test_percentiles_are_within_ten_percent(samples):
+    stats = main.LatencyStats()
+    for s in samples:
+        stats.record("handler", s, "weather")
+    (row,) = stats.snapshot()
+    ordered = sorted(samples)
+    for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        exact = ordered[int(q * len(ordered)) - 1]
+        assert row[name] == pytest.approx(exact, rel=0.1), name
+    assert row["count"] == len(samples) and row["max"] == max(samples)
+    assert row["sum"] == pytest.approx(sum(samples))
+
+
+def test_percentiles_stay_inside_the_sample_bucket_and_under_the_max():
+    stats = main.LatencyStats()
+    stats.record("route", 0.0031)
+    (row,) = stats.snapshot()
+    for name in ("p50", "p95", "p99"):
+        assert 0.0031 / main.LatencyStats.GROWTH < row[name] <= 0.0031
+
+
+def test_prometheus_output():
+    stats = main.LatencyStats()
+    stats.record("handler", 0.25, 'say "hi"')
+    stats.record("route", 0.001)
+    lines = stats.to_prometheus().splitlines()
+    assert lines[:2] == ["# HELP forte_stage_seconds Time spent in each stage of a Forte turn.",
+                         "# TYPE forte_stage_seconds summary"]
+    quantiles = [line.rpartition(" ") for line in lines if line.startswith("forte_stage_seconds{")]
+    assert [name for name, _, _ in quantiles] == [
+        'forte_stage_seconds{stage="handler",intent="say \\"hi\\"",quantile="%s"}' % q for q in ("0.5", "0.95", "0.99")
+    ] + ['forte_stage_seconds{stage="route",quantile="%s"}' % q for q in ("0.5", "0.95", "0.99")]
+    assert all(0 < float(value) <= 0.25 for _, _, value in quantiles)
+    assert 'forte_stage_seconds_sum{stage="route"} 0.001' in lines
+    assert 'forte_stage_seconds_count{stage="route"} 1' in lines
+    assert len(lines) == 2 + 2 * 5
+
+
+def test_json_output():
+    stats = main.LatencyStats()
+    stats.record("speech", 1.5)
+    stats.record("speech", 0.5)
+    data = json.loads(stats.to_json())
+    assert set(data) == {"time", "series"}
+    (row,) = data["series"]
+    assert row["stage"] == "speech" and row["label"] == "" and row["count"] == 2
+    assert row["sum"] == 2.0 and row["max"] == 1.5
+    assert set(row) == {"stage", "label", "count", "sum", "max", "p50", "p95", "p99"}
+    assert stats.lines() == [f"speech: p50 {row['p50'] * 1000:.2f} ms, p95 {row['p95']:.2f} s, "
+                             f"p99 {row['p99']:.2f} s, 2 samples"]
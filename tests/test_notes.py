@@ -0,0 +1,25 @@
+import contextlib
+import io
+
+import main
+
+
+def make_assistant(tmp_path):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assistant.enable_tts = False
+    return assistant
+
+
+def test_delete_note_with_oversized_id(tmp_path):
+    assistant = make_assistant(tmp_path)
+    note_id = assistant.notes.add("buy milk")
+    assert assistant.notes.delete(99999999999999999999999) is False
+    assert assistant.delete_note("99999999999999999999999") == "Note not found."
+    assert assistant.notes.list() == [(note_id, "buy milk")]
+
+
+def test_delete_note_command_with_oversized_id_does_not_raise(tmp_path):
+    assistant = make_assistant(tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assistant.process_command("delete note 99999999999999999999999")
+    assert assistant.notes.count() == 0
@@ -0,0 +1,108 @@
+import os
+import time
+
+import pytest
+
+import main
+
+
+class FakeEngine:
+    def __init__(self):
+        self.props = {"voice": "en-1", "rate": 180, "volume": 1.0}
+        self.said = []
+
+    def getProperty(self, name):
+        return self.props[name]
+
+    def say(self, text):
+        self.said.append(text)
+
+    def save_to_file(self, text, path):
+        with open(path, "wb") as f:
+            f.write(b"RIFF" + text.encode("utf-8") * 20)
+
+    def runAndWait(self):
+        pass
+
+
+class FakePlayer:
+    available = True
+
+    def __init__(self):
+        self.played = []
+
+    def play(self, path):
+        self.played.append(path)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def assistant(tmp_path):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assistant._tts_ready.wait(10)
+    assistant.engine = FakeEngine()
+    assistant._sapi_voice = None
+    assistant._tts_available = True
+    assistant._player = FakePlayer()
+    assistant.phrase_audio = main.PhraseAudioCache(str(tmp_path / "speech_cache"))
+    return assistant
+
+
+def render(size):
+    def write(path):
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+    return write
+
+
+def test_voice_or_rate_change_gives_a_new_key(assistant):
+    before = assistant._voice_key()
+    assistant.engine.props["rate"] = 220
+    faster = assistant._voice_key()
+    assistant.engine.props["voice"] = "en-2"
+    other = assistant._voice_key()
+    assert len({before, faster, other}) == 3
+    keys = {main.PhraseAudioCache.key("Goodbye!", voice) for voice in (before, faster, other)}
+    assert len(keys) == 3
+    cache = assistant.phrase_audio
+    assert cache.add("Goodbye!", before, render(100))
+    assert cache.get("Goodbye!", before) is not None
+    assert cache.get("Goodbye!", faster) is None
+
+
+def test_repeated_phrase_is_rendered_then_played_from_the_cache(assistant):
+    engine, player, cache = assistant.engine, assistant._player, assistant.phrase_audio
+    assistant._say("Goodbye!")
+    assistant._say("Goodbye!")  # heard twice: queued for rendering
+    assert engine.said == ["Goodbye!", "Goodbye!"]
+    assistant._render_next()  # the speech worker may beat us to it
+    assert wait_for(lambda: ("Goodbye!", assistant._voice_key()) in cache)
+    assistant._say("Goodbye!")
+    assert engine.said == ["Goodbye!", "Goodbye!"]
+    assert player.played == [cache.path(cache.key("Goodbye!", assistant._voice_key()))]
+    assert cache.hits == 1
+
+
+def test_size_cap_evicts_the_least_recently_played(tmp_path):
+    cache = main.PhraseAudioCache(str(tmp_path), max_bytes=250)
+    for text in ("one", "two"):
+        assert cache.add(text, "v", render(100))
+    assert cache.get("one", "v") is not None  # "two" is now the oldest
+    assert cache.add("three", "v", render(100))
+    assert cache.get("two", "v") is None
+    assert cache.get("one", "v") and cache.get("three", "v")
+    assert sum(os.path.getsize(os.path.join(tmp_path, n)) for n in os.listdir(tmp_path)) <= 250
+    assert not cache.add("empty", "v", render(44))  # a bare WAV header isn't kept
+
+    # a smaller cap on restart evicts by last use, kept in the file times
+    old = cache.path(cache.key("one", "v"))
+    os.utime(old, (time.time() - 60, time.time() - 60))
+    smaller = main.PhraseAudioCache(str(tmp_path), max_bytes=150)
+    assert ("three", "v") in smaller and ("one", "v") not in smaller
+    assert not os.path.exists(old)
@@ -0,0 +1,55 @@
+import json
+import sys
+import types
+
+import pytest
+
+import main
+
+
+class FakeKaldiRecognizer:
+    """Finalizes a segment on every frame that is b"|" (a Vosk endpoint)."""
+
+    def __init__(self, model, sample_rate):
+        self.words = []
+
+    def AcceptWaveform(self, frame):
+        if frame == b"|":
+            return True
+        self.words.append(frame.decode())
+        return False
+
+    def Result(self):
+        text, self.words = " ".join(self.words), []
+        return json.dumps({"text": text})
+
+    def PartialResult(self):
+        return json.dumps({"partial": " ".join(self.words)})
+
+    def FinalResult(self):
+        return self.Result()
+
+
+@pytest.fixture
+def vosk_backend(monkeypatch):
+    fake = types.SimpleNamespace(SetLogLevel=lambda level: None, Model=lambda path: object(),
+                                 KaldiRecognizer=FakeKaldiRecognizer)
+    monkeypatch.setitem(sys.modules, "vosk", fake)
+    return main.VoskBackend("model")
+
+
+def test_vosk_keeps_segments_finalized_mid_utterance(vosk_backend):
+    vosk_backend.start_utterance(16000)
+    partials = [vosk_backend.accept_frame(f) for f in (b"what", b"time", b"|", b"is", b"it")]
+    assert partials[-1] == "what time is it"
+    assert vosk_backend.finish_utterance() == "what time is it"
+
+
+def test_vosk_utterance_ending_on_an_endpoint(vosk_backend):
+    vosk_backend.start_utterance(16000)
+    for frame in (b"hello", b"|"):
+        vosk_backend.accept_frame(frame)
+    assert vosk_backend.finish_utterance() == "hello"
+    vosk_backend.start_utterance(16000)
+    with pytest.raises(main.sr.UnknownValueError):
+        vosk_backend.finish_utterance()
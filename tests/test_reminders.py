@@ -0,0 +1,117 @@
+import json
+import time
+
+import main
+
+
+def make_manager():
+    return main.ReminderManager(notify=lambda text: None)
+
+
+def test_cancel_by_position_and_newest():
+    manager = make_manager()
+    late = manager.add_reminder(30, "late")
+    early = manager.add_reminder(10, "early")
+    middle = manager.add_reminder(20, "middle")
+    manager.add_timer(60, "tea")
+    assert [it.message for it in manager.pending("reminder")] == ["early", "middle", "late"]
+    assert manager.cancel("reminder", 2) is middle
+    assert manager.cancel("reminder", 5) is None
+    assert manager.cancel("reminder") is early  # newest by creation
+    assert manager.pending("reminder") == [late]
+    assert manager.count("timer") == 1 and manager.count() == 2
+
+
+def test_index_follows_fired_and_snoozed_items():
+    fired = []
+    manager = main.ReminderManager(notify=fired.append)
+    manager.add_timer(0.05, "eggs")
+    recurring = manager.add_reminder_at(time.time() + 0.05, "water", every=1)
+    deadline = time.time() + 2
+    while len(fired) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert sorted(fired) == ["Reminder: water", "Timer: eggs"]
+    assert manager.count("timer") == 0
+    assert manager.pending("reminder") == [recurring] and recurring.due > time.time()
+    manager.last_fired = recurring
+    manager.snooze(1)
+    assert manager.count("reminder") == 1
+    assert manager.cancel("reminder", 1) is recurring
+    assert manager.count() == 0
+
+
+def test_set_timer_respects_limit(tmp_path):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assistant.enable_tts = False
+    assistant.speak = lambda text, *args: None
+    assistant.max_timers = 2
+    assert assistant.set_timer(60) and assistant.set_timer(60)
+    assert not assistant.set_timer(60)
+
+
+def journal_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_replay_skips_torn_last_line(tmp_path):
+    path = str(tmp_path / "reminders.journal")
+    journal = main.ReminderJournal(path)
+    journal.add(main.ScheduledItem(1, time.time() + 60, "water"))
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "id": 2, "due": 1')
+    records = main.ReminderJournal(path).replay()
+    assert [rec["message"] for rec in records] == ["water"]
+
+
+def test_cancel_record_suppresses_its_add(tmp_path):
+    path = str(tmp_path / "reminders.journal")
+    manager = main.ReminderManager(notify=lambda text: None, journal=main.ReminderJournal(path))
+    manager.add_reminder(10, "keep")
+    manager.add_reminder(20, "drop")
+    assert manager.cancel("reminder", 2).message == "drop"
+    assert [rec["message"] for rec in main.ReminderJournal(path).replay()] == ["keep"]
+
+
+def test_journal_is_compacted_to_live_items(tmp_path):
+    path = str(tmp_path / "reminders.journal")
+    manager = main.ReminderManager(notify=lambda text: None, journal=main.ReminderJournal(path))
+    manager.add_reminder(10, "keep")
+    for _ in range(100):
+        manager.add_timer(60, "churn")
+        manager.cancel("timer")
+    # 201 records would be written without compaction
+    assert len(journal_lines(path)) < 100
+    assert [rec["message"] for rec in main.ReminderJournal(path).replay()] == ["keep"]
+
+
+def test_restore_fires_overdue_items_and_rewrites_the_journal(tmp_path):
+    path = str(tmp_path / "reminders.journal")
+    now = time.time()
+    journal = main.ReminderJournal(path)
+    journal.add(main.ScheduledItem(7, now - 60, "stretch"))
+    journal.add(main.ScheduledItem(8, now - 90, "water", interval=3600))
+    journal.add(main.ScheduledItem(9, now + 600, "later"))
+    journal.close()
+
+    fired = []
+    manager = main.ReminderManager(notify=fired.append, journal=main.ReminderJournal(path))
+    assert manager.restore() == 3
+    assert wait_for(lambda: len(fired) == 2)
+    assert sorted(fired) == ["Reminder: stretch", "Reminder: water"]
+    # the fire records use the ids the compacted journal was written under
+    assert wait_for(lambda: all(rec["due"] > now for rec in main.ReminderJournal(path).replay()))
+    live = {rec["id"]: rec for rec in main.ReminderJournal(path).replay()}
+    pending = {it.id: it for it in manager.pending()}
+    assert sorted(live) == sorted(pending)
+    assert sorted(rec["message"] for rec in live.values()) == ["later", "water"]
+    water = next(rec for rec in live.values() if rec["message"] == "water")
+    assert water["due"] > now
@@ -0,0 +1,117 @@
+"""ForteServer over real sockets on localhost."""
+
+import base64
+import http.client
+import json
+import os
+import socket
+import struct
+import threading
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def server(tmp_path):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assistant.enable_tts = False
+    server = main.ForteServer(assistant, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def post(server, text, session=None):
+    conn = http.client.HTTPConnection(*server.address, timeout=10)
+    body = {"text": text}
+    if session is not None:
+        body["session"] = session
+    conn.request("POST", "/command", json.dumps(body), {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    lines = [json.loads(line) for line in response.read().decode("utf-8").splitlines()]
+    conn.close()
+    return response, lines
+
+
+def texts(lines):
+    return [line["text"] for line in lines if "text" in line]
+
+
+def test_command_reply_is_streamed_and_ends_with_done(server):
+    response, lines = post(server, "hello", session="kitchen")
+    assert response.status == 200
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert response.getheader("X-Forte-Session") == "kitchen"
+    assert len(texts(lines)) >= 1
+    assert lines[-1] == {"done": True, "session": "kitchen", "end": False}
+    assert all("text" in line for line in lines[:-1])
+
+
+def test_sessions_keep_separate_histories(server):
+    post(server, "hello", session="a")
+    post(server, "what is your name", session="b")
+    _, history_a = post(server, "/history", session="a")
+    _, history_b = post(server, "/history", session="b")
+    assert "User: hello" in texts(history_a) and "User: what is your name" not in texts(history_a)
+    assert "User: what is your name" in texts(history_b) and "User: hello" not in texts(history_b)
+    assert "User: hello" not in server.assistant.recent_history(10)  # nor in the console's
+
+
+def test_console_only_commands_are_refused_to_clients(server, tmp_path):
+    target = tmp_path / "exported.txt"
+    _, lines = post(server, f"/export {target}", session="a")
+    assert texts(lines) == ["/export is only available on the console."]
+    assert not target.exists()
+
+
+def test_bad_request_gets_400(server):
+    conn = http.client.HTTPConnection(*server.address, timeout=10)
+    conn.request("POST", "/command", json.dumps({"text": "  "}))
+    assert conn.getresponse().status == 400
+    conn.close()
+
+
+def read_frame(sock_file):
+    head = sock_file.read(2)
+    assert head[1] & 0x80 == 0  # server frames are not masked
+    n = head[1] & 0x7F
+    if n == 126:
+        n = struct.unpack("!H", sock_file.read(2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", sock_file.read(8))[0]
+    return head[0] & 0x0F, sock_file.read(n)
+
+
+def masked_text_frame(text):
+    payload = text.encode("utf-8")
+    mask = os.urandom(4)
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return struct.pack("!BB", 0x81, 0x80 | len(payload)) + mask + masked
+
+
+def test_websocket_handshake_and_masked_text_frame(server):
+    key = base64.b64encode(os.urandom(16)).decode()
+    sock = socket.create_connection(server.address, timeout=10)
+    sock.sendall((f"GET /ws?session=hall HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                  f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    f = sock.makefile("rb")
+    status = f.readline()
+    headers = {}
+    for line in iter(f.readline, b"\r\n"):
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+    assert status.split()[1] == b"101"
+    assert headers["sec-websocket-accept"] == main.WebSocket.accept_key(key)
+    assert read_frame(f) == (0x1, b'{"session": "hall"}')
+
+    sock.sendall(masked_text_frame("what is your name"))
+    messages = []
+    while not messages or "done" not in messages[-1]:
+        opcode, payload = read_frame(f)
+        assert opcode == 0x1
+        messages.append(json.loads(payload))
+    assert texts(messages) == ["I am Forte"]
+    assert messages[-1] == {"done": True, "session": "hall", "end": False}
+    sock.close()
@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def assistant(tmp_path):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assistant.enable_tts = False
+    spoken = assistant.spoken = []
+    assistant.speak = lambda text, *args: spoken.append(text)
+    return assistant
+
+
+def fail_with(message):
+    def fetch(*args, **kwargs):
+        raise main.SkillError(message)
+    return fetch
+
+
+def test_wikipedia_disambiguation_is_spoken(assistant):
+    prompt = "Mercury could mean Mercury (planet), Mercury (element). Which one?"
+    assistant._wikipedia_summary = fail_with(prompt)
+    assert assistant.search_wikipedia("mercury") == prompt
+    assert assistant.spoken == [prompt]
+
+
+def test_weather_skill_error_is_spoken(assistant):
+    assistant._weather_report = fail_with("I don't have a forecast for next year.")
+    assistant.get_weather(lat=40.7, lon=-74.0, when="next year")
+    assert assistant.spoken == ["I don't have a forecast for next year."]
+
+
+def test_news_currency_and_define_skill_errors_are_spoken(assistant):
+    assistant._news_headlines = fail_with("No headlines right now.")
+    assistant.get_latest_news()
+    assistant.cache.get_or_fetch = fail_with("Unknown currency.")
+    assistant.convert_currency(5, "usd", "xyz")
+    assistant.define_word("blorp")
+    assert assistant.spoken == ["No headlines right now.", "Unknown currency.", "Unknown currency."]
+
+
+def test_briefing_deadline_skips_a_hung_section(assistant):
+    hang = threading.Event()
+    assistant._weather_report = lambda *args: hang.wait(10) and "Sunny."
+    assistant._news_headlines = lambda *args: [("Bridge approved", None), ("Storm coming", None)]
+    assistant._currency_rate = lambda frm, to: {"EUR": 0.9, "GBP": 0.8}[to]
+    assistant.reminder_manager.add_reminder(30, "stretch")
+    start = time.perf_counter()
+    try:
+        spoken = assistant.briefing(deadline=0.3)
+    finally:
+        hang.set()
+    assert time.perf_counter() - start < 2
+    reminders = [line for line in spoken if line.startswith("Reminders: ")]
+    assert len(reminders) == 1 and reminders[0].endswith(": stretch")
+    assert sorted(set(spoken) - set(reminders)) == ["1 USD = 0.80 GBP", "1 USD = 0.90 EUR",
+                                                    "Top headlines: Bridge approved; Storm coming"]
+    assert assistant.spoken[-1] == "Sorry, the weather took too long."
@@ -0,0 +1,50 @@
+import pytest
+
+from main import speech_chunks
+
+LONG = ("Mercury is the first planet from the Sun and the smallest in the Solar System. "
+        "It has no moons. "
+        "Its orbit takes 88 days, the shortest of all the planets, and it is named after the Roman god Mercurius, "
+        "the god of commerce and communication, and the messenger of the gods. "
+        "It is visible from Earth with the naked eye.")
+
+
+@pytest.mark.parametrize("text", ["", "   ", "\n"])
+def test_blank_text_gives_no_chunks(text):
+    assert speech_chunks(text) == []
+
+
+def test_short_reply_stays_whole():
+    assert speech_chunks("  The time is 4:01 PM.  ") == ["The time is 4:01 PM."]
+
+
+def test_splits_at_sentences_and_joins_short_ones():
+    chunks = speech_chunks(LONG, max_chars=120)
+    assert " ".join(chunks) == LONG
+    assert chunks[0] == "Mercury is the first planet from the Sun and the smallest in the Solar System."
+    # "It has no moons." is too short to stand alone
+    assert chunks[1].startswith("It has no moons. Its orbit takes 88 days,")
+
+
+def test_long_sentence_is_split_at_clauses():
+    chunks = speech_chunks(LONG, max_chars=120)
+    assert all(len(c) <= 120 + 24 for c in chunks)
+    assert chunks[2] == "the god of commerce and communication, and the messenger of the gods."
+    assert chunks[-1] == "It is visible from Earth with the naked eye."
+
+
+def test_long_run_without_punctuation_is_split_between_words():
+    words = " ".join(f"word{i}" for i in range(200))
+    chunks = speech_chunks(words, max_chars=100)
+    assert len(chunks) > 10
+    assert all(len(c) <= 100 for c in chunks)
+    assert " ".join(chunks) == words
+
+
+def test_abbreviations_do_not_end_a_chunk():
+    text = ("The museum tour on Saturday morning will be led by Dr. Ada Byron, who curated the exhibition. "
+            "Please meet Mrs. Jones at the front desk on St. James Street before ten o'clock in the morning.")
+    assert speech_chunks(text, max_chars=120) == [
+        "The museum tour on Saturday morning will be led by Dr. Ada Byron, who curated the exhibition.",
+        "Please meet Mrs. Jones at the front desk on St. James Street before ten o'clock in the morning.",
+    ]
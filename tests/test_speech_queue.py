@@ -0,0 +1,108 @@
+"""The speech worker's queue, against a fake pyttsx3 engine."""
+
+import threading
+import time
+
+import pytest
+
+import main
+
+
+class FakeEngine:
+    """Says each utterance a word at a time, firing "started-word" like pyttsx3."""
+
+    def __init__(self):
+        self.callbacks = []
+        self.queued = []
+        self.said = []
+        self.stopped_from = []
+        self.hold = threading.Event()  # utterances starting with "hold" wait for this
+        self._stop = False
+
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return []
+
+    def connect(self, topic, callback):
+        if topic == "started-word":
+            self.callbacks.append(callback)
+
+    def say(self, text):
+        self.queued.append(text)
+
+    def runAndWait(self):
+        text, self.queued = " ".join(self.queued), []
+        self._stop = False
+        spoken = []
+        for word in text.split():
+            for callback in self.callbacks:
+                callback("utterance", 0, len(word))
+            if self._stop:
+                break
+            spoken.append(word)
+            if word == "hold":
+                self.hold.wait(5)
+        self.said.append(" ".join(spoken))
+
+    def stop(self):
+        self.stopped_from.append(threading.current_thread().name)
+        self._stop = True
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def assistant(tmp_path, monkeypatch):
+    engine = FakeEngine()
+    monkeypatch.setattr(main, "pyttsx3", type("pyttsx3", (), {"init": staticmethod(lambda: engine)}))
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assert assistant._tts_ready.wait(5) and assistant.engine is engine
+    assistant.response_delay = assistant.speech_gap = 0
+    assistant._player = type("NoPlayer", (), {"available": False, "stop": lambda self: None})()
+    yield assistant
+    engine.hold.set()
+
+
+def test_urgent_speech_jumps_the_queue(assistant):
+    engine = assistant.engine
+    assistant.speak("hold on")
+    assert wait_for(lambda: assistant._speaking.is_set())
+    assistant.speak("first answer")
+    assistant.speak("second answer")
+    assistant.speak("Timer: tea", priority=main.SPEECH_PRIORITY_URGENT)
+    engine.hold.set()
+    assert assistant.wait_for_speech(5)
+    assert engine.said == ["hold on", "Timer: tea", "first answer", "second answer"]
+
+
+def test_barge_in_stops_the_engine_on_the_worker_and_drops_the_queue(assistant):
+    engine = assistant.engine
+    assistant.speak("hold this long reply please")
+    assert wait_for(lambda: assistant._speech_current_priority == main.SPEECH_PRIORITY_NORMAL)
+    assistant.speak("queued reply")
+    assistant.speak("Reminder: stretch", priority=main.SPEECH_PRIORITY_URGENT)
+    assistant.cancel_speech()
+    assert engine.stopped_from == []  # not from this thread
+    engine.hold.set()
+    assistant.speak("new answer")
+    assert assistant.wait_for_speech(5)
+    assert engine.said == ["hold", "Reminder: stretch", "new answer"]
+    assert engine.stopped_from == ["forte-speech"]
+
+
+def test_barge_in_leaves_urgent_speech_alone(assistant):
+    engine = assistant.engine
+    assistant.speak("Timer: hold the eggs", priority=main.SPEECH_PRIORITY_URGENT)
+    assert wait_for(lambda: assistant._speech_current_priority == main.SPEECH_PRIORITY_URGENT)
+    assistant.cancel_speech()
+    engine.hold.set()
+    assert assistant.wait_for_speech(5)
+    assert engine.said == ["Timer: hold the eggs"]
+    assert engine.stopped_from == []
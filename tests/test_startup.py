@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# about 0.17 s here; eager imports of these dependencies roughly double it
+FIRST_PROMPT_BUDGET = 0.6
+LAZY = ["requests", "speech_recognition", "pyttsx3", "googletrans", "vosk", "http.server"]
+
+
+def time_to_prompt() -> float:
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py"), "--no-tts",
+                             "--data-dir", tempfile.mkdtemp(prefix="forte-test-")],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        for line in proc.stdout:
+            if "Hello!" in line:
+                return time.perf_counter() - start
+        raise AssertionError("main.py never showed its prompt")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_import_leaves_heavy_dependencies_unloaded():
+    code = f"import sys, main; print(' '.join(m for m in {LAZY!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert proc.stdout.split() == []
+
+
+def test_time_to_first_prompt_within_budget():
+    # best of three, so one slow launch on a busy machine doesn't fail the run
+    best = min(time_to_prompt() for _ in range(3))
+    print(f"python main.py to first prompt: {best * 1000:.0f} ms")
+    assert best < FIRST_PROMPT_BUDGET
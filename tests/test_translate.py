@@ -0,0 +1,64 @@
+import pytest
+
+import main
+
+
+class CountingPhrasebook(main.PhrasebookTranslateBackend):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def translate(self, phrases, dest):
+        self.calls.append((list(phrases), dest))
+        return super().translate(phrases, dest)
+
+
+@pytest.fixture
+def assistant(tmp_path):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assistant.enable_tts = False
+    assistant.spoken = []
+    assistant.speak = lambda text, *args: assistant.spoken.append(text)
+    assistant.translator = CountingPhrasebook()
+    return assistant
+
+
+def test_one_backend_call_per_language_in_order(assistant):
+    reply = assistant.translate_batch(["hello", "thank you", "Forte"], ["es", "fr"])
+    assert reply.splitlines() == [
+        "Translation (en -> es): hola",
+        "Translation (en -> es): gracias",
+        "Translation (en -> es): Forte",
+        "Translation (en -> fr): bonjour",
+        "Translation (en -> fr): merci",
+        "Translation (en -> fr): Forte",
+    ]
+    assert assistant.spoken == reply.splitlines()
+    assert assistant.translator.calls == [(["hello", "thank you", "Forte"], "es"),
+                                          (["hello", "thank you", "Forte"], "fr")]
+
+
+def test_only_cache_misses_go_to_the_backend(assistant):
+    assistant.translate_batch(["hello"], ["de"])
+    assistant.translator.calls.clear()
+    reply = assistant.translate_batch(["goodbye", "hello", "please"], ["de"])
+    assert reply.splitlines() == ["Translation (en -> de): auf Wiedersehen", "Translation (en -> de): hallo",
+                                  "Translation (en -> de): bitte"]
+    assert assistant.translator.calls == [(["goodbye", "please"], "de")]
+
+
+def test_translate_intent_batches_phrases_and_languages(assistant):
+    assistant.process_command("translate good night; yes to es and de")
+    assert assistant.spoken == ["Translation (en -> es): buenas noches", "Translation (en -> es): sí",
+                                "Translation (en -> de): gute Nacht", "Translation (en -> de): ja"]
+
+
+def test_backend_failure_gives_an_apology(assistant):
+    def fail(phrases, dest):
+        raise ConnectionError("offline")
+
+    assistant.translator.translate = fail
+    assert assistant.translate_text("hello", "es") == "Sorry, I couldn't translate that."
+    # nothing was cached, so the next try goes back to the backend
+    del assistant.translator.translate
+    assert assistant.translate_text("hello", "es") == "Translation (en -> es): hola"
@@ -0,0 +1,122 @@
+"""WakeWordDetector and listen()'s wake word gate, driven by the WAV clips in fixtures/wake."""
+
+import os
+import time
+import wave
+
+import pytest
+
+import main
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "wake")
+MAX_FALSE_REJECT_RATE = 0.2
+MAX_FALSE_ACCEPT_RATE = 0.1
+
+
+def clips(kind):
+    directory = os.path.join(FIXTURES, kind)
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".wav"):
+            with wave.open(os.path.join(directory, name), "rb") as w:
+                yield name, main.sr.AudioData(w.readframes(w.getnframes()), w.getframerate(), w.getsampwidth())
+
+
+def pcm(audio):
+    return main.WakeWordDetector.pcm16k(audio.frame_data, audio.sample_rate, audio.sample_width)
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return main.WakeWordDetector.from_directory(os.path.join(FIXTURES, "samples"))
+
+
+def test_false_reject_rate(detector):
+    results = {name: detector.detect(pcm(audio)) is not None for name, audio in clips("positives")}
+    missed = [name for name, hit in results.items() if not hit]
+    assert len(missed) / len(results) <= MAX_FALSE_REJECT_RATE, missed
+
+
+def test_false_accept_rate(detector):
+    results = {name: detector.detect(pcm(audio)) is not None for name, audio in clips("negatives")}
+    accepted = [name for name, hit in results.items() if hit]
+    assert len(accepted) / len(results) <= MAX_FALSE_ACCEPT_RATE, accepted
+
+
+def test_match_ends_where_the_wake_word_does(detector):
+    for name, audio in clips("positives"):
+        end = detector.detect(pcm(audio))
+        if end is not None:
+            # 0.25 s of leading silence plus a word of well under a second
+            assert 0.4 < end / 2 / main.WakeWordDetector.RATE < 1.2, name
+
+
+@pytest.fixture
+def assistant(tmp_path, detector):
+    assistant = main.SpeechAssistant(data_dir=str(tmp_path))
+    assistant.enable_tts = False
+    assistant.wake_word = "forte"
+    assistant.wake_detector = detector
+    assistant.spoken = []
+    assistant.speak = lambda text, *args: assistant.spoken.append(text)
+    return assistant
+
+
+def test_gate_drops_phrases_without_the_wake_word(assistant):
+    audio = dict(clips("negatives"))["what_time.wav"]
+    assert assistant._wake_gate(audio, None) is None
+    assert assistant._awake_until == 0.0
+
+
+def test_gate_passes_the_command_after_the_wake_word(assistant):
+    audio = dict(clips("positives"))["forte_time.wav"]
+    rest, text = assistant._wake_gate(audio, None)
+    assert text is None
+    assert 0.5 < len(rest.frame_data) / 2 / rest.sample_rate < len(audio.frame_data) / 2 / audio.sample_rate
+    assert assistant._awake_until > time.time()
+    # within the window the next phrase goes straight through
+    other = dict(clips("negatives"))["what_time.wav"]
+    assert assistant._wake_gate(other, None) == (other, None)
+
+
+def test_gate_answers_a_bare_wake_word(assistant):
+    audio = dict(clips("positives"))["forte_slow.wav"]
+    assert assistant._wake_gate(audio, None) is None
+    assert assistant.spoken == ["Yes?"]
+    assert assistant._awake_until > time.time()
+
+
+def test_gate_on_text_from_a_local_recognizer(assistant):
+    assistant.wake_detector = None
+    assert assistant._wake_gate(None, "what's the weather") is None
+    assert assistant._wake_gate(None, "Forte, what's the weather") == (None, "what's the weather")
+
+
+def test_wake_word_only_counts_at_the_start(assistant):
+    assistant.wake_detector = None
+    assert assistant._wake_gate(None, "turn on forte mode") is None
+    assert assistant._strip_wake_word("turn on forte mode") is None
+    assert assistant._strip_wake_word("Forte! turn on forte mode") == "turn on forte mode"
+
+
+class FakeMicrophone:
+    pause_threshold = 0.8
+
+    def __init__(self, audio):
+        self.audio = audio
+
+    def next_phrase(self, timeout=None):
+        return self.audio, None
+
+
+@pytest.mark.parametrize("heard, expected", [
+    ("forte what time is it", "what time is it"),
+    ("turn on forte mode", "turn on forte mode"),
+    ("Forte", None),
+])
+def test_listen_strips_a_leading_wake_word_left_in_the_audio(assistant, heard, expected):
+    assistant._mic_session = FakeMicrophone(dict(clips("negatives"))["what_time.wav"])
+    assistant._awake_until = time.time() + 60
+    assistant._recognize = lambda audio: heard
+    assert assistant.listen() == expected
+    # a bare wake word is answered, not run as a command
+    assert assistant.spoken == ([] if expected else ["Yes?"])
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import main
+
+ARTICLES = [
+    ("Ada Lovelace", "Augusta Ada King was an English mathematician. She wrote the first algorithm. More."),
+    ("Python (programming language)", "Python is a programming language.\nIts second paragraph."),
+    ("Python", "Python may refer to several things."),
+    ("Café de Flore", "The Café de Flore is a coffeehouse in Paris."),
+    ("Mercury (planet)", "Mercury is the first planet from the Sun."),
+]
+
+
+def build(tmp_path, articles, name="wiki.idx"):
+    source = tmp_path / "extract.jsonl"
+    source.write_text("".join(json.dumps({"title": t, "text": x}) + "\n" for t, x in articles), encoding="utf-8")
+    path = str(tmp_path / name)
+    assert main.WikiIndex.build(str(source), path) == len(articles)
+    return path
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = main.WikiIndex(build(tmp_path, ARTICLES))
+    yield index
+    index.close()
+
+
+def test_exact_lookup_ignores_case_accents_and_punctuation(index):
+    assert index.lookup("ada lovelace") == (
+        "Ada Lovelace", "Augusta Ada King was an English mathematician. She wrote the first algorithm.")
+    assert index.lookup("cafe de flore")[0] == "Café de Flore"
+    assert index.lookup("PYTHON") == ("Python", "Python may refer to several things.")
+
+
+def test_prefix_lookup_picks_the_shortest_title(index):
+    assert index.lookup("merc") == ("Mercury (planet)", "Mercury is the first planet from the Sun.")
+    assert index.lookup("python prog")[1] == "Python is a programming language."
+    assert [title for title, _ in index.prefix("pyth")] == ["Python", "Python (programming language)"]
+
+
+@pytest.mark.parametrize("query", ["Grace Hopper", "", "   ", "?!"])
+def test_misses_and_empty_queries_find_nothing(index, query):
+    assert index.lookup(query) is None
+
+
+def test_rebuilt_index_replaces_the_old_one(tmp_path):
+    path = build(tmp_path, ARTICLES)
+    old = main.WikiIndex(path)
+    build(tmp_path, [("Grace Hopper", "Grace Hopper was a computer scientist.")])
+    new = main.WikiIndex(path)
+    try:
+        assert new.count == 1
+        assert new.lookup("grace hopper") == ("Grace Hopper", "Grace Hopper was a computer scientist.")
+        assert new.lookup("ada lovelace") is None
+        # an index opened before the rebuild keeps reading its own file
+        assert old.lookup("ada lovelace")[0] == "Ada Lovelace"
+    finally:
+        old.close()
+        new.close()